@@ -0,0 +1,53 @@
+"""Подготовка Django для замеров вне тестов."""
+
+import os
+import sys
+from pathlib import Path
+from typing import Any
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent.joinpath('cafe_order')
+
+
+def setup_django(database: str | None = None) -> Any:
+    """Настраивает Django и создает базу данных для замеров.
+
+    Args:
+        database: Путь к файлу базы данных, которая сохраняется между
+            запусками. По умолчанию база создается в памяти.
+
+    Returns:
+        Состояние баз данных для `teardown_django`.
+    """
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'cafe_order.settings')
+
+    import django
+    from django.db import connection
+    from django.test.utils import setup_databases, setup_test_environment
+
+    django.setup()
+    setup_test_environment()
+    if database:
+        connection.settings_dict['TEST']['NAME'] = database
+    return setup_databases(
+        verbosity=0,
+        interactive=False,
+        keepdb=bool(database),
+        serialized_aliases=(),
+    )
+
+
+def teardown_django(old_config: Any, database: str | None = None) -> None:
+    """Удаляет базу данных замеров, если она не сохраняется.
+
+    Args:
+        old_config: Состояние баз данных из `setup_django`.
+        database: Путь к сохраняемой базе данных.
+    """
+    from django.test.utils import (
+        teardown_databases,
+        teardown_test_environment,
+    )
+
+    teardown_databases(old_config, verbosity=0, keepdb=bool(database))
+    teardown_test_environment()
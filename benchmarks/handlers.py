@@ -0,0 +1,202 @@
+"""Сравнение WSGI и ASGI при множестве одновременных соединений.
+
+Обработчики Django вызываются в процессе без сетевого сервера. Каждое
+соединение последовательно отправляет запросы, а медленный клиент после
+ответа удерживает соединение на время `--latency`. Под WSGI соединение
+занимает один из `--workers` потоков, как в синхронном воркере сервера
+приложений, под ASGI все соединения обслуживает один цикл событий.
+Как и в `cafe_order.asgi`, асинхронные маршруты чтения API включаются
+только для замера ASGI.
+
+Запуск из корня репозитория:
+
+    SECRET_KEY=... python benchmarks/handlers.py --connections 200
+"""
+
+import argparse
+import asyncio
+import importlib
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Any
+
+from environment import setup_django, teardown_django
+from seed import seed
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--path', default='/api/v1/orders/')
+    parser.add_argument('--connections', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--orders', type=int, default=200)
+    return parser.parse_args()
+
+
+def run_wsgi(args: argparse.Namespace) -> tuple[float, list[float]]:
+    """Выполняет запросы через WSGI в пуле потоков.
+
+    Args:
+        args: Параметры замера.
+
+    Returns:
+        Общее время и задержки запросов в секундах.
+    """
+    from django.core.handlers.wsgi import WSGIHandler
+
+    handler = WSGIHandler()
+    path, _, query = args.path.partition('?')
+
+    def start_response(
+        status: str, headers: list, exc_info: Any = None
+    ) -> None:
+        if not status.startswith('200'):
+            raise RuntimeError(status)
+
+    def connect(issued: float) -> list[float]:
+        latencies = []
+        for _ in range(args.requests):
+            environ = {
+                'REQUEST_METHOD': 'GET',
+                'PATH_INFO': path,
+                'QUERY_STRING': query,
+                'SERVER_NAME': 'testserver',
+                'SERVER_PORT': '80',
+                'SERVER_PROTOCOL': 'HTTP/1.1',
+                'HTTP_HOST': 'testserver',
+                'HTTP_ACCEPT': 'application/json',
+                'wsgi.input': BytesIO(),
+                'wsgi.errors': sys.stderr,
+                'wsgi.url_scheme': 'http',
+                'wsgi.version': (1, 0),
+                'wsgi.multithread': True,
+                'wsgi.multiprocess': False,
+                'wsgi.run_once': False,
+            }
+            response = handler(environ, start_response)
+            b''.join(response)
+            response.close()
+            latencies.append(time.perf_counter() - issued)
+            time.sleep(args.latency)
+            issued = time.perf_counter()
+        return latencies
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(args.workers) as executor:
+        futures = [
+            executor.submit(connect, time.perf_counter())
+            for _ in range(args.connections)
+        ]
+        latencies = [
+            latency for future in futures for latency in future.result()
+        ]
+    return time.perf_counter() - started, latencies
+
+
+def run_asgi(args: argparse.Namespace) -> tuple[float, list[float]]:
+    """Выполняет запросы через ASGI в одном цикле событий.
+
+    Args:
+        args: Параметры замера.
+
+    Returns:
+        Общее время и задержки запросов в секундах.
+    """
+    from django.conf import settings
+    from django.core.handlers.asgi import ASGIHandler
+    from django.urls import clear_url_caches
+
+    settings.ASYNC_API_READS = True
+    for name in ('api.urls.v1', 'api.urls', 'cafe_order.urls'):
+        importlib.reload(importlib.import_module(name))
+    clear_url_caches()
+    handler = ASGIHandler()
+    path, _, query = args.path.partition('?')
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'headers': [
+            (b'host', b'testserver'),
+            (b'accept', b'application/json'),
+        ],
+        'server': ('testserver', 80),
+        'client': ('127.0.0.1', 0),
+    }
+
+    async def request() -> None:
+        received = False
+
+        async def receive() -> dict[str, Any]:
+            nonlocal received
+            if received:
+                await asyncio.Future()
+            received = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message: dict[str, Any]) -> None:
+            if (
+                message['type'] == 'http.response.start'
+                and message['status'] != 200
+            ):
+                raise RuntimeError(message['status'])
+
+        await handler(dict(scope), receive, send)
+
+    async def connect() -> list[float]:
+        latencies = []
+        for _ in range(args.requests):
+            issued = time.perf_counter()
+            await request()
+            latencies.append(time.perf_counter() - issued)
+            await asyncio.sleep(args.latency)
+        return latencies
+
+    async def main() -> list[list[float]]:
+        return await asyncio.gather(
+            *(connect() for _ in range(args.connections)),
+        )
+
+    started = time.perf_counter()
+    results = asyncio.run(main())
+    elapsed = time.perf_counter() - started
+    return elapsed, [latency for result in results for latency in result]
+
+
+def report(name: str, elapsed: float, latencies: list[float]) -> None:
+    percentiles = statistics.quantiles(latencies, n=100)
+    sys.stdout.write(
+        f'{name:<5} requests={len(latencies)} time={elapsed:.2f}s '
+        f'rps={len(latencies) / elapsed:.1f} '
+        f'p50={percentiles[49] * 1000:.1f}ms '
+        f'p95={percentiles[94] * 1000:.1f}ms\n',
+    )
+
+
+def main() -> None:
+    args = parse_args()
+    old_config = setup_django()
+    try:
+        seed(args.orders)
+        sys.stdout.write(
+            f'{args.path} connections={args.connections} '
+            f'workers={args.workers} latency={args.latency}s\n',
+        )
+        report('wsgi', *run_wsgi(args))
+        report('asgi', *run_asgi(args))
+    finally:
+        teardown_django(old_config)
+
+
+if __name__ == '__main__':
+    main()
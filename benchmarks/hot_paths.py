@@ -0,0 +1,326 @@
+r"""Замеры основных сценариев работы кафе на заполненной базе данных.
+
+Каждый сценарий выполняет запрос через тестовый клиент Django со всеми
+промежуточными слоями. Для сценария сохраняются задержки p50 и p95 и
+количество запросов к базе данных. Результаты записываются в JSON и
+сравниваются с ранее сохраненным базовым замером: `--max-regression`
+завершает запуск с ошибкой, если p95 вырос больше допустимого или
+запросов стало больше.
+
+Запуск из корня репозитория:
+
+    SECRET_KEY=... python benchmarks/hot_paths.py --orders 100000 \
+        --output after.json --baseline before.json
+
+Сохраняемая база (`--database`) заполняется один раз, повторные запуски
+используют уже созданные заказы.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import time
+from collections.abc import Callable, Iterator
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from environment import setup_django, teardown_django
+from seed import seed
+
+WARMUP = 3
+
+
+class Scenario(NamedTuple):
+    """Сценарий замера.
+
+    Attributes:
+        name: Название сценария.
+        run: Функция, выполняющая один запрос и возвращающая ответ.
+        status: Ожидаемый код ответа.
+    """
+
+    name: str
+    run: Callable[[], Any]
+    status: int = 200
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--orders', type=int, default=10_000)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--database')
+    parser.add_argument('--only', nargs='*', default=())
+    parser.add_argument('--output')
+    parser.add_argument('--baseline')
+    parser.add_argument('--max-regression', type=float)
+    return parser.parse_args()
+
+
+def get_scenarios(iterations: int) -> list[Scenario]:
+    """Создает сценарии и данные, которые они изменяют.
+
+    Для изменения и удаления заранее создаются отдельные заказы, чтобы
+    каждый запрос работал с неоплаченным заказом.
+
+    Args:
+        iterations: Количество замеряемых запросов сценария.
+
+    Returns:
+        Сценарии замера.
+    """
+    from core.constants import MAX_TABLES_NUMBER, OrderStatus
+    from django.test import Client
+    from django.urls import reverse
+    from django.utils import timezone
+    from order.models import Meal, Order
+
+    client = Client()
+    rng = random.Random(0)
+    meal_ids = list(Meal.objects.values_list('pk', flat=True))
+    meals = list(Meal.objects.all())
+    today = timezone.localdate()
+    runs = iterations + WARMUP + 1
+
+    def make_orders() -> Iterator[int]:
+        orders = Order.objects.create_in_bulk(
+            [
+                {
+                    'table_number': rng.randint(1, MAX_TABLES_NUMBER),
+                    'items': rng.sample(meals, 3),
+                }
+                for _ in range(runs)
+            ],
+        )
+        return iter([order.pk for order in orders])
+
+    def order_data() -> dict[str, Any]:
+        return {
+            'table_number': rng.randint(1, MAX_TABLES_NUMBER),
+            'items': rng.sample(meal_ids, 3),
+        }
+
+    updated, deleted = make_orders(), make_orders()
+    return [
+        Scenario(
+            'order_create_form',
+            lambda: client.post(reverse('order:order'), order_data()),
+            302,
+        ),
+        Scenario(
+            'order_create_api',
+            lambda: client.post(
+                '/api/v1/orders/',
+                order_data(),
+                content_type='application/json',
+            ),
+            201,
+        ),
+        Scenario(
+            'order_list_html',
+            lambda: client.get(reverse('order:order_list')),
+        ),
+        Scenario(
+            'order_list_api',
+            lambda: client.get('/api/v1/orders/'),
+        ),
+        Scenario(
+            'order_list_api_table',
+            lambda: client.get(
+                '/api/v1/orders/',
+                {'table_number': rng.randint(1, MAX_TABLES_NUMBER)},
+            ),
+        ),
+        Scenario(
+            'order_update_form',
+            lambda: client.post(
+                reverse('order:order_update', args=(next(updated),)),
+                {**order_data(), 'status': OrderStatus.READY},
+            ),
+            302,
+        ),
+        Scenario(
+            'order_delete_form',
+            lambda: client.post(
+                reverse('order:order_delete', args=(next(deleted),)),
+            ),
+            302,
+        ),
+        Scenario('meal_list_api', lambda: client.get('/api/v1/meals/')),
+        Scenario('revenue_html', lambda: client.get(reverse('order:revenue'))),
+        Scenario(
+            'revenue_api',
+            lambda: client.get('/api/v1/orders/revenue/'),
+        ),
+        Scenario(
+            'revenue_series_daily',
+            lambda: client.get(
+                '/api/v1/orders/revenue/',
+                {'from': today - timedelta(days=29), 'to': today},
+            ),
+        ),
+        Scenario(
+            'revenue_series_hourly_by_table',
+            lambda: client.get(
+                '/api/v1/orders/revenue/',
+                {
+                    'from': today - timedelta(days=6),
+                    'to': today,
+                    'bucket': 'hour',
+                    'group_by': 'table',
+                },
+            ),
+        ),
+    ]
+
+
+def measure(scenario: Scenario, iterations: int) -> dict[str, float]:
+    """Замеряет задержки и количество запросов к базе сценария.
+
+    Args:
+        scenario: Сценарий замера.
+        iterations: Количество замеряемых запросов.
+
+    Returns:
+        Задержки p50, p95 и среднее в миллисекундах и количество
+        запросов к базе данных.
+
+    Raises:
+        RuntimeError: Если код ответа отличается от ожидаемого.
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    def run() -> None:
+        response = scenario.run()
+        if response.status_code != scenario.status:
+            raise RuntimeError(
+                f'{scenario.name}: {response.status_code} '
+                f'instead of {scenario.status}',
+            )
+
+    for _ in range(WARMUP):
+        run()
+    with CaptureQueriesContext(connection) as context:
+        run()
+    queries = len(context)
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        run()
+        latencies.append((time.perf_counter() - started) * 1000)
+    percentiles = statistics.quantiles(latencies, n=100)
+    return {
+        'p50_ms': round(percentiles[49], 3),
+        'p95_ms': round(percentiles[94], 3),
+        'mean_ms': round(statistics.fmean(latencies), 3),
+        'queries': queries,
+    }
+
+
+def get_environment(orders_count: int, iterations: int) -> dict[str, Any]:
+    """Описывает условия замера для сравнения запусков.
+
+    Args:
+        orders_count: Количество заказов в базе данных.
+        iterations: Количество замеряемых запросов сценария.
+
+    Returns:
+        Версии Python, Django и SQLite, размер данных и время запуска.
+    """
+    import django
+
+    return {
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'machine': platform.machine(),
+        'orders': orders_count,
+        'iterations': iterations,
+        'started_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    max_regression: float | None,
+) -> list[str]:
+    """Выводит изменения относительно базового замера.
+
+    Args:
+        results: Результаты текущего запуска по сценариям.
+        baseline: Результаты базового замера по сценариям.
+        max_regression: Допустимый рост p95 в процентах.
+
+    Returns:
+        Сценарии, ухудшившиеся сильнее допустимого.
+    """
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        changes = {
+            key: (result[key] - before[key]) / before[key] * 100
+            for key in ('p50_ms', 'p95_ms')
+            if before[key]
+        }
+        queries = result['queries'] - before['queries']
+        sys.stdout.write(
+            f'{name:<32} '
+            + ' '.join(
+                f'{key[:3]} {change:+6.1f}%' for key, change in changes.items()
+            )
+            + f' queries {queries:+d}\n',
+        )
+        if max_regression is not None and (
+            changes.get('p95_ms', 0) > max_regression or queries > 0
+        ):
+            regressions.append(name)
+    return regressions
+
+
+def main() -> None:
+    args = parse_args()
+    old_config = setup_django(args.database)
+    try:
+        from order.models import Order
+
+        if not Order.objects.exists():
+            sys.stdout.write(f'Seeding {args.orders} orders...\n')
+            seed(args.orders)
+        orders_count = Order.objects.count()
+        results = {}
+        for scenario in get_scenarios(args.iterations):
+            if args.only and scenario.name not in args.only:
+                continue
+            results[scenario.name] = measure(scenario, args.iterations)
+            result = results[scenario.name]
+            sys.stdout.write(
+                f'{scenario.name:<32} p50={result["p50_ms"]:8.2f}ms '
+                f'p95={result["p95_ms"]:8.2f}ms '
+                f'queries={result["queries"]}\n',
+            )
+    finally:
+        teardown_django(old_config, args.database)
+    report = {
+        'environment': get_environment(orders_count, args.iterations),
+        'results': results,
+    }
+    if args.output:
+        with Path(args.output).open('w') as file:
+            json.dump(report, file, indent=2)
+    if args.baseline:
+        with Path(args.baseline).open() as file:
+            baseline = json.load(file)['results']
+        if compare(results, baseline, args.max_regression):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
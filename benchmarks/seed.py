@@ -0,0 +1,159 @@
+r"""Быстрое заполнение базы данных заказами для замеров.
+
+Заказы и позиции вставляются пакетами одним `executemany` на таблицу без
+создания объектов моделей, поэтому миллион заказов создается за минуты.
+Заказы распределены по последним `--days` дням: старые почти все
+оплачены, за последние сутки есть заказы во всех статусах. В заказе от
+одной до шести позиций, чаще две-три.
+
+Заполнение сохраняемой базы из корня репозитория:
+
+    SECRET_KEY=... python benchmarks/seed.py --orders 1000000 \
+        --database /tmp/cafe_order_bench.sqlite3
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from environment import setup_django, teardown_django
+
+LINES_PER_ORDER = (1, 2, 3, 4, 5, 6)
+LINES_WEIGHTS = (20, 30, 25, 15, 7, 3)
+QUANTITIES = (1, 1, 1, 1, 2, 2, 3)
+MEALS_COUNT = 40
+CHUNK_SIZE = 10_000
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--orders', type=int, default=10_000)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--database')
+    return parser.parse_args()
+
+
+def seed(orders_count: int, days: int = 30, seed_value: int = 0) -> None:
+    """Создает меню и заказы с позициями.
+
+    Args:
+        orders_count: Количество заказов.
+        days: Количество дней, по которым распределены заказы.
+        seed_value: Начальное значение генератора случайных чисел.
+    """
+    from core.constants import MAX_TABLES_NUMBER, OrderStatus
+    from django.db import connection, transaction
+    from django.db.models import Max
+    from django.utils import timezone
+    from order.models import DailyRevenue, Meal, Order, OrderItem
+    from order.versions import ORDERS_VERSION, set_version
+
+    rng = random.Random(seed_value)
+    meals = list(Meal.objects.all()) or Meal.objects.bulk_create(
+        Meal(name=f'Meal {number}', price=Decimal(rng.randint(50, 900)))
+        for number in range(MEALS_COUNT)
+    )
+    next_id = (Order.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+    now = timezone.now()
+    order_sql = get_insert_sql(
+        Order,
+        (
+            'id',
+            'table_number',
+            'status',
+            'created_at',
+            'updated_at',
+            'total_price',
+            'items_count',
+        ),
+    )
+    item_sql = get_insert_sql(
+        OrderItem,
+        ('order', 'meal', 'quantity', 'unit_price'),
+    )
+    adapt = connection.ops.adapt_datetimefield_value
+    for start in range(0, orders_count, CHUNK_SIZE):
+        orders, items = [], []
+        for pk in range(
+            next_id + start,
+            next_id + min(start + CHUNK_SIZE, orders_count),
+        ):
+            age = timedelta(seconds=rng.uniform(0, days * 86400))
+            created_at = adapt(now - age)
+            if age > timedelta(days=1):
+                status = rng.choices(
+                    (OrderStatus.PAID_FOR, OrderStatus.WAITING),
+                    (95, 5),
+                )[0]
+            else:
+                status = rng.choice(OrderStatus.values[1:])
+            total, count = Decimal(0), 0
+            for meal in rng.sample(
+                meals,
+                rng.choices(LINES_PER_ORDER, LINES_WEIGHTS)[0],
+            ):
+                quantity = rng.choice(QUANTITIES)
+                total += meal.price * quantity
+                count += quantity
+                items.append((pk, meal.pk, quantity, str(meal.price)))
+            orders.append(
+                (
+                    pk,
+                    rng.randint(1, MAX_TABLES_NUMBER),
+                    status,
+                    created_at,
+                    created_at,
+                    str(total),
+                    count,
+                ),
+            )
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(order_sql, orders)
+            cursor.executemany(item_sql, items)
+    DailyRevenue.objects.rebuild()
+    set_version(ORDERS_VERSION)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def get_insert_sql(model: type, fields: tuple[str, ...]) -> str:
+    """Возвращает запрос вставки строки в таблицу модели.
+
+    Args:
+        model: Модель таблицы.
+        fields: Названия полей модели.
+
+    Returns:
+        Запрос `INSERT` с параметрами для каждого поля.
+    """
+    from django.db import connection
+
+    quote = connection.ops.quote_name
+    columns = ', '.join(
+        quote(model._meta.get_field(field).column) for field in fields
+    )
+    return (
+        f'INSERT INTO {quote(model._meta.db_table)} ({columns}) '
+        f'VALUES ({", ".join(["%s"] * len(fields))})'
+    )
+
+
+def main() -> None:
+    args = parse_args()
+    old_config = setup_django(args.database)
+    try:
+        started = time.perf_counter()
+        seed(args.orders, args.days)
+        sys.stdout.write(
+            f'Seeded {args.orders} orders in '
+            f'{time.perf_counter() - started:.1f}s\n',
+        )
+    finally:
+        teardown_django(old_config, args.database)
+
+
+if __name__ == '__main__':
+    main()
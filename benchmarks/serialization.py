@@ -0,0 +1,121 @@
+r"""Замер сериализации заказов в JSON.
+
+Сравнивает скорость получения и сериализации заказов в строках в секунду:
+через `OrderSerializer` с объектами моделей и `JSONRenderer`, через
+`OrderRowSerializer` со строками `values()` и `JSONRenderer` и через
+`OrderRowSerializer` с `FastJSONRenderer`. Без установленного `orjson`
+последний вариант совпадает со вторым.
+
+Запуск из корня репозитория:
+
+    SECRET_KEY=... python benchmarks/serialization.py --rows 10000 \
+        --database /tmp/bench.sqlite3
+"""
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+
+from environment import setup_django, teardown_django
+from seed import seed
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--orders', type=int, default=10_000)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--database')
+    return parser.parse_args()
+
+
+def get_variants(rows: int) -> dict[str, Callable[[], bytes]]:
+    """Создает варианты сериализации первых заказов списка.
+
+    Args:
+        rows: Количество сериализуемых заказов.
+
+    Returns:
+        Функции, возвращающие JSON заказов, по названию варианта.
+    """
+    from api.renderers import FastJSONRenderer
+    from api.serializers import OrderRowSerializer, OrderSerializer
+    from order.models import Order
+    from rest_framework.renderers import JSONRenderer
+
+    ordering = ('-created_at', '-id')
+    row_serializer = OrderRowSerializer()
+
+    def model_rows() -> list:
+        return OrderSerializer(
+            Order.objects.with_items().order_by(*ordering)[:rows],
+            many=True,
+        ).data
+
+    def value_rows() -> list:
+        return row_serializer.get_data(
+            list(
+                Order.objects.values(*OrderRowSerializer.fields).order_by(
+                    *ordering,
+                )[:rows],
+            ),
+        )
+
+    return {
+        'model_serializer+json': lambda: JSONRenderer().render(model_rows()),
+        'row_serializer+json': lambda: JSONRenderer().render(value_rows()),
+        'row_serializer+fast_json': lambda: FastJSONRenderer().render(
+            value_rows(),
+        ),
+    }
+
+
+def measure(run: Callable[[], bytes], rows: int, repeat: int) -> float:
+    """Замеряет скорость лучшего из повторов.
+
+    Args:
+        run: Функция сериализации.
+        rows: Количество сериализуемых заказов.
+        repeat: Количество повторов.
+
+    Returns:
+        Количество заказов в секунду.
+    """
+    run()
+    best = min(_elapsed(run) for _ in range(repeat))
+    return rows / best
+
+
+def _elapsed(run: Callable[[], bytes]) -> float:
+    started = time.perf_counter()
+    run()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    args = parse_args()
+    old_config = setup_django(args.database)
+    try:
+        from api import renderers
+        from order.models import Order
+
+        if not Order.objects.exists():
+            sys.stdout.write(f'Seeding {args.orders} orders...\n')
+            seed(args.orders)
+        rows = min(args.rows, Order.objects.count())
+        if renderers.orjson is None:
+            sys.stdout.write('orjson is not installed\n')
+        baseline = None
+        for name, run in get_variants(rows).items():
+            speed = measure(run, rows, args.repeat)
+            baseline = baseline or speed
+            sys.stdout.write(
+                f'{name:<28} {speed:12,.0f} rows/s x{speed / baseline:.2f}\n',
+            )
+    finally:
+        teardown_django(old_config, args.database)
+
+
+if __name__ == '__main__':
+    main()
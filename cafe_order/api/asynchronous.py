@@ -0,0 +1,162 @@
+from collections.abc import Callable
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest, HttpResponseBase
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import NotAcceptable
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet
+
+ASYNC_READ_METHODS = ('GET', 'HEAD')
+
+
+class AsyncReadView(View):
+    """Асинхронное чтение для действия набора представлений.
+
+    Запрос `GET` или `HEAD` с ответом в JSON обрабатывается асинхронной
+    версией действия набора представлений: метод с префиксом `a`, например
+    `alist` для `list`. Остальные запросы, включая запросы к browsable API,
+    передаются исходному синхронному представлению. Маршруты с этим
+    представлением подключаются только при запуске через ASGI.
+
+    Attributes:
+        view: Синхронное представление набора, созданное маршрутизатором.
+    """
+
+    view: Callable | None = None
+
+    @classmethod
+    def as_view(cls, **initkwargs: Any) -> Callable:
+        """Возвращает представление, освобожденное от проверки CSRF.
+
+        Проверку CSRF, как и в представлениях DRF, выполняет аутентификация
+        по сессии.
+
+        Args:
+            initkwargs: Атрибуты представления.
+
+        Returns:
+            Асинхронная функция представления.
+        """
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(
+        self,
+        request: HttpRequest,
+        *args: Any,
+        **kwargs: Any,
+    ) -> HttpResponseBase:
+        """Передает запросы, кроме чтения, синхронному представлению.
+
+        Args:
+            request: Запрос от клиента.
+            args: Позиционные параметры маршрута.
+            kwargs: Именованные параметры маршрута.
+
+        Returns:
+            Ответ представления.
+        """
+        if request.method not in ASYNC_READ_METHODS:
+            return await self.fallback(request, *args, **kwargs)
+        return await super().dispatch(request, *args, **kwargs)
+
+    async def get(
+        self,
+        request: HttpRequest,
+        *args: Any,
+        **kwargs: Any,
+    ) -> HttpResponseBase:
+        """Выполняет асинхронную версию действия набора представлений.
+
+        Аутентификация, проверка прав и ограничение частоты запросов
+        выполняются методом `initial` набора представлений в потоке
+        синхронного кода, как и в синхронном представлении.
+
+        Args:
+            request: Запрос от клиента.
+            args: Позиционные параметры маршрута.
+            kwargs: Именованные параметры маршрута.
+
+        Returns:
+            Отрисованный ответ действия или ответ синхронного
+            представления, если клиент ожидает не JSON.
+        """
+        viewset = self.get_viewset(request, *args, **kwargs)
+        try:
+            renderer, _ = viewset.perform_content_negotiation(
+                viewset.request,
+            )
+        except NotAcceptable:
+            renderer = None
+        if not isinstance(renderer, JSONRenderer):
+            return await self.fallback(request, *args, **kwargs)
+        action = getattr(viewset, f'a{viewset.action}')
+        try:
+            await sync_to_async(viewset.initial)(
+                viewset.request,
+                *args,
+                **kwargs,
+            )
+            response = await action(viewset.request, *args, **kwargs)
+        except Exception as exc:
+            response = viewset.handle_exception(exc)
+        response = viewset.finalize_response(
+            viewset.request,
+            response,
+            *args,
+            **kwargs,
+        )
+        if isinstance(response, Response):
+            response.render()
+        return response
+
+    def get_viewset(
+        self,
+        request: HttpRequest,
+        *args: Any,
+        **kwargs: Any,
+    ) -> GenericViewSet:
+        """Создает набор представлений для обработки запроса.
+
+        Args:
+            request: Запрос от клиента.
+            args: Позиционные параметры маршрута.
+            kwargs: Именованные параметры маршрута.
+
+        Returns:
+            Набор представлений с запросом DRF и выбранным действием.
+        """
+        viewset = self.view.cls(**self.view.initkwargs)
+        viewset.action_map = self.view.actions
+        for method, action in viewset.action_map.items():
+            setattr(viewset, method, getattr(viewset, action))
+        if not hasattr(viewset, 'head'):
+            viewset.head = viewset.get
+        viewset.args = args
+        viewset.kwargs = kwargs
+        viewset.request = viewset.initialize_request(request, *args, **kwargs)
+        viewset.action = self.view.actions['get']
+        viewset.format_kwarg = viewset.get_format_suffix(**kwargs)
+        viewset.headers = viewset.default_response_headers
+        return viewset
+
+    async def fallback(
+        self,
+        request: HttpRequest,
+        *args: Any,
+        **kwargs: Any,
+    ) -> HttpResponseBase:
+        """Передает запрос синхронному представлению.
+
+        Args:
+            request: Запрос от клиента.
+            args: Позиционные параметры маршрута.
+            kwargs: Именованные параметры маршрута.
+
+        Returns:
+            Ответ синхронного представления.
+        """
+        return await sync_to_async(self.view)(request, *args, **kwargs)
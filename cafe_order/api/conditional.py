@@ -0,0 +1,87 @@
+from collections.abc import Callable
+from datetime import datetime
+from hashlib import md5
+from typing import Any
+
+from django.http import HttpRequest
+from django.utils import timezone
+from django.views.decorators.http import condition
+from order.versions import get_version
+
+
+def get_etag(request: HttpRequest, version_name: str) -> str:
+    """Возвращает сильный ETag ответа для версии данных.
+
+    Тег зависит от версии данных, полного пути запроса с параметрами и
+    заголовка `Accept`, поэтому разные страницы, фильтры и форматы ответа
+    получают разные теги.
+
+    Args:
+        request: Запрос от клиента.
+        version_name: Название набора данных.
+
+    Returns:
+        Значение ETag без кавычек.
+    """
+    key = ':'.join(
+        (
+            get_version(version_name).token,
+            request.get_full_path(),
+            request.META.get('HTTP_ACCEPT', ''),
+        ),
+    )
+    return md5(key.encode(), usedforsecurity=False).hexdigest()
+
+
+def get_last_modified(
+    request: HttpRequest,
+    version_name: str,
+) -> datetime | None:
+    """Возвращает время последнего изменения данных.
+
+    `Last-Modified` и `If-Modified-Since` передаются с точностью до секунды,
+    поэтому время возвращается только после окончания секунды, в которую
+    появилась версия. Иначе изменение в ту же секунду получило бы то же
+    время, и клиент со старыми данными получил бы ответ `304`.
+
+    Args:
+        request: Запрос от клиента.
+        version_name: Название набора данных.
+
+    Returns:
+        Время появления текущей версии данных или `None`, если ее секунда
+        еще не закончилась.
+    """
+    modified = get_version(version_name).modified
+    if int(timezone.now().timestamp()) <= int(modified.timestamp()):
+        return None
+    return modified
+
+
+def versioned(version_name: str) -> Callable:
+    """Возвращает декоратор условного GET по версии данных.
+
+    Если `If-None-Match` или `If-Modified-Since` совпадает с текущей
+    версией, ответ `304` возвращается без запроса к базе данных и
+    сериализации.
+
+    Args:
+        version_name: Название набора данных.
+
+    Returns:
+        Декоратор представления.
+    """
+
+    def etag_func(request: HttpRequest, *args: Any, **kwargs: Any) -> str:
+        return get_etag(request, version_name)
+
+    def last_modified_func(
+        request: HttpRequest,
+        *args: Any,
+        **kwargs: Any,
+    ) -> datetime | None:
+        return get_last_modified(request, version_name)
+
+    return condition(
+        etag_func=etag_func, last_modified_func=last_modified_func
+    )
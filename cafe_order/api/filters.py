@@ -0,0 +1,121 @@
+from typing import Any
+
+from django.db.models import Exists, OuterRef, QuerySet
+from order.models import OrderItem
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+from api.serializers import OrderFilterQuerySerializer
+
+
+class OrderFilterBackend(BaseFilterBackend):
+    """Фильтрация заказов по точным значениям и диапазонам.
+
+    Каждый параметр превращается в условие равенства, `IN` или диапазона
+    по столбцу таблицы заказов, поэтому запрос может использовать индексы
+    по номеру стола и статусу, по статусу и времени создания и по времени
+    создания. Фильтр по блюдам проверяет наличие позиции подзапросом по
+    уникальному индексу позиций заказа. Условия по разным параметрам
+    объединяются через `AND`.
+
+    Attributes:
+        query_serializer_class: Сериализатор параметров фильтрации.
+    """
+
+    query_serializer_class = OrderFilterQuerySerializer
+
+    def filter_queryset(
+        self,
+        request: Request,
+        queryset: QuerySet,
+        view: APIView,
+    ) -> QuerySet:
+        """Фильтрует заказы по параметрам запроса.
+
+        Args:
+            request: Запрос от клиента.
+            queryset: Заказы для фильтрации.
+            view: Представление, выполняющее запрос.
+
+        Returns:
+            Отфильтрованные заказы.
+
+        Raises:
+            ValidationError: Если параметры фильтрации неверны.
+        """
+        serializer = self.query_serializer_class(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        if 'table_number' in params:
+            queryset = queryset.filter(table_number=params['table_number'])
+        if 'status' in params:
+            # Статусы проверены по вариантам выбора, поэтому их можно
+            # подставить в текст запроса для частичного индекса.
+            queryset = queryset.filter(status__inlined_in=params['status'])
+        if 'created_after' in params:
+            queryset = queryset.filter(created_at__gte=params['created_after'])
+        if 'created_before' in params:
+            queryset = queryset.filter(created_at__lt=params['created_before'])
+        if 'meal' in params:
+            queryset = queryset.filter(
+                Exists(
+                    OrderItem.objects.filter(
+                        order=OuterRef('pk'),
+                        meal__in=params['meal'],
+                    ),
+                ),
+            )
+        return queryset
+
+    def get_schema_operation_parameters(
+        self,
+        view: APIView,
+    ) -> list[dict[str, Any]]:
+        """Описывает параметры фильтрации для схемы OpenAPI.
+
+        Args:
+            view: Представление, для которого строится схема.
+
+        Returns:
+            Описания параметров запроса.
+        """
+        return [
+            {
+                'name': 'table_number',
+                'required': False,
+                'in': 'query',
+                'description': 'Exact table number.',
+                'schema': {'type': 'integer'},
+            },
+            {
+                'name': 'status',
+                'required': False,
+                'in': 'query',
+                'description': 'Order status, repeat to match any of several.',
+                'schema': {'type': 'array', 'items': {'type': 'string'}},
+                'explode': True,
+            },
+            {
+                'name': 'created_after',
+                'required': False,
+                'in': 'query',
+                'description': 'Orders created at or after this moment.',
+                'schema': {'type': 'string', 'format': 'date-time'},
+            },
+            {
+                'name': 'created_before',
+                'required': False,
+                'in': 'query',
+                'description': 'Orders created before this moment.',
+                'schema': {'type': 'string', 'format': 'date-time'},
+            },
+            {
+                'name': 'meal',
+                'required': False,
+                'in': 'query',
+                'description': 'Meal id, repeat to match any of several.',
+                'schema': {'type': 'array', 'items': {'type': 'integer'}},
+                'explode': True,
+            },
+        ]
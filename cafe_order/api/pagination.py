@@ -0,0 +1,441 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Field, Model, Q, QuerySet
+from order.models import Order, OrderQuerySet, OrderTombstone
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
+
+
+class KeysetPagination(pagination.BasePagination):
+    """Постраничная выдача по ключу сортировки (keyset).
+
+    Следующая страница выбирается условием на значения ключа последнего
+    объекта текущей страницы, поэтому стоимость запроса любой страницы
+    не зависит от ее номера.
+
+    Attributes:
+        ordering: Поля ключа сортировки, уникального в совокупности.
+        page_size: Размер страницы по умолчанию.
+        page_size_query_param: Параметр запроса с размером страницы.
+        max_page_size: Максимально допустимый размер страницы.
+        cursor_query_param: Параметр запроса с курсором.
+        invalid_cursor_message: Сообщение о недействительном курсоре.
+    """
+
+    ordering: tuple[str, ...] = ('pk',)
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(
+        self,
+        queryset: QuerySet | Sequence[Model],
+        request: Request,
+        view: APIView | None = None,
+    ) -> list[Model]:
+        """Возвращает объекты страницы, следующей за курсором.
+
+        Кроме запроса к базе данных принимает последовательность объектов,
+        уже упорядоченную по ключу сортировки, например снимок из кэша.
+
+        Args:
+            queryset: Объекты для разбиения на страницы.
+            request: Запрос от клиента.
+            view: Представление, выполняющее запрос.
+
+        Returns:
+            Объекты текущей страницы.
+        """
+        return self.get_page(
+            list(self.get_page_queryset(queryset, request, view)),
+        )
+
+    async def apaginate_queryset(
+        self,
+        queryset: QuerySet,
+        request: Request,
+        view: APIView | None = None,
+    ) -> list[Model]:
+        """Асинхронная версия `paginate_queryset` для запроса к базе."""
+        return self.get_page(
+            [
+                instance
+                async for instance in self.get_page_queryset(
+                    queryset,
+                    request,
+                    view,
+                )
+            ],
+        )
+
+    def get_page_queryset(
+        self,
+        queryset: QuerySet | Sequence[Model],
+        request: Request,
+        view: APIView | None = None,
+    ) -> QuerySet | Sequence[Model]:
+        """Возвращает объекты после курсора с одним лишним объектом.
+
+        Лишний объект показывает, что за страницей есть следующая.
+
+        Args:
+            queryset: Объекты для разбиения на страницы.
+            request: Запрос от клиента.
+            view: Представление, выполняющее запрос.
+
+        Returns:
+            Невыполненный запрос или срез последовательности.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if isinstance(queryset, QuerySet):
+            queryset = queryset.order_by(*self.ordering)
+            position = self.decode_cursor(request, queryset.model)
+            if position is not None:
+                queryset = queryset.filter(
+                    self.get_position_filter(position),
+                )
+        else:
+            position = self.decode_cursor(request, view.queryset.model)
+            if position is not None:
+                queryset = [
+                    instance
+                    for instance in queryset
+                    if self.is_after(instance, position)
+                ]
+        return queryset[: self.page_size + 1]
+
+    def get_page(self, page: list[Model]) -> list[Model]:
+        """Отрезает лишний объект и запоминает позицию следующей страницы.
+
+        Args:
+            page: Объекты страницы с возможным лишним объектом.
+
+        Returns:
+            Объекты текущей страницы.
+        """
+        self.next_position = None
+        if len(page) > self.page_size:
+            page = page[: self.page_size]
+            self.next_position = self.get_position(page[-1])
+        return page
+
+    def get_page_size(self, request: Request) -> int:
+        """Возвращает размер страницы с учетом ограничения.
+
+        Args:
+            request: Запрос от клиента.
+
+        Returns:
+            Размер страницы.
+        """
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size < 1:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_position(
+        self,
+        instance: Model | Mapping[str, Any],
+    ) -> list[Any]:
+        """Возвращает значения ключа сортировки объекта.
+
+        Args:
+            instance: Объект страницы или строка `values()` с полями ключа.
+
+        Returns:
+            Значения полей ключа сортировки.
+        """
+        names = [field.lstrip('-') for field in self.ordering]
+        if isinstance(instance, Mapping):
+            return [instance[name] for name in names]
+        return [getattr(instance, name) for name in names]
+
+    def is_after(self, instance: Model, position: list[Any]) -> bool:
+        """Проверяет, что объект следует за позицией курсора.
+
+        Args:
+            instance: Объект последовательности.
+            position: Значения ключа сортировки последнего объекта.
+
+        Returns:
+            `True`, если объект находится после позиции.
+        """
+        for field, value in zip(self.ordering, position, strict=True):
+            current = getattr(instance, field.lstrip('-'))
+            if current != value:
+                if field.startswith('-'):
+                    return current < value
+                return current > value
+        return False
+
+    def get_position_filter(self, position: list[Any]) -> Q:
+        """Возвращает условие выборки объектов после позиции курсора.
+
+        Args:
+            position: Значения ключа сортировки последнего объекта.
+
+        Returns:
+            Условие на поля ключа сортировки.
+        """
+        condition = Q()
+        equal = {}
+        for field, value in zip(self.ordering, position, strict=True):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return condition
+
+    @staticmethod
+    def get_model_field(model: type[Model], field: str) -> Field:
+        """Возвращает поле модели по элементу ключа сортировки.
+
+        Args:
+            model: Модель объектов страницы.
+            field: Элемент ключа сортировки.
+
+        Returns:
+            Поле модели.
+        """
+        name = field.lstrip('-')
+        if name == 'pk':
+            return model._meta.pk
+        return model._meta.get_field(name)
+
+    def get_cursor_fields(self, model: type[Model]) -> list[Field]:
+        """Возвращает поля модели, значения которых хранятся в курсоре.
+
+        Args:
+            model: Модель объектов страницы.
+
+        Returns:
+            Поля ключа сортировки.
+        """
+        return [self.get_model_field(model, field) for field in self.ordering]
+
+    def encode_cursor(self, position: list[Any]) -> str:
+        """Кодирует позицию в непрозрачный курсор.
+
+        Args:
+            position: Значения ключа сортировки.
+
+        Returns:
+            Курсор для передачи в параметре запроса.
+        """
+        data = json.dumps(
+            [
+                value.isoformat() if hasattr(value, 'isoformat') else value
+                for value in position
+            ],
+            separators=(',', ':'),
+        )
+        return urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+    def decode_cursor(
+        self,
+        request: Request,
+        model: type[Model],
+    ) -> list[Any] | None:
+        """Декодирует позицию из курсора запроса.
+
+        Args:
+            request: Запрос от клиента.
+            model: Модель объектов страницы.
+
+        Returns:
+            Значения ключа сортировки или `None`, если курсор не передан.
+
+        Raises:
+            NotFound: Если курсор недействителен.
+        """
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            values = json.loads(
+                urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)),
+            )
+            fields = self.get_cursor_fields(model)
+            if len(values) != len(fields):
+                raise ValueError
+            return [
+                field.to_python(value)
+                for field, value in zip(fields, values, strict=True)
+            ]
+        except (BinasciiError, TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message) from None
+
+    def get_next_link(self) -> str | None:
+        """Возвращает ссылку на следующую страницу.
+
+        Returns:
+            Ссылка или `None`, если страница последняя.
+        """
+        if self.next_position is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(self.next_position),
+        )
+
+    def get_paginated_response(self, data: list[Any]) -> Response:
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_paginated_response_schema(
+        self,
+        schema: dict[str, Any],
+    ) -> dict[str, Any]:
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(
+        self,
+        view: APIView,
+    ) -> list[dict[str, Any]]:
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'The pagination cursor value.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {'type': 'integer'},
+            },
+        ]
+
+
+class MealPagination(KeysetPagination):
+    """Постраничная выдача блюд в порядке идентификаторов."""
+
+    ordering = ('pk',)
+
+
+class OrderPagination(KeysetPagination):
+    """Постраничная выдача заказов от новых к старым.
+
+    Ключ называет первичный ключ `id`, чтобы его значение читалось и из
+    строк `values()`.
+    """
+
+    ordering = ('-created_at', '-id')
+
+
+class OrderChangesPagination(KeysetPagination):
+    """Выдача изменений заказов после курсора.
+
+    Курсор хранит время изменения и идентификатор последнего полученного
+    заказа, а также идентификатор последней записи об удалении заказа.
+    Следующий курсор возвращается всегда, даже если изменений нет.
+
+    Attributes:
+        ordering: Поля ключа сортировки заказов по времени изменения.
+        cursor_query_param: Параметр запроса с курсором.
+    """
+
+    ordering = ('updated_at', 'pk')
+    cursor_query_param = 'since'
+
+    def get_cursor_fields(self, model: type[Model]) -> list[Field]:
+        """Добавляет к полям курсора идентификатор записи об удалении.
+
+        Args:
+            model: Модель заказа.
+
+        Returns:
+            Поля ключа сортировки заказов и записей об удалении.
+        """
+        return [*super().get_cursor_fields(model), OrderTombstone._meta.pk]
+
+    def paginate_changes(
+        self,
+        queryset: OrderQuerySet,
+        request: Request,
+    ) -> tuple[list[Order], list[int]]:
+        """Возвращает заказы и удаления, произошедшие после курсора.
+
+        Args:
+            queryset: Заказы для выдачи.
+            request: Запрос от клиента.
+
+        Returns:
+            Измененные заказы и идентификаторы удаленных заказов.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        position = self.decode_cursor(request, queryset.model) or [
+            None,
+            None,
+            0,
+        ]
+        *order_position, tombstone_id = position
+        orders = list(
+            queryset.changed_after(*order_position)[: self.page_size + 1],
+        )
+        tombstones = list(
+            OrderTombstone.objects.filter(pk__gt=tombstone_id)
+            .order_by('pk')
+            .values_list('pk', 'order_id')[: self.page_size + 1],
+        )
+        self.has_more = max(len(orders), len(tombstones)) > self.page_size
+        orders = orders[: self.page_size]
+        tombstones = tombstones[: self.page_size]
+        if orders:
+            order_position = self.get_position(orders[-1])
+        if tombstones:
+            tombstone_id = tombstones[-1][0]
+        self.next_position = [*order_position, tombstone_id]
+        return orders, [order_id for _, order_id in tombstones]
+
+    def get_changes_response(
+        self,
+        data: list[Any],
+        deleted: list[int],
+    ) -> Response:
+        """Возвращает ответ с изменениями заказов.
+
+        Args:
+            data: Сериализованные измененные заказы.
+            deleted: Идентификаторы удаленных заказов.
+
+        Returns:
+            Ответ с изменениями, удалениями и ссылкой для следующего
+            запроса.
+        """
+        return Response(
+            {
+                'next': self.get_next_link(),
+                'has_more': self.has_more,
+                'changed': data,
+                'deleted': deleted,
+            },
+        )
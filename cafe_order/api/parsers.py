@@ -0,0 +1,53 @@
+from collections.abc import Mapping
+from typing import IO, Any
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from api.renderers import FastJSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONParser(JSONParser):
+    """Разбор JSON через `orjson`, если библиотека установлена.
+
+    Как и `JSONParser` в строгом режиме, отклоняет `NaN` и `Infinity`.
+    Без `orjson` и для тел не в UTF-8 используется `JSONParser`.
+    """
+
+    renderer_class = FastJSONRenderer
+
+    def parse(
+        self,
+        stream: IO[bytes],
+        media_type: str | None = None,
+        parser_context: Mapping[str, Any] | None = None,
+    ) -> Any:
+        """Разбирает тело запроса.
+
+        Args:
+            stream: Тело запроса.
+            media_type: Тип содержимого запроса.
+            parser_context: Контекст разбора.
+
+        Returns:
+            Разобранные данные.
+
+        Raises:
+            ParseError: Если тело не является корректным JSON.
+        """
+        encoding = (parser_context or {}).get(
+            'encoding',
+            settings.DEFAULT_CHARSET,
+        )
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}') from None
@@ -0,0 +1,56 @@
+from collections.abc import Mapping
+from typing import Any
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """Отрисовка JSON через `orjson`, если библиотека установлена.
+
+    Ответ совпадает с ответом `JSONRenderer`: типы, которые `orjson` не
+    сериализует сам, включая даты и время, передаются кодировщику DRF.
+    Без `orjson`, а также для ответов с отступами и ответов только из
+    символов ASCII используется `JSONRenderer`.
+    """
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: str | None = None,
+        renderer_context: Mapping[str, Any] | None = None,
+    ) -> bytes:
+        """Отрисовывает данные в JSON.
+
+        Args:
+            data: Данные ответа.
+            accepted_media_type: Принятый тип содержимого.
+            renderer_context: Контекст отрисовки.
+
+        Returns:
+            Текст JSON в UTF-8.
+        """
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or self.get_indent(
+                accepted_media_type or '',
+                renderer_context or {},
+            )
+        ):
+            return super().render(
+                data,
+                accepted_media_type,
+                renderer_context,
+            )
+        if data is None:
+            return b''
+        return orjson.dumps(
+            data,
+            default=self.encoder_class().default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+        )
@@ -1,5 +1,24 @@
-from order.models import Meal, Order
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any
+
+from core.constants import (
+    MAX_TABLES_NUMBER,
+    ORDER_BULK_MAX_SIZE,
+    REVENUE_SERIES_MAX_DAYS,
+    OrderStatus,
+    RevenueBucket,
+)
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import QuerySet
+from order.menu import get_menu
+from order.models import Meal, Order, OrderItem
+from order.shifts import get_shift_date
 from rest_framework import serializers
+from rest_framework.relations import PKOnlyObject
 
 
 class MealSerializer(serializers.ModelSerializer):
@@ -23,13 +42,116 @@ class MealSerializer(serializers.ModelSerializer):
         )
 
 
+class MealField(serializers.PrimaryKeyRelatedField):
+    """Поле блюда по идентификатору.
+
+    Блюдо берется из снимка меню без запроса к базе данных. Снимок
+    сохраняется в контексте сериализатора, чтобы все поля одного запроса
+    проверялись по одной версии меню.
+    """
+
+    def to_internal_value(self, data: Any) -> Meal:
+        """Возвращает блюдо по идентификатору.
+
+        Args:
+            data: Идентификатор блюда.
+
+        Returns:
+            Объект блюда.
+
+        Raises:
+            ValidationError: Если блюдо не найдено или идентификатор
+                неверного типа.
+        """
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            Meal._meta.pk.to_python(data)
+        except (TypeError, ValidationError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        menu = self.context.get('menu')
+        if menu is None:
+            menu = self.context['menu'] = get_menu()
+        meal = menu.get_meal(data)
+        if meal is None:
+            self.fail('does_not_exist', pk_value=data)
+        return meal
+
+
+class OrderItemsField(serializers.ManyRelatedField):
+    """Поле блюд заказа.
+
+    Блюдо повторяется в списке столько раз, сколько его заказано.
+    """
+
+    def get_attribute(self, instance: Order) -> list[PKOnlyObject]:
+        """Возвращает блюда заказа по его позициям.
+
+        Args:
+            instance: Заказ.
+
+        Returns:
+            Идентификаторы блюд с повторами по количеству.
+        """
+        return [
+            PKOnlyObject(line.meal_id)
+            for line in instance.lines.all()
+            for _ in range(line.quantity)
+        ]
+
+
+class OrderItemSerializer(serializers.ModelSerializer):
+    """Сериализатор позиции заказа."""
+
+    class Meta:
+        """Метаданные сериализатора.
+
+        Определяет модель и поля для сериализации.
+
+        Attributes:
+            model: Модель, к которой привязан сериализатор.
+            fields: Поля модели для сериализации.
+        """
+
+        model = OrderItem
+        fields = (
+            'meal',
+            'quantity',
+            'unit_price',
+        )
+
+
+class OrderListSerializer(serializers.ListSerializer):
+    """Сериализатор списка заказов для пакетного создания."""
+
+    def create(self, validated_data: list[dict[str, Any]]) -> list[Order]:
+        """Создает заказы пакетными вставками.
+
+        Args:
+            validated_data: Проверенные данные заказов.
+
+        Returns:
+            Созданные заказы.
+        """
+        return Order.objects.create_in_bulk(validated_data)
+
+
 class OrderSerializer(serializers.ModelSerializer):
     """Сериализатор модели заказов.
 
     Attributes:
-        items: Объект с данными о блюдах.
+        items: Блюда заказа, повтор блюда задает его количество.
+        lines: Позиции заказа с количеством и ценой на момент заказа.
+        price: Сохраненная общая стоимость блюд в заказе.
     """
 
+    items = OrderItemsField(
+        child_relation=MealField(queryset=Meal.objects.all()),
+        allow_empty=False,
+    )
+    lines = OrderItemSerializer(many=True, read_only=True)
+    price = serializers.ReadOnlyField(source='total_price')
+
     class Meta:
         """Метаданные сериализатора.
 
@@ -38,6 +160,8 @@ class OrderSerializer(serializers.ModelSerializer):
         Attributes:
             model: Модель, к которой привязан сериализатор.
             fields: Поля модели для сериализации.
+            read_only_fields: Поля только для чтения.
+            list_serializer_class: Сериализатор списка заказов.
         """
 
         model = Order
@@ -45,12 +169,316 @@ class OrderSerializer(serializers.ModelSerializer):
             'id',
             'table_number',
             'items',
+            'lines',
             'price',
             'status',
             'created_at',
+            'updated_at',
         )
         read_only_fields = (
             'id',
+            'lines',
             'price',
             'created_at',
+            'updated_at',
         )
+        list_serializer_class = OrderListSerializer
+
+    def create(self, validated_data: dict[str, Any]) -> Order:
+        """Создает заказ с позициями.
+
+        Args:
+            validated_data: Проверенные данные заказа.
+
+        Returns:
+            Созданный заказ.
+        """
+        items = validated_data.pop('items')
+        with transaction.atomic():
+            order = super().create(validated_data)
+            order.set_items(Counter(items))
+        return order
+
+    def update(self, instance: Order, validated_data: dict[str, Any]) -> Order:
+        """Обновляет заказ и, если переданы блюда, его позиции.
+
+        Args:
+            instance: Обновляемый заказ.
+            validated_data: Проверенные данные заказа.
+
+        Returns:
+            Обновленный заказ.
+        """
+        items = validated_data.pop('items', None)
+        with transaction.atomic():
+            order = super().update(instance, validated_data)
+            if items is not None:
+                order.set_items(Counter(items))
+        return order
+
+
+class OrderRowSerializer:
+    """Сериализатор заказов из строк `values()`.
+
+    Отдает те же поля, что и `OrderSerializer`, но не создает объекты
+    заказов, позиций и полей для каждой строки. Даты и цены позиций
+    форматируются полями `OrderSerializer`, поэтому ответ совпадает с
+    ответом модельного сериализатора.
+
+    Attributes:
+        fields: Поля заказа, выбираемые из базы данных.
+    """
+
+    fields = (
+        'id',
+        'table_number',
+        'status',
+        'total_price',
+        'created_at',
+        'updated_at',
+    )
+
+    def __init__(self) -> None:
+        """Получает поля форматирования из `OrderSerializer`."""
+        fields = OrderSerializer().fields
+        self.format_datetime = fields['created_at'].to_representation
+        self.format_price = (
+            fields['lines'].child.fields['unit_price'].to_representation
+        )
+
+    @staticmethod
+    def get_lines_queryset(order_ids: list[int]) -> QuerySet:
+        """Возвращает запрос позиций заказов в порядке `OrderSerializer`.
+
+        Args:
+            order_ids: Идентификаторы заказов.
+
+        Returns:
+            Идентификатор заказа, блюдо, количество и цена позиций.
+        """
+        return (
+            OrderItem.objects.filter(order__in=order_ids)
+            .order_by('order', 'meal')
+            .values_list('order', 'meal', 'quantity', 'unit_price')
+        )
+
+    def serialize(
+        self,
+        rows: list[dict[str, Any]],
+        lines: Iterable[tuple[int, int, int, Decimal]],
+    ) -> list[dict[str, Any]]:
+        """Формирует данные заказов.
+
+        Args:
+            rows: Строки заказов с полями `fields`.
+            lines: Позиции заказов из `get_lines_queryset`.
+
+        Returns:
+            Данные заказов в формате `OrderSerializer`.
+        """
+        items, order_lines = defaultdict(list), defaultdict(list)
+        for order_id, meal_id, quantity, unit_price in lines:
+            items[order_id].extend([meal_id] * quantity)
+            order_lines[order_id].append(
+                {
+                    'meal': meal_id,
+                    'quantity': quantity,
+                    'unit_price': self.format_price(unit_price),
+                },
+            )
+        format_datetime = self.format_datetime
+        return [
+            {
+                'id': row['id'],
+                'table_number': row['table_number'],
+                'items': items[row['id']],
+                'lines': order_lines[row['id']],
+                'price': row['total_price'],
+                'status': row['status'],
+                'created_at': format_datetime(row['created_at']),
+                'updated_at': format_datetime(row['updated_at']),
+            }
+            for row in rows
+        ]
+
+    def get_data(self, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Загружает позиции и формирует данные заказов.
+
+        Args:
+            rows: Строки заказов с полями `fields`.
+
+        Returns:
+            Данные заказов в формате `OrderSerializer`.
+        """
+        if not rows:
+            return []
+        return self.serialize(
+            rows,
+            self.get_lines_queryset([row['id'] for row in rows]),
+        )
+
+    async def aget_data(
+        self,
+        rows: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Асинхронная версия `get_data`."""
+        if not rows:
+            return []
+        lines = self.get_lines_queryset([row['id'] for row in rows])
+        return self.serialize(rows, [line async for line in lines])
+
+
+class OrderIdsSerializer(serializers.Serializer):
+    """Сериализатор списка идентификаторов заказов для пакетных действий.
+
+    Attributes:
+        ids: Идентификаторы заказов.
+    """
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=ORDER_BULK_MAX_SIZE,
+    )
+
+
+class OrderTransitionSerializer(OrderIdsSerializer):
+    """Сериализатор пакетной смены статуса заказов.
+
+    Attributes:
+        status: Новый статус заказов.
+    """
+
+    status = serializers.ChoiceField(
+        choices=[
+            (value, label) for value, label in OrderStatus.choices if value
+        ],
+    )
+
+
+class RevenueSeriesQuerySerializer(serializers.Serializer):
+    """Сериализатор параметров запроса временного ряда выручки.
+
+    Attributes:
+        to: Последний день периода включительно.
+        bucket: Интервал группировки выручки.
+        group_by: Дополнительная группировка выручки.
+    """
+
+    to = serializers.DateField(required=False)
+    bucket = serializers.ChoiceField(
+        choices=RevenueBucket.choices,
+        default=RevenueBucket.DAY,
+    )
+    group_by = serializers.ChoiceField(
+        choices=(('table', 'Table'),),
+        required=False,
+    )
+
+    def get_fields(self) -> dict[str, serializers.Field]:
+        """Добавляет поле начала периода.
+
+        Имя поля `from` совпадает с ключевым словом Python, поэтому поле
+        не объявляется в теле класса.
+
+        Returns:
+            Поля сериализатора.
+        """
+        fields = super().get_fields()
+        fields['from'] = serializers.DateField(required=False)
+        return fields
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        """Заполняет границы периода и проверяет его длину.
+
+        Args:
+            attrs: Параметры запроса.
+
+        Returns:
+            Параметры запроса с границами периода.
+
+        Raises:
+            ValidationError: Если период задан неверно или слишком длинный.
+        """
+        attrs.setdefault('to', attrs.get('from') or get_shift_date())
+        attrs.setdefault('from', attrs['to'])
+        if attrs['from'] > attrs['to']:
+            raise serializers.ValidationError(
+                {'to': 'The end of the period is before its start.'},
+            )
+        if attrs['to'] - attrs['from'] >= timedelta(
+            days=REVENUE_SERIES_MAX_DAYS,
+        ):
+            raise serializers.ValidationError(
+                {'to': f'The period exceeds {REVENUE_SERIES_MAX_DAYS} days.'},
+            )
+        return attrs
+
+
+class OrderFilterQuerySerializer(serializers.Serializer):
+    """Сериализатор параметров фильтрации списка заказов.
+
+    Attributes:
+        table_number: Номер стола.
+        status: Статусы заказа, параметр можно повторить.
+        created_after: Начало периода создания включительно.
+        created_before: Конец периода создания, не включая его.
+        meal: Идентификаторы блюд, параметр можно повторить.
+    """
+
+    table_number = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        max_value=MAX_TABLES_NUMBER,
+    )
+    status = serializers.ListField(
+        child=serializers.ChoiceField(
+            choices=[
+                (value, label) for value, label in OrderStatus.choices if value
+            ],
+        ),
+        required=False,
+        allow_empty=False,
+    )
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+    meal = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+    )
+
+    def validate_status(self, value: list[str]) -> tuple[str, ...]:
+        """Упорядочивает статусы так же, как в условиях индексов.
+
+        Args:
+            value: Статусы из запроса.
+
+        Returns:
+            Статусы без повторов в порядке объявления.
+        """
+        return tuple(
+            status for status in OrderStatus.values if status in value
+        )
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        """Проверяет, что период создания не пустой.
+
+        Args:
+            attrs: Параметры запроса.
+
+        Returns:
+            Параметры запроса.
+
+        Raises:
+            ValidationError: Если конец периода не позже его начала.
+        """
+        if (
+            'created_after' in attrs
+            and 'created_before' in attrs
+            and attrs['created_after'] >= attrs['created_before']
+        ):
+            raise serializers.ValidationError(
+                {'created_before': 'Must be later than created_after.'},
+            )
+        return attrs
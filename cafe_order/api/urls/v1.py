@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import include
 from drf_spectacular.views import (
     SpectacularAPIView,
@@ -6,13 +7,42 @@ from drf_spectacular.views import (
 )
 from rest_framework.routers import DefaultRouter, path
 
-from api.views import MealViewSet, OrderViewSet
+from api.asynchronous import AsyncReadView
+from api.views import MealViewSet, OrderEventsView, OrderViewSet
 
 router = DefaultRouter()
 router.register('meals', MealViewSet)
 router.register('orders', OrderViewSet)
+router_views = {pattern.name: pattern.callback for pattern in router.urls}
+
+# Асинхронные маршруты чтения подключаются только под ASGI: под WSGI
+# каждый их запрос проходил бы лишние переходы async_to_sync/sync_to_async.
+async_read_urlpatterns = [
+    path(
+        'meals/',
+        AsyncReadView.as_view(view=router_views['meal-list']),
+        name='meal-list',
+    ),
+    path(
+        'orders/',
+        AsyncReadView.as_view(view=router_views['order-list']),
+        name='order-list',
+    ),
+    path(
+        'orders/revenue/',
+        AsyncReadView.as_view(view=router_views['order-revenue']),
+        name='order-revenue',
+    ),
+    path(
+        'orders/<int:pk>/',
+        AsyncReadView.as_view(view=router_views['order-detail']),
+        name='order-detail',
+    ),
+]
 
 urlpatterns = [
+    path('orders/events/', OrderEventsView.as_view(), name='order-events'),
+    *(async_read_urlpatterns if settings.ASYNC_API_READS else ()),
     path('', include(router.urls)),
     path('doc/schema/', SpectacularAPIView.as_view(), name='schema'),
     path(
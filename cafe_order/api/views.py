@@ -1,16 +1,54 @@
+from typing import Any
+
 from core.constants import (
     DELETE_PROHIBITED_MESSAGE,
+    MEAL_DELETE_PROHIBITED_MESSAGE,
+    ORDER_BULK_MAX_SIZE,
+    ORDER_NOT_FOUND_MESSAGE,
     UPDATE_PROHIBITED_MESSAGE,
+    OrderEventType,
     OrderStatus,
 )
-from django.db.models import Model
+from core.db import retry_on_lock
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import (
+    Model,
+    ProtectedError,
+    QuerySet,
+    prefetch_related_objects,
+)
+from django.http import Http404, HttpRequest, StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from order.events import (
+    broadcaster,
+    publish_order_deletions,
+    publish_order_events,
+)
+from order.menu import Menu, aget_menu, get_menu
 from order.models import Meal, Order
-from rest_framework import filters, serializers, viewsets
+from order.versions import MENU_VERSION, ORDERS_VERSION
+from rest_framework import serializers, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from api.serializers import MealSerializer, OrderSerializer
+from api.conditional import versioned
+from api.filters import OrderFilterBackend
+from api.pagination import (
+    MealPagination,
+    OrderChangesPagination,
+    OrderPagination,
+)
+from api.serializers import (
+    MealSerializer,
+    OrderIdsSerializer,
+    OrderRowSerializer,
+    OrderSerializer,
+    OrderTransitionSerializer,
+    RevenueSeriesQuerySerializer,
+)
 
 
 class MealViewSet(viewsets.ModelViewSet):
@@ -19,39 +57,355 @@ class MealViewSet(viewsets.ModelViewSet):
     Атрибуты:
         queryset: Все объекты блюд.
         serializer_class: Сериализатор для объектов блюд.
+        pagination_class: Постраничная выдача блюд по идентификатору.
     """
 
     queryset = Meal.objects.all()
     serializer_class = MealSerializer
+    pagination_class = MealPagination
+
+    @method_decorator(versioned(MENU_VERSION))
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Получение списка блюд из снимка меню.
+
+        Аргументы:
+            request: Запрос от клиента.
+            args: Дополнительные позиционные параметры.
+            kwargs: Дополнительные именованные параметры.
 
+        Возвращает:
+            Ответ со страницей блюд.
+        """
+        return self.get_menu_response(get_menu())
+
+    @method_decorator(versioned(MENU_VERSION))
+    async def alist(
+        self,
+        request: Request,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Response:
+        """Асинхронная версия `list`."""
+        return self.get_menu_response(await aget_menu())
+
+    def get_menu_response(self, menu: Menu) -> Response:
+        """Формирует ответ со страницей блюд из снимка меню.
+
+        Аргументы:
+            menu: Снимок меню.
+
+        Возвращает:
+            Ответ со страницей блюд.
+        """
+        page = self.paginate_queryset(list(menu))
+        return self.get_paginated_response(
+            self.get_serializer(page, many=True).data,
+        )
 
+    @method_decorator(versioned(MENU_VERSION))
+    def retrieve(
+        self,
+        request: Request,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Response:
+        """Получение блюда из снимка меню.
+
+        Аргументы:
+            request: Запрос от клиента.
+            args: Дополнительные позиционные параметры.
+            kwargs: Дополнительные именованные параметры.
+
+        Возвращает:
+            Ответ с блюдом.
+
+        Raises:
+            Http404: Если блюда нет в меню.
+        """
+        meal = get_menu().get_meal(self.kwargs[self.lookup_field])
+        if meal is None:
+            raise Http404
+        return Response(self.get_serializer(meal).data)
+
+    def perform_destroy(self, instance: Model) -> None:
+        """Проверяет, что блюдо не входит в заказы, перед удалением блюда.
+
+        Raises:
+            ValidationError: Если блюдо входит в позиции заказов.
+        """
+        try:
+            super().perform_destroy(instance)
+        except ProtectedError:
+            raise serializers.ValidationError(
+                MEAL_DELETE_PROHIBITED_MESSAGE,
+            ) from None
+
+
+@method_decorator(versioned(ORDERS_VERSION), name='list')
+@method_decorator(versioned(ORDERS_VERSION), name='alist')
+@method_decorator(versioned(ORDERS_VERSION), name='retrieve')
+@method_decorator(versioned(ORDERS_VERSION), name='aretrieve')
 class OrderViewSet(viewsets.ModelViewSet):
     """Представление для работы с объектами заказов.
 
     Атрибуты:
-        queryset: Все объекты заказов.
+        queryset: Все объекты заказов с предзагруженными блюдами.
         serializer_class: Сериализатор для объектов заказов.
+        row_serializer: Сериализатор строк заказов для чтения списка и
+            отдельного заказа.
+        pagination_class: Постраничная выдача заказов по времени создания.
+        filter_backends: Фильтрация заказов по столу, статусам, периоду
+            создания и блюдам.
     """
 
-    queryset = Order.objects.all()
+    queryset = Order.objects.with_items()
     serializer_class = OrderSerializer
-    filter_backends = (filters.SearchFilter,)
-    search_fields = ('table_number', 'status')
+    row_serializer = OrderRowSerializer()
+    pagination_class = OrderPagination
+    filter_backends = (OrderFilterBackend,)
+
+    @retry_on_lock
+    def create(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Создание заказа или списка заказов.
+
+        Список заказов проверяется целиком: блюда всех заказов
+        загружаются одним запросом, ошибки возвращаются списком по
+        элементам, и при любой ошибке ни один заказ не создается.
+        Корректный список сохраняется пакетными вставками в одной
+        транзакции.
+
+        Аргументы:
+            request: Запрос от клиента.
+            args: Дополнительные позиционные параметры.
+            kwargs: Дополнительные именованные параметры.
+
+        Возвращает:
+            Ответ с созданным заказом или списком заказов.
+        """
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+        serializer = self.get_serializer(
+            data=request.data,
+            many=True,
+            max_length=ORDER_BULK_MAX_SIZE,
+        )
+        serializer.is_valid(raise_exception=True)
+        orders = serializer.save()
+        prefetch_related_objects(orders, 'lines')
+        publish_order_events(OrderEventType.CREATED, orders)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(methods=('GET',), detail=False)
+    @method_decorator(versioned(ORDERS_VERSION))
+    def changes(self, request: Request) -> Response:
+        """Получение заказов, измененных или удаленных после курсора.
+
+        Без параметра `since` возвращает изменения с самого начала, то есть
+        все заказы. Ссылка `next` в ответе содержит курсор для следующего
+        запроса и возвращается всегда; при `has_more` изменения получены
+        не полностью и запрос по ссылке нужно повторить сразу.
+
+        Аргументы:
+            request: Запрос от клиента.
+
+        Возвращает:
+            Ответ с измененными заказами, идентификаторами удаленных
+            заказов и ссылкой для следующего запроса.
+        """
+        paginator = OrderChangesPagination()
+        orders, deleted = paginator.paginate_changes(
+            self.get_queryset(),
+            request,
+        )
+        return paginator.get_changes_response(
+            self.get_serializer(orders, many=True).data,
+            deleted,
+        )
 
     @action(methods=('GET',), detail=False)
     def revenue(self, request: Request) -> Response:
-        """Получение дохода за текущий день.
+        """Получение дохода за период.
+
+        Без параметров ряда возвращает сумму всех оплаченных заказов за
+        текущую дату. С любым из параметров `from`, `to`, `bucket` и
+        `group_by` возвращает временной ряд выручки в виде столбцов: начала
+        интервалов, номера столов при группировке по столам, суммы и
+        количества заказов. Другие параметры, например `format`, вид
+        ответа не меняют.
+
+        Аргументы:
+            request: Запрос от клиента.
+
+        Возвращает:
+            Ответ с суммой дохода за текущую дату или временным рядом.
+        """
+        if not self.is_revenue_series(request):
+            return Response(Order.objects.get_revenue_for_day())
+        params = self.get_revenue_params(request)
+        return Response(
+            self.get_revenue_series(
+                params,
+                Order.objects.get_revenue_series(
+                    params['from'],
+                    params['to'],
+                    bucket=params['bucket'],
+                    by_table=params['by_table'],
+                ),
+            ),
+        )
 
-        Возвращает сумму всех оплаченных заказов за текущую дату.
+    async def arevenue(self, request: Request) -> Response:
+        """Асинхронная версия `revenue`."""
+        if not self.is_revenue_series(request):
+            return Response(await Order.objects.aget_revenue_for_day())
+        params = self.get_revenue_params(request)
+        return Response(
+            self.get_revenue_series(
+                params,
+                await Order.objects.aget_revenue_series(
+                    params['from'],
+                    params['to'],
+                    bucket=params['bucket'],
+                    by_table=params['by_table'],
+                ),
+            ),
+        )
+
+    @staticmethod
+    def is_revenue_series(request: Request) -> bool:
+        """Проверяет, что запрошен временной ряд выручки.
 
         Аргументы:
             request: Запрос от клиента.
 
         Возвращает:
-            Ответ с суммой дохода за текущую дату.
+            `True`, если в запросе есть параметр временного ряда.
         """
-        return Response(Order.objects.get_revenue_for_day())
+        return not request.query_params.keys().isdisjoint(
+            RevenueSeriesQuerySerializer().fields,
+        )
+
+    @staticmethod
+    def get_revenue_params(request: Request) -> dict[str, Any]:
+        """Проверяет параметры запроса временного ряда выручки.
 
+        Аргументы:
+            request: Запрос от клиента.
+
+        Возвращает:
+            Период, интервал и признак `by_table` разбивки по столам.
+
+        Raises:
+            ValidationError: Если параметры некорректны.
+        """
+        query = RevenueSeriesQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        return {**params, 'by_table': params.get('group_by') == 'table'}
+
+    @staticmethod
+    def get_revenue_series(
+        params: dict[str, Any],
+        rows: list[dict[str, Any]],
+    ) -> dict[str, Any]:
+        """Формирует временной ряд выручки в виде столбцов.
+
+        Аргументы:
+            params: Проверенные параметры запроса.
+            rows: Строки выручки по интервалам.
+
+        Возвращает:
+            Период, интервал и столбцы временного ряда.
+        """
+        by_table = params['by_table']
+        series = {
+            'from': params['from'],
+            'to': params['to'],
+            'bucket': params['bucket'],
+            'starts': [row['start'] for row in rows],
+        }
+        if by_table:
+            series['tables'] = [row['table_number'] for row in rows]
+        series['revenue'] = [row['revenue'] for row in rows]
+        series['orders_count'] = [row['orders_count'] for row in rows]
+        return series
+
+    @action(methods=('POST',), detail=False)
+    @retry_on_lock
+    def transition(self, request: Request) -> Response:
+        """Пакетная смена статуса заказов.
+
+        Статус меняется одним UPDATE только у неоплаченных заказов.
+
+        Аргументы:
+            request: Запрос от клиента с идентификаторами `ids` и новым
+                статусом `status`.
+
+        Возвращает:
+            Ответ с идентификаторами измененных, отклоненных оплаченных и
+            ненайденных заказов.
+        """
+        serializer = OrderTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        changed, refused = Order.objects.filter(pk__in=ids).transition(
+            serializer.validated_data['status'],
+        )
+        publish_order_events(
+            OrderEventType.UPDATED,
+            Order.objects.with_items().filter(pk__in=changed),
+        )
+        return Response(self.get_bulk_result(ids, changed, refused))
+
+    @action(methods=('POST',), detail=False, url_path='bulk-delete')
+    @retry_on_lock
+    def bulk_delete(self, request: Request) -> Response:
+        """Пакетное удаление заказов.
+
+        Удаляются только неоплаченные заказы.
+
+        Аргументы:
+            request: Запрос от клиента с идентификаторами `ids`.
+
+        Возвращает:
+            Ответ с идентификаторами удаленных, отклоненных оплаченных и
+            ненайденных заказов.
+        """
+        serializer = OrderIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        changed, refused = Order.objects.filter(pk__in=ids).delete_unpaid()
+        publish_order_deletions(changed)
+        return Response(self.get_bulk_result(ids, changed, refused))
+
+    @staticmethod
+    def get_bulk_result(
+        ids: list[int],
+        changed: list[int],
+        refused: list[int],
+    ) -> dict[str, list[int]]:
+        """Формирует результат пакетного действия.
+
+        Аргументы:
+            ids: Запрошенные идентификаторы заказов.
+            changed: Идентификаторы измененных заказов.
+            refused: Идентификаторы отклоненных оплаченных заказов.
+
+        Возвращает:
+            Измененные, отклоненные и ненайденные идентификаторы.
+        """
+        return {
+            'changed': changed,
+            'refused': refused,
+            'not_found': sorted(set(ids) - set(changed) - set(refused)),
+        }
+
+    def perform_create(self, serializer: serializers.Serializer) -> None:
+        """Создает заказ и публикует событие его создания."""
+        super().perform_create(serializer)
+        publish_order_events(OrderEventType.CREATED, [serializer.instance])
+
+    @retry_on_lock
     def perform_update(self, serializer: serializers.Serializer) -> None:
         """Проверяет статус заказа перед обновлением заказа.
 
@@ -61,7 +415,9 @@ class OrderViewSet(viewsets.ModelViewSet):
         if serializer.validated_data.get('status') == OrderStatus.PAID_FOR:
             raise serializers.ValidationError(UPDATE_PROHIBITED_MESSAGE)
         super().perform_update(serializer)
+        publish_order_events(OrderEventType.UPDATED, [serializer.instance])
 
+    @retry_on_lock
     def perform_destroy(self, instance: Model) -> None:
         """Проверяет статус заказа перед удалением заказа.
 
@@ -70,4 +426,141 @@ class OrderViewSet(viewsets.ModelViewSet):
         """
         if instance.status == OrderStatus.PAID_FOR:
             raise serializers.ValidationError(DELETE_PROHIBITED_MESSAGE)
+        order_id = instance.pk
         super().perform_destroy(instance)
+        publish_order_deletions([order_id])
+
+    def get_row_queryset(self) -> QuerySet:
+        """Возвращает отфильтрованный запрос строк заказов для чтения.
+
+        Возвращает:
+            Запрос `values()` с полями `OrderRowSerializer`.
+        """
+        return self.filter_queryset(
+            Order.objects.values(*OrderRowSerializer.fields),
+        )
+
+    def get_object_row_queryset(self) -> QuerySet:
+        """Возвращает запрос строки заказа из адреса запроса.
+
+        Возвращает:
+            Запрос `values()` не больше чем с одной строкой.
+
+        Raises:
+            Http404: Если идентификатор заказа некорректен.
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            return self.get_row_queryset().filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]},
+            )
+        except (TypeError, ValueError, DjangoValidationError):
+            raise Http404(ORDER_NOT_FOUND_MESSAGE) from None
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Получение страницы заказов.
+
+        Заказы сериализуются из строк `values()` без создания объектов
+        моделей. Ответ проверяется по версии заказов из основной базы
+        данных, поэтому и заказы читаются из нее, а не из реплики.
+
+        Аргументы:
+            request: Запрос от клиента.
+            args: Дополнительные позиционные параметры.
+            kwargs: Дополнительные именованные параметры.
+
+        Возвращает:
+            Ответ со страницей заказов.
+        """
+        page = self.paginate_queryset(self.get_row_queryset())
+        return self.get_paginated_response(self.row_serializer.get_data(page))
+
+    async def alist(
+        self,
+        request: Request,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Response:
+        """Асинхронная версия `list`."""
+        page = await self.paginator.apaginate_queryset(
+            self.get_row_queryset(),
+            request,
+            view=self,
+        )
+        return self.get_paginated_response(
+            await self.row_serializer.aget_data(page),
+        )
+
+    def retrieve(
+        self,
+        request: Request,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Response:
+        """Получение заказа.
+
+        Заказ сериализуется из строки `values()` без создания объектов
+        моделей.
+
+        Аргументы:
+            request: Запрос от клиента.
+            args: Дополнительные позиционные параметры.
+            kwargs: Дополнительные именованные параметры.
+
+        Возвращает:
+            Ответ с заказом.
+
+        Raises:
+            Http404: Если заказ не найден.
+        """
+        rows = list(self.get_object_row_queryset())
+        if not rows:
+            raise Http404(ORDER_NOT_FOUND_MESSAGE)
+        return Response(self.row_serializer.get_data(rows)[0])
+
+    async def aretrieve(
+        self,
+        request: Request,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Response:
+        """Асинхронная версия `retrieve`.
+
+        Raises:
+            Http404: Если заказ не найден.
+        """
+        rows = [row async for row in self.get_object_row_queryset()]
+        if not rows:
+            raise Http404(ORDER_NOT_FOUND_MESSAGE)
+        return Response((await self.row_serializer.aget_data(rows))[0])
+
+
+class OrderEventsView(View):
+    """Поток событий заказов для кухонных экранов.
+
+    Отдает server-sent events о создании, изменении и удалении заказов.
+    События рассылаются внутри процесса, поэтому клиент получает только
+    изменения, сделанные процессом, который обслуживает его соединение.
+    """
+
+    def get(self, request: HttpRequest) -> StreamingHttpResponse:
+        """Открывает поток событий заказов.
+
+        Аргументы:
+            request: Запрос от клиента. Заголовок `Last-Event-ID`
+                возобновляет поток после указанного события.
+
+        Возвращает:
+            Потоковый ответ `text/event-stream`. Под ASGI поток
+            асинхронный и не занимает поток выполнения на время ожидания.
+        """
+        last_event_id = request.headers.get('Last-Event-ID')
+        response = StreamingHttpResponse(
+            broadcaster.astream(last_event_id)
+            if isinstance(request, ASGIRequest)
+            else broadcaster.stream(last_event_id),
+            content_type='text/event-stream',
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
@@ -0,0 +1,8 @@
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'cafe_order.settings')
+os.environ.setdefault('ASYNC_API_READS', 'True')
+
+application = get_asgi_application()
@@ -1,3 +1,4 @@
+from datetime import time
 from pathlib import Path
 
 import environ
@@ -5,6 +6,27 @@ import environ
 env = environ.Env(
     DEBUG=(bool, False),
     ALLOWED_HOSTS=(list, []),
+    API_PAGE_SIZE=(int, 50),
+    API_MAX_PAGE_SIZE=(int, 500),
+    TIME_ZONE=(str, 'UTC'),
+    SHIFT_START=(str, '00:00'),
+    DB_CONN_MAX_AGE=(int, 60),
+    DB_CONN_HEALTH_CHECKS=(bool, True),
+    DB_LOCK_RETRIES=(int, 3),
+    DB_LOCK_RETRY_DELAY=(float, 0.05),
+    SQLITE_TIMEOUT=(float, 5),
+    SQLITE_TRANSACTION_MODE=(str, 'IMMEDIATE'),
+    SQLITE_JOURNAL_MODE=(str, 'WAL'),
+    SQLITE_SYNCHRONOUS=(str, 'NORMAL'),
+    SQLITE_MMAP_SIZE=(int, 268435456),
+    SQLITE_CACHE_SIZE=(int, -20000),
+    SQLITE_CACHED_STATEMENTS=(int, 256),
+    DB_REPLICA_NAME=(str, ''),
+    DB_REPLICA_MAX_LAG=(float, 30),
+    SERVER_TIMING=(bool, False),
+    ASYNC_API_READS=(bool, False),
+    METRICS_DIR=(str, ''),
+    METRICS_FLUSH_INTERVAL=(float, 1),
 )
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -33,7 +55,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.ReadYourWritesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -42,6 +66,9 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+if env('SERVER_TIMING'):
+    MIDDLEWARE.insert(0, 'core.middleware.ServerTimingMiddleware')
+
 ROOT_URLCONF = 'cafe_order.urls'
 
 TEMPLATES = [
@@ -63,13 +90,51 @@ TEMPLATES = [
 WSGI_APPLICATION = 'cafe_order.wsgi.application'
 
 
+CACHES = {
+    'default': env.cache_url(
+        'CACHE_URL',
+        default=f'filecache://{Path(BASE_DIR).joinpath(".cache")}',
+    ),
+}
+
+SQLITE_PRAGMAS = {
+    'journal_mode': env('SQLITE_JOURNAL_MODE'),
+    'synchronous': env('SQLITE_SYNCHRONOUS'),
+    'mmap_size': env('SQLITE_MMAP_SIZE'),
+    'cache_size': env('SQLITE_CACHE_SIZE'),
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': Path(BASE_DIR).joinpath('db.sqlite3'),
+        'CONN_MAX_AGE': env('DB_CONN_MAX_AGE'),
+        'CONN_HEALTH_CHECKS': env('DB_CONN_HEALTH_CHECKS'),
+        'OPTIONS': {
+            'init_command': ';'.join(
+                f'PRAGMA {name}={value}'
+                for name, value in SQLITE_PRAGMAS.items()
+            ),
+            'transaction_mode': env('SQLITE_TRANSACTION_MODE'),
+            'timeout': env('SQLITE_TIMEOUT'),
+            'cached_statements': env('SQLITE_CACHED_STATEMENTS'),
+        },
     }
 }
 
+if env('DB_REPLICA_NAME'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': Path(BASE_DIR).joinpath(env('DB_REPLICA_NAME')),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.db.ReplicaRouter']
+DATABASE_REPLICA_MAX_LAG = env('DB_REPLICA_MAX_LAG')
+
+DATABASE_LOCK_RETRIES = env('DB_LOCK_RETRIES')
+DATABASE_LOCK_RETRY_DELAY = env('DB_LOCK_RETRY_DELAY')
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -89,7 +154,7 @@ AUTH_PASSWORD_VALIDATORS = [
 
 LANGUAGE_CODE = 'en-us'
 
-TIME_ZONE = 'UTC'
+TIME_ZONE = env('TIME_ZONE')
 
 USE_I18N = True
 
@@ -103,11 +168,41 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
 
+METRICS_DIR = env('METRICS_DIR')
+METRICS_FLUSH_INTERVAL = env('METRICS_FLUSH_INTERVAL')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core.middleware': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': ('rest_framework.permissions.AllowAny',),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.KeysetPagination',
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    'PAGE_SIZE': env('API_PAGE_SIZE'),
 }
 
+API_MAX_PAGE_SIZE = env('API_MAX_PAGE_SIZE')
+ASYNC_API_READS = env('ASYNC_API_READS')
+
+SHIFT_START = time.fromisoformat(env('SHIFT_START'))
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Cafe Order API',
     'DESCRIPTION': 'Cafe order management system.',
@@ -2,6 +2,7 @@ from core.views import (
     PageNotFoundView,
     PermissionDeniedView,
     ServerErrorView,
+    metrics_view,
 )
 from django.apps import apps
 from django.contrib import admin
@@ -18,6 +19,7 @@ urlpatterns = [
     ),
     path('api/', include('api.urls', namespace='api')),
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
 ]
 
 handler404 = PageNotFoundView.as_view()
@@ -1,5 +1,24 @@
+import atexit
+
 from django.apps import AppConfig
 
 
 class CoreConfig(AppConfig):
+    """Конфигурация общего приложения.
+
+    Attributes:
+        name: Название приложения.
+    """
+
     name = 'core'
+
+    def ready(self) -> None:
+        """Подключает обработчики сигналов приложения.
+
+        При завершении процесса его метрики записываются в общий каталог,
+        чтобы не потерять значения после последней записи.
+        """
+        from core import signals  # noqa: F401
+        from core.metrics import metrics
+
+        atexit.register(metrics.flush, force=True)
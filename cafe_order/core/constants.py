@@ -1,9 +1,37 @@
 from django.db import models
 
 MAX_TABLES_NUMBER = 100
+ORDER_LIST_PAGE_SIZE = 50
+ACTIVE_ORDERS_FILTER = 'ACTIVE'
+REVENUE_SERIES_MAX_DAYS = 366
+ORDER_BULK_MAX_SIZE = 100
+ORDER_EVENTS_BUFFER_SIZE = 1000
+ORDER_EVENTS_HEARTBEAT_SECONDS = 15
+ORDER_EVENTS_RETRY_MILLISECONDS = 3000
+DATABASE_LOCK_WAIT_THRESHOLD_SECONDS = 0.001
+REPLICA_DB_ALIAS = 'replica'
+PRIMARY_PIN_COOKIE = 'primary_pin'
+ORDER_ARCHIVE_DAYS = 30
+ORDER_PURGE_DAYS = 1
+ORDER_ARCHIVE_BATCH_SIZE = 500
+METRICS_LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+)
 
 DELETE_PROHIBITED_MESSAGE = 'Deleting a paid order is prohibited.'
 UPDATE_PROHIBITED_MESSAGE = 'Changing a paid order is prohibited.'
+MEAL_DELETE_PROHIBITED_MESSAGE = 'Deleting an ordered meal is prohibited.'
+ORDER_NOT_FOUND_MESSAGE = 'No Order matches the given query.'
 
 
 class OrderStatus(models.TextChoices):
@@ -20,3 +48,36 @@ class OrderStatus(models.TextChoices):
     WAITING = 'WAITING', 'Waiting'
     READY = 'READY', 'Ready'
     PAID_FOR = 'PAID_FOR', 'Paid for'
+
+
+class RevenueBucket(models.TextChoices):
+    """Варианты интервала группировки выручки.
+
+    Attributes:
+        HOUR:
+        DAY:
+        WEEK:
+    """
+
+    HOUR = 'hour', 'Hour'
+    DAY = 'day', 'Day'
+    WEEK = 'week', 'Week'
+
+
+class OrderEventType(models.TextChoices):
+    """Варианты типа события заказа.
+
+    Attributes:
+        CREATED:
+        UPDATED:
+        DELETED:
+        RESET:
+    """
+
+    CREATED = 'created', 'Created'
+    UPDATED = 'updated', 'Updated'
+    DELETED = 'deleted', 'Deleted'
+    RESET = 'reset', 'Reset'
+
+
+ACTIVE_ORDER_STATUSES = (OrderStatus.WAITING, OrderStatus.READY)
@@ -0,0 +1,357 @@
+import inspect
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any
+
+from django.conf import settings
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    OperationalError,
+    connection,
+    connections,
+)
+from django.db.models import Model
+
+from core.constants import (
+    DATABASE_LOCK_WAIT_THRESHOLD_SECONDS,
+    REPLICA_DB_ALIAS,
+)
+
+LOCK_ERROR_MESSAGES = ('database is locked', 'database table is locked')
+
+logger = logging.getLogger(__name__)
+
+_retrying: ContextVar[bool] = ContextVar('retrying', default=False)
+_replica_reads: ContextVar[bool] = ContextVar('replica_reads', default=False)
+_primary_pinned: ContextVar[bool] = ContextVar(
+    'primary_pinned',
+    default=False,
+)
+_primary_written: ContextVar[bool] = ContextVar(
+    'primary_written',
+    default=False,
+)
+
+
+class LockStats:
+    """Счетчики ожиданий блокировки базы данных в процессе.
+
+    Attributes:
+        waits: Количество начал транзакций, ожидавших блокировку записи.
+        wait_seconds: Суммарное время этих ожиданий.
+        timeouts: Количество ошибок блокировки после истечения ожидания.
+        retries: Количество повторов записи после ошибки блокировки.
+        failures: Количество записей, не выполненных после всех повторов.
+    """
+
+    fields = ('waits', 'wait_seconds', 'timeouts', 'retries', 'failures')
+
+    def __init__(self) -> None:
+        """Создает обнуленные счетчики."""
+        self._lock = threading.Lock()
+        self.reset()
+
+    def add(self, **values: float) -> None:
+        """Увеличивает счетчики на указанные значения.
+
+        Args:
+            values: Приращения счетчиков по названиям.
+        """
+        with self._lock:
+            for field, value in values.items():
+                setattr(self, field, getattr(self, field) + value)
+
+    def as_dict(self) -> dict[str, float]:
+        """Возвращает текущие значения счетчиков."""
+        with self._lock:
+            return {field: getattr(self, field) for field in self.fields}
+
+    def reset(self) -> None:
+        """Обнуляет счетчики."""
+        with self._lock:
+            for field in self.fields:
+                setattr(self, field, 0)
+
+
+lock_stats = LockStats()
+
+
+def is_lock_error(exc: Exception) -> bool:
+    """Проверяет, что ошибка вызвана блокировкой базы данных SQLite.
+
+    Args:
+        exc: Исключение.
+
+    Returns:
+        `True`, если база данных заблокирована другим соединением.
+    """
+    return isinstance(exc, OperationalError) and str(exc).startswith(
+        LOCK_ERROR_MESSAGES,
+    )
+
+
+def track_lock_waits(
+    execute: Callable,
+    sql: str,
+    params: Any,
+    many: bool,
+    context: dict[str, Any],
+) -> Any:
+    """Учитывает ожидание блокировки записи при начале транзакции.
+
+    При `transaction_mode` `IMMEDIATE` блокировка записи захватывается
+    командой `BEGIN`, поэтому ее длительность и есть время ожидания
+    других пишущих соединений.
+
+    Args:
+        execute: Следующий обработчик выполнения запроса.
+        sql: Текст запроса.
+        params: Параметры запроса.
+        many: Признак выполнения запроса для набора параметров.
+        context: Контекст выполнения запроса.
+
+    Returns:
+        Результат выполнения запроса.
+    """
+    if not sql.startswith('BEGIN'):
+        return execute(sql, params, many, context)
+    started = time.monotonic()
+    try:
+        return execute(sql, params, many, context)
+    except OperationalError as exc:
+        if is_lock_error(exc):
+            lock_stats.add(timeouts=1)
+        raise
+    finally:
+        waited = time.monotonic() - started
+        if waited >= DATABASE_LOCK_WAIT_THRESHOLD_SECONDS:
+            lock_stats.add(waits=1, wait_seconds=waited)
+
+
+def retry_on_lock(func: Callable) -> Callable:
+    """Повторяет запись при блокировке базы данных с нарастающей паузой.
+
+    Повтор выполняется только на внешнем уровне: внутри транзакции или
+    другого вызова с повтором ошибка передается дальше, чтобы повторилась
+    вся транзакция целиком.
+
+    Args:
+        func: Функция или метод, выполняющие запись.
+
+    Returns:
+        Функция с повтором при блокировке.
+    """
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if _retrying.get() or connection.in_atomic_block:
+            return func(*args, **kwargs)
+        token = _retrying.set(True)
+        try:
+            attempt = 0
+            while True:
+                try:
+                    return func(*args, **kwargs)
+                except OperationalError as exc:
+                    if not is_lock_error(exc):
+                        raise
+                    if attempt >= settings.DATABASE_LOCK_RETRIES:
+                        lock_stats.add(failures=1)
+                        raise
+                delay = (
+                    settings.DATABASE_LOCK_RETRY_DELAY
+                    * 2**attempt
+                    * random.uniform(0.5, 1)
+                )
+                attempt += 1
+                lock_stats.add(retries=1)
+                logger.warning(
+                    'Database is locked, retrying %s in %.3fs (attempt %d)',
+                    func.__qualname__,
+                    delay,
+                    attempt,
+                )
+                time.sleep(delay)
+        finally:
+            _retrying.reset(token)
+
+    return wrapper
+
+
+def has_replica() -> bool:
+    """Проверяет, что реплика базы данных настроена.
+
+    Returns:
+        `True`, если в настройках есть подключение реплики.
+    """
+    return REPLICA_DB_ALIAS in connections
+
+
+def read_from_replica(func: Callable) -> Callable:
+    """Направляет чтение внутри функции в реплику базы данных.
+
+    Подходит для обычных и асинхронных функций. Чтение уходит в реплику,
+    только если она настроена и в текущем запросе еще не было записи.
+
+    Args:
+        func: Функция или метод, выполняющие отчетное чтение.
+
+    Returns:
+        Функция, читающая из реплики.
+    """
+    if inspect.iscoroutinefunction(func):
+
+        @wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            token = _replica_reads.set(True)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _replica_reads.reset(token)
+
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        token = _replica_reads.set(True)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _replica_reads.reset(token)
+
+    return wrapper
+
+
+def pin_primary() -> None:
+    """Привязывает чтение до конца запроса к основной базе данных."""
+    _primary_pinned.set(True)
+
+
+def unpin_primary() -> None:
+    """Снимает привязку чтения к основной базе данных.
+
+    Вызывается в начале каждого запроса.
+    """
+    _primary_pinned.set(False)
+    _primary_written.set(False)
+
+
+def has_written() -> bool:
+    """Проверяет, что в текущем запросе была запись в основную базу данных.
+
+    Returns:
+        `True`, если с начала запроса выбиралась база данных для записи.
+    """
+    return _primary_written.get()
+
+
+class ReplicaRouter:
+    """Маршрутизатор чтения отчетов и списков в реплику.
+
+    Запись всегда выполняется в основную базу данных и до конца запроса
+    привязывает к ней чтение, чтобы запрос видел собственные изменения.
+    Следующие запросы клиента привязывает к основной базе
+    `core.middleware.ReadYourWritesMiddleware`.
+    В реплику уходит только чтение внутри функций с `read_from_replica`.
+    Схема реплики не мигрирует: она копируется вместе с данными командой
+    `sync_replica`.
+    """
+
+    def db_for_read(self, model: type[Model], **hints: Any) -> str | None:
+        """Выбирает базу данных для чтения.
+
+        Args:
+            model: Модель запроса.
+            hints: Подсказки маршрутизации.
+
+        Returns:
+            Реплика для отчетного чтения или `None` для выбора по
+            умолчанию.
+        """
+        if (
+            _replica_reads.get()
+            and not _primary_pinned.get()
+            and has_replica()
+        ):
+            return REPLICA_DB_ALIAS
+        return None
+
+    def db_for_write(self, model: type[Model], **hints: Any) -> str:
+        """Выбирает основную базу данных для записи.
+
+        Args:
+            model: Модель запроса.
+            hints: Подсказки маршрутизации.
+
+        Returns:
+            Основная база данных.
+        """
+        _primary_pinned.set(True)
+        _primary_written.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(
+        self,
+        obj1: Model,
+        obj2: Model,
+        **hints: Any,
+    ) -> bool | None:
+        """Разрешает связи между объектами основной базы и реплики.
+
+        Args:
+            obj1: Первый объект.
+            obj2: Второй объект.
+            hints: Подсказки маршрутизации.
+
+        Returns:
+            `True` для объектов из основной базы и реплики.
+        """
+        aliases = {DEFAULT_DB_ALIAS, REPLICA_DB_ALIAS}
+        if {obj1._state.db, obj2._state.db} <= aliases:
+            return True
+        return None
+
+    def allow_migrate(
+        self,
+        db: str,
+        app_label: str,
+        model_name: str | None = None,
+        **hints: Any,
+    ) -> bool | None:
+        """Запрещает миграции реплики.
+
+        Args:
+            db: Псевдоним базы данных.
+            app_label: Приложение миграции.
+            model_name: Модель миграции.
+            hints: Подсказки маршрутизации.
+
+        Returns:
+            `False` для реплики.
+        """
+        if db == REPLICA_DB_ALIAS:
+            return False
+        return None
+
+
+def sync_replica(pages: int = -1) -> None:
+    """Копирует основную базу данных SQLite в реплику.
+
+    Используется онлайн-резервное копирование SQLite: в режиме WAL запись
+    в основную базу во время копирования не блокируется, а реплика
+    получает согласованный снимок.
+
+    Args:
+        pages: Количество страниц, копируемых за один шаг. При `-1` база
+            копируется за один шаг.
+    """
+    source = connections[DEFAULT_DB_ALIAS]
+    target = connections[REPLICA_DB_ALIAS]
+    source.ensure_connection()
+    target.ensure_connection()
+    source.connection.backup(target.connection, pages=pages)
@@ -0,0 +1,288 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+
+from core.constants import METRICS_LATENCY_BUCKETS
+from core.db import lock_stats
+
+Labels = tuple[tuple[str, str], ...]
+Samples = dict[tuple[str, Labels], float]
+
+METRICS = {
+    'cafe_http_request_duration_seconds': (
+        'histogram',
+        'Request latency by route, method and status code.',
+    ),
+    'cafe_http_db_queries_total': (
+        'counter',
+        'Database queries made while handling requests, by route.',
+    ),
+    'cafe_orders_created_total': ('counter', 'Orders created.'),
+    'cafe_orders_paid_total': ('counter', 'Orders paid for.'),
+    'cafe_orders_active': ('gauge', 'Unpaid orders by status.'),
+    'cafe_cache_requests_total': (
+        'counter',
+        'Cache lookups by cache and result.',
+    ),
+    'cafe_db_lock_waits_total': (
+        'counter',
+        'Transactions that waited for the database write lock.',
+    ),
+    'cafe_db_lock_wait_seconds_total': (
+        'counter',
+        'Time spent waiting for the database write lock.',
+    ),
+    'cafe_db_lock_timeouts_total': (
+        'counter',
+        'Statements that failed with a database lock error.',
+    ),
+    'cafe_db_lock_retries_total': (
+        'counter',
+        'Writes retried after a database lock error.',
+    ),
+    'cafe_db_lock_failures_total': (
+        'counter',
+        'Writes that failed after all lock retries.',
+    ),
+}
+
+
+class Metrics:
+    """Счетчики и гистограммы процесса для `/metrics`.
+
+    Значения обновляются в памяти под одной блокировкой. Если задан
+    каталог `METRICS_DIR`, процесс не чаще раза в `METRICS_FLUSH_INTERVAL`
+    секунд записывает в него снимок своих значений, а страница метрик
+    складывает снимки всех процессов. Показатели, которые вычисляются при
+    запросе страницы, например количество активных заказов, возвращают
+    сборщики из `add_collector`.
+    """
+
+    def __init__(self) -> None:
+        """Создает пустой набор метрик."""
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._collectors: list[Callable[[], Samples]] = []
+        self.reset()
+
+    def add_collector(self, collector: Callable[[], Samples]) -> None:
+        """Добавляет сборщик показателей, вычисляемых при запросе метрик.
+
+        Args:
+            collector: Функция, возвращающая значения по названию и меткам.
+        """
+        self._collectors.append(collector)
+
+    def collect_gauges(self) -> Samples:
+        """Вычисляет показатели всех сборщиков.
+
+        Returns:
+            Значения показателей по названию и меткам.
+        """
+        gauges: Samples = {}
+        for collector in self._collectors:
+            gauges.update(collector())
+        return gauges
+
+    def reset(self) -> None:
+        """Обнуляет значения процесса."""
+        with self._lock:
+            self._counters: dict[tuple[str, Labels], float] = defaultdict(
+                float,
+            )
+            self._histograms: dict[tuple[str, Labels], list[float]] = {}
+            self._flushed_at = time.monotonic()
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        """Увеличивает счетчик.
+
+        Args:
+            name: Название счетчика.
+            value: Приращение.
+            labels: Метки значения.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] += value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Добавляет наблюдение в гистограмму.
+
+        Args:
+            name: Название гистограммы.
+            value: Наблюдаемое значение.
+            labels: Метки значения.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        index = bisect_left(METRICS_LATENCY_BUCKETS, value)
+        with self._lock:
+            row = self._histograms.get(key)
+            if row is None:
+                row = self._histograms[key] = [0] * (
+                    len(METRICS_LATENCY_BUCKETS) + 2
+                )
+            row[index] += 1
+            row[-1] += value
+
+    def snapshot(self) -> dict[str, list]:
+        """Возвращает значения процесса, включая ожидания блокировки.
+
+        Returns:
+            Счетчики и строки гистограмм: количество наблюдений по
+            интервалам, включая интервал выше последней границы, и сумма.
+        """
+        with self._lock:
+            counters = [
+                [name, labels, value]
+                for (name, labels), value in self._counters.items()
+            ]
+            histograms = [
+                [name, labels, list(row)]
+                for (name, labels), row in self._histograms.items()
+            ]
+        counters.extend(
+            [f'cafe_db_lock_{field}_total', (), value]
+            for field, value in lock_stats.as_dict().items()
+        )
+        return {'counters': counters, 'histograms': histograms}
+
+    def flush(self, force: bool = False) -> None:
+        """Записывает снимок процесса в общий каталог.
+
+        Снимок записывается во временный файл и переименовывается, поэтому
+        читающий процесс не видит частично записанный файл.
+
+        Args:
+            force: Записать снимок, даже если интервал еще не прошел.
+        """
+        directory = settings.METRICS_DIR
+        if not directory or not self._flush_lock.acquire(blocking=force):
+            return
+        try:
+            now = time.monotonic()
+            if (
+                not force
+                and now - self._flushed_at < settings.METRICS_FLUSH_INTERVAL
+            ):
+                return
+            self._flushed_at = now
+            path = Path(directory).joinpath(f'{os.getpid()}.json')
+            temporary = path.with_suffix('.tmp')
+            temporary.write_text(json.dumps(self.snapshot()))
+            temporary.replace(path)
+        finally:
+            self._flush_lock.release()
+
+    def collect(self) -> list[dict[str, list]]:
+        """Возвращает снимки всех процессов.
+
+        Returns:
+            Снимки процессов из общего каталога или снимок текущего
+            процесса, если каталог не задан.
+        """
+        if not settings.METRICS_DIR:
+            return [self.snapshot()]
+        self.flush(force=True)
+        return [
+            json.loads(path.read_text())
+            for path in Path(settings.METRICS_DIR).glob('*.json')
+        ]
+
+
+metrics = Metrics()
+
+
+def merge_snapshots(
+    snapshots: list[dict[str, list]],
+) -> tuple[Samples, dict[tuple[str, Labels], list]]:
+    """Складывает снимки процессов.
+
+    Args:
+        snapshots: Снимки процессов.
+
+    Returns:
+        Суммы счетчиков и строк гистограмм по названию и меткам.
+    """
+    counters: Samples = defaultdict(float)
+    histograms: dict[tuple[str, Labels], list] = {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot['counters']:
+            counters[name, tuple(map(tuple, labels))] += value
+        for name, labels, row in snapshot['histograms']:
+            key = (name, tuple(map(tuple, labels)))
+            total = histograms.setdefault(key, [0] * len(row))
+            for index, value in enumerate(row):
+                total[index] += value
+    return counters, histograms
+
+
+def render_metrics() -> str:
+    """Формирует метрики всех процессов в текстовом формате Prometheus.
+
+    Returns:
+        Текст страницы метрик.
+    """
+    counters, histograms = merge_snapshots(metrics.collect())
+    counters.update(metrics.collect_gauges())
+    samples: dict[str, list[str]] = defaultdict(list)
+    for (name, labels), value in sorted(counters.items()):
+        samples[name].append(format_sample(name, labels, value))
+    for (name, labels), row in sorted(histograms.items()):
+        cumulative = 0
+        for bound, count in zip(
+            (*METRICS_LATENCY_BUCKETS, '+Inf'),
+            row[:-1],
+            strict=True,
+        ):
+            cumulative += count
+            samples[name].append(
+                format_sample(
+                    f'{name}_bucket',
+                    (*labels, ('le', str(bound))),
+                    cumulative,
+                ),
+            )
+        samples[name].append(format_sample(f'{name}_sum', labels, row[-1]))
+        samples[name].append(
+            format_sample(f'{name}_count', labels, cumulative),
+        )
+    lines = []
+    for name, (metric_type, description) in METRICS.items():
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {metric_type}')
+        lines.extend(samples.get(name, ()))
+    return '\n'.join(lines) + '\n'
+
+
+def format_sample(name: str, labels: Labels, value: Any) -> str:
+    """Формирует строку значения метрики.
+
+    Args:
+        name: Название значения.
+        labels: Метки значения.
+        value: Значение.
+
+    Returns:
+        Строка вида `name{label="value"} 1`.
+    """
+    if not labels:
+        return f'{name} {value}'
+    text = ','.join(
+        '{}="{}"'.format(
+            label,
+            str(label_value)
+            .replace('\\', r'\\')
+            .replace('"', r'\"')
+            .replace('\n', r'\n'),
+        )
+        for label, label_value in labels
+    )
+    return f'{name}{{{text}}} {value}'
@@ -0,0 +1,409 @@
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from contextvars import ContextVar
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpRequest, HttpResponseBase
+from django.template.response import SimpleTemplateResponse
+
+from core.constants import PRIMARY_PIN_COOKIE
+from core.db import has_replica, has_written, pin_primary
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_request_timing: ContextVar['RequestTiming | None'] = ContextVar(
+    'request_timing',
+    default=None,
+)
+
+
+class RequestTiming:
+    """Время обработки запроса по этапам.
+
+    Attributes:
+        queries: Количество выполненных запросов к базе данных.
+        db_seconds: Суммарное время запросов к базе данных.
+        render_seconds: Время отрисовки шаблона или сериализации ответа.
+        started: Время начала обработки по `time.perf_counter`.
+    """
+
+    def __init__(self) -> None:
+        """Создает замер, начатый в момент вызова."""
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.render_seconds = 0.0
+        self.started = time.perf_counter()
+        self._render_started = 0.0
+
+    def start_render(self, response: SimpleTemplateResponse) -> None:
+        """Начинает замер отрисовки ответа с шаблоном.
+
+        Args:
+            response: Еще не отрисованный ответ.
+        """
+        self._render_started = time.perf_counter()
+        response.add_post_render_callback(self._finish_render)
+
+    def _finish_render(self, response: SimpleTemplateResponse) -> None:
+        self.render_seconds += time.perf_counter() - self._render_started
+
+    def as_metrics(self) -> dict[str, float]:
+        """Возвращает длительности этапов в миллисекундах.
+
+        Время представления включает запросы к базе данных, но не
+        отрисовку ответа.
+
+        Returns:
+            Длительности `db`, `view`, `render` и `total`.
+        """
+        total = time.perf_counter() - self.started
+        return {
+            'db': self.db_seconds * 1000,
+            'view': (total - self.render_seconds) * 1000,
+            'render': self.render_seconds * 1000,
+            'total': total * 1000,
+        }
+
+
+def track_query_time(
+    execute: Callable,
+    sql: str,
+    params: Any,
+    many: bool,
+    context: dict[str, Any],
+) -> Any:
+    """Учитывает запрос к базе данных в замере текущего HTTP-запроса.
+
+    Вне запроса, замеряемого `TimingMiddleware`, запрос выполняется без
+    замера.
+
+    Args:
+        execute: Следующий обработчик выполнения запроса.
+        sql: Текст запроса.
+        params: Параметры запроса.
+        many: Признак выполнения запроса для набора параметров.
+        context: Контекст выполнения запроса.
+
+    Returns:
+        Результат выполнения запроса.
+    """
+    timing = _request_timing.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.queries += 1
+        timing.db_seconds += time.perf_counter() - started
+
+
+def get_route_name(request: HttpRequest) -> str:
+    """Возвращает имя маршрута запроса для журнала и метрик.
+
+    Args:
+        request: Запрос от клиента.
+
+    Returns:
+        Имя маршрута, например `order:order_list`, или `unmatched`, если
+        адрес не найден.
+    """
+    if request.resolver_match is None:
+        return 'unmatched'
+    return request.resolver_match.view_name
+
+
+class TimingMiddleware(ABC):
+    """Основа промежуточных слоев, замеряющих обработку запроса.
+
+    Замер запросов к базе данных общий для всех таких слоев запроса:
+    внутренний слой продолжает замер внешнего. Слой работает и в
+    синхронном, и в асинхронном режиме.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        """Создает промежуточный слой.
+
+        Args:
+            get_response: Следующий обработчик запроса.
+        """
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        """Обрабатывает запрос с замером времени.
+
+        Args:
+            request: Запрос от клиента.
+
+        Returns:
+            Ответ или корутина, возвращающая его, в асинхронном режиме.
+        """
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timing = _request_timing.get() or RequestTiming()
+        token = _request_timing.set(timing)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_timing.reset(token)
+        self.report(request, response, timing)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        """Асинхронно обрабатывает запрос с замером времени.
+
+        Args:
+            request: Запрос от клиента.
+
+        Returns:
+            Ответ на запрос.
+        """
+        timing = _request_timing.get() or RequestTiming()
+        token = _request_timing.set(timing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_timing.reset(token)
+        self.report(request, response, timing)
+        return response
+
+    @abstractmethod
+    def report(
+        self,
+        request: HttpRequest,
+        response: HttpResponseBase,
+        timing: RequestTiming,
+    ) -> None:
+        """Передает результаты замера.
+
+        Args:
+            request: Запрос от клиента.
+            response: Ответ на запрос.
+            timing: Замер времени запроса.
+        """
+
+
+class ServerTimingMiddleware(TimingMiddleware):
+    """Замер количества запросов к базе и времени этапов запроса.
+
+    Результаты добавляются в заголовок `Server-Timing` ответа и
+    записываются в журнал одной строкой с именем маршрута. Подключается
+    первым в `MIDDLEWARE`, чтобы общее время включало остальные
+    промежуточные слои.
+    """
+
+    def __init__(self, get_response: Callable) -> None:
+        """Создает промежуточный слой.
+
+        Args:
+            get_response: Следующий обработчик запроса.
+        """
+        super().__init__(get_response)
+        if iscoroutinefunction(self):
+            self.process_template_response = self.aprocess_template_response
+
+    def process_template_response(
+        self,
+        request: HttpRequest,
+        response: SimpleTemplateResponse,
+    ) -> SimpleTemplateResponse:
+        """Начинает замер отрисовки ответа с шаблоном.
+
+        Args:
+            request: Запрос от клиента.
+            response: Ответ представления до отрисовки.
+
+        Returns:
+            Тот же ответ.
+        """
+        timing = _request_timing.get()
+        if timing is not None:
+            timing.start_render(response)
+        return response
+
+    async def aprocess_template_response(
+        self,
+        request: HttpRequest,
+        response: SimpleTemplateResponse,
+    ) -> SimpleTemplateResponse:
+        """Асинхронная версия `process_template_response`.
+
+        Подставляется в асинхронном режиме, чтобы Django не переключался
+        в поток для синхронного метода.
+
+        Args:
+            request: Запрос от клиента.
+            response: Ответ представления до отрисовки.
+
+        Returns:
+            Тот же ответ.
+        """
+        return ServerTimingMiddleware.process_template_response(
+            self,
+            request,
+            response,
+        )
+
+    def report(
+        self,
+        request: HttpRequest,
+        response: HttpResponseBase,
+        timing: RequestTiming,
+    ) -> None:
+        """Добавляет заголовок `Server-Timing` и пишет строку в журнал.
+
+        Args:
+            request: Запрос от клиента.
+            response: Ответ на запрос.
+            timing: Замер времени запроса.
+        """
+        metrics = timing.as_metrics()
+        route = get_route_name(request)
+        response['Server-Timing'] = ', '.join(
+            f'{name};dur={duration:.2f}'
+            + (f';desc="{timing.queries} queries"' if name == 'db' else '')
+            for name, duration in metrics.items()
+        )
+        logger.info(
+            'route=%s method=%s status=%d queries=%d db_ms=%.2f '
+            'view_ms=%.2f render_ms=%.2f total_ms=%.2f',
+            route,
+            request.method,
+            response.status_code,
+            timing.queries,
+            *metrics.values(),
+            extra={
+                'route': route,
+                'method': request.method,
+                'status_code': response.status_code,
+                'queries': timing.queries,
+                **{f'{name}_ms': value for name, value in metrics.items()},
+            },
+        )
+
+
+class MetricsMiddleware(TimingMiddleware):
+    """Учет задержки и запросов к базе данных по маршрутам для `/metrics`.
+
+    Задержка считается от входа в этот слой до готового ответа, без
+    передачи тела потоковых ответов.
+    """
+
+    def report(
+        self,
+        request: HttpRequest,
+        response: HttpResponseBase,
+        timing: RequestTiming,
+    ) -> None:
+        """Добавляет запрос в гистограмму задержки и счетчик запросов к базе.
+
+        Args:
+            request: Запрос от клиента.
+            response: Ответ на запрос.
+            timing: Замер времени запроса.
+        """
+        route = get_route_name(request)
+        metrics.observe(
+            'cafe_http_request_duration_seconds',
+            time.perf_counter() - timing.started,
+            route=route,
+            method=request.method,
+            status=str(response.status_code),
+        )
+        metrics.inc('cafe_http_db_queries_total', timing.queries, route=route)
+        metrics.flush()
+
+
+class ReadYourWritesMiddleware:
+    """Привязка чтения клиента к основной базе данных после его записи.
+
+    Запрос с записью в основную базу данных получает cookie, и пока она
+    действует (`DATABASE_REPLICA_MAX_LAG` секунд, не меньше отставания
+    реплики), чтение следующих запросов клиента тоже идет в основную
+    базу. Так список заказов после перенаправления из формы показывает
+    только что сохраненный заказ. Слой работает и в синхронном, и в
+    асинхронном режиме.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        """Создает промежуточный слой.
+
+        Args:
+            get_response: Следующий обработчик запроса.
+        """
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        """Обрабатывает запрос с привязкой чтения к основной базе.
+
+        Args:
+            request: Запрос от клиента.
+
+        Returns:
+            Ответ или корутина, возвращающая его, в асинхронном режиме.
+        """
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        self.process_request(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        """Асинхронно обрабатывает запрос с привязкой чтения к основной базе.
+
+        Args:
+            request: Запрос от клиента.
+
+        Returns:
+            Ответ на запрос.
+        """
+        self.process_request(request)
+        response = await self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_request(self, request: HttpRequest) -> None:
+        """Привязывает чтение к основной базе, если клиент недавно писал.
+
+        Args:
+            request: Запрос от клиента.
+        """
+        if PRIMARY_PIN_COOKIE in request.COOKIES:
+            pin_primary()
+
+    def process_response(
+        self,
+        request: HttpRequest,
+        response: HttpResponseBase,
+    ) -> HttpResponseBase:
+        """Выдает cookie привязки, если в запросе была запись.
+
+        Args:
+            request: Запрос от клиента.
+            response: Ответ на запрос.
+
+        Returns:
+            Тот же ответ.
+        """
+        if has_written() and has_replica():
+            response.set_cookie(
+                PRIMARY_PIN_COOKIE,
+                '1',
+                max_age=settings.DATABASE_REPLICA_MAX_LAG,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
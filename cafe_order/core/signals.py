@@ -0,0 +1,44 @@
+from typing import Any
+
+from django.core.signals import request_started
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from core.db import track_lock_waits, unpin_primary
+from core.middleware import track_query_time
+
+
+@receiver(connection_created)
+def install_execute_wrappers(
+    sender: type,
+    connection: BaseDatabaseWrapper,
+    **kwargs: Any,
+) -> None:
+    """Подключает к соединению учет ожиданий блокировки и времени запросов.
+
+    Учет ожиданий блокировки подключается только к соединениям SQLite.
+
+    Args:
+        sender: Класс обертки соединения.
+        connection: Обертка созданного соединения.
+        kwargs: Дополнительные параметры сигнала.
+    """
+    if (
+        connection.vendor == 'sqlite'
+        and track_lock_waits not in connection.execute_wrappers
+    ):
+        connection.execute_wrappers.append(track_lock_waits)
+    if track_query_time not in connection.execute_wrappers:
+        connection.execute_wrappers.append(track_query_time)
+
+
+@receiver(request_started)
+def reset_primary_pin(sender: type, **kwargs: Any) -> None:
+    """Снимает привязку чтения к основной базе данных перед запросом.
+
+    Args:
+        sender: Класс обработчика запросов.
+        kwargs: Дополнительные параметры сигнала.
+    """
+    unpin_primary()
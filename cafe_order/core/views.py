@@ -4,8 +4,13 @@ from typing import Any
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render
 from django.template.response import TemplateResponse
+from django.views.decorators.http import require_GET
 from django.views.generic import TemplateView
 
+from core.metrics import render_metrics
+
+METRICS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
 
 class PageNotFoundView(TemplateView):
     """Представление для обработки ошибки 404.
@@ -121,3 +126,16 @@ def csrf_failure(request: HttpRequest, reason: str = '') -> HttpResponse:
         Ответ с отображенной страницей ошибки.
     """
     return render(request, 'core/403csrf.html')
+
+
+@require_GET
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """Отдает метрики всех процессов в текстовом формате Prometheus.
+
+    Args:
+        request: Запрос от сборщика метрик.
+
+    Returns:
+        Ответ с метриками.
+    """
+    return HttpResponse(render_metrics(), content_type=METRICS_CONTENT_TYPE)
@@ -34,4 +34,43 @@ class OrderAdmin(admin.ModelAdmin):
         'id',
         'table_number',
         'status',
+        'total_price',
+        'items_count',
+    )
+
+
+@admin.register(models.DailyRevenue)
+class DailyRevenueAdmin(admin.ModelAdmin):
+    """Дневная выручка в панели администратора.
+
+    Определяет отображение модели DailyRevenue в админ-панели.
+
+    Attributes:
+        list_display: Список полей для отображения.
+    """
+
+    list_display = (
+        'date',
+        'revenue',
+        'orders_count',
+    )
+
+
+@admin.register(models.OrderArchive)
+class OrderArchiveAdmin(admin.ModelAdmin):
+    """Архивный заказ в панели администратора.
+
+    Определяет отображение модели OrderArchive в админ-панели.
+
+    Attributes:
+        list_display: Список полей для отображения.
+    """
+
+    list_display = (
+        'id',
+        'table_number',
+        'status',
+        'total_price',
+        'created_at',
+        'archived_at',
     )
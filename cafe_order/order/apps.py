@@ -9,3 +9,12 @@ class OrderConfig(AppConfig):
     """
 
     name = 'order'
+
+    def ready(self) -> None:
+        """Подключает проверки, обработчики сигналов и сборщик метрик."""
+        from core.metrics import metrics
+
+        from order import checks, signals  # noqa: F401
+        from order.metrics import collect_active_orders
+
+        metrics.add_collector(collect_active_orders)
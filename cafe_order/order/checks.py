@@ -0,0 +1,36 @@
+from typing import Any
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import CheckMessage, Error, Tags, register
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs: Any, **kwargs: Any) -> list[CheckMessage]:
+    """Проверяет, что версии данных хранятся в общем для процессов кэше.
+
+    По версиям из кэша процессы узнают об изменении меню и заказов. В кэше
+    памяти процесса версия меняется только в процессе, который выполнил
+    запись, и остальные процессы продолжают отдавать старые данные.
+
+    Args:
+        app_configs: Проверяемые приложения.
+        kwargs: Дополнительные параметры проверки.
+
+    Returns:
+        Ошибка, если кэш по умолчанию хранится в памяти процесса.
+    """
+    if not isinstance(caches[DEFAULT_CACHE_ALIAS], LocMemCache):
+        return []
+    return [
+        Error(
+            'The default cache is local to the process, so menu and order '
+            'versions are not shared between server processes.',
+            hint=(
+                'Set CACHE_URL to a shared cache such as filecache:// or '
+                'rediscache://, or silence order.E001 when the server runs '
+                'in a single process.'
+            ),
+            id='order.E001',
+        ),
+    ]
@@ -0,0 +1,347 @@
+import asyncio
+import json
+import threading
+from collections import deque
+from collections.abc import AsyncIterator, Iterable, Iterator
+from contextlib import suppress
+from itertools import islice
+from typing import Any, NamedTuple
+from uuid import uuid4
+
+from core.constants import (
+    ORDER_EVENTS_BUFFER_SIZE,
+    ORDER_EVENTS_HEARTBEAT_SECONDS,
+    ORDER_EVENTS_RETRY_MILLISECONDS,
+    OrderEventType,
+)
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from order.metrics import record_order_events
+from order.models import Order
+
+
+class OrderEvent(NamedTuple):
+    """Событие заказа.
+
+    Attributes:
+        sequence: Порядковый номер события в процессе.
+        type: Тип события.
+        data: Данные заказа.
+    """
+
+    sequence: int
+    type: str
+    data: dict[str, Any]
+
+
+class OrderBroadcaster:
+    """Рассыльщик событий заказов внутри процесса.
+
+    Последние события хранятся в кольцевом буфере, поэтому клиент,
+    переподключившийся с `Last-Event-ID`, получает пропущенные события.
+    Если они уже вытеснены из буфера или идентификатор выдан другим
+    процессом, клиент получает событие `reset` и должен загрузить заказы
+    заново.
+
+    Attributes:
+        stream_id: Идентификатор потока событий процесса.
+    """
+
+    def __init__(self, size: int = ORDER_EVENTS_BUFFER_SIZE) -> None:
+        """Создает рассыльщик событий.
+
+        Args:
+            size: Количество хранимых последних событий.
+        """
+        self.stream_id = uuid4().hex[:12]
+        self._events: deque[OrderEvent] = deque(maxlen=size)
+        self._sequence = 0
+        self._condition = threading.Condition()
+        self._waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = (
+            set()
+        )
+
+    @property
+    def last_sequence(self) -> int:
+        """Возвращает номер последнего опубликованного события."""
+        with self._condition:
+            return self._sequence
+
+    def publish(self, event_type: str, data: dict[str, Any]) -> OrderEvent:
+        """Публикует событие и будит ожидающих подписчиков.
+
+        Args:
+            event_type: Тип события.
+            data: Данные заказа.
+
+        Returns:
+            Опубликованное событие.
+        """
+        with self._condition:
+            self._sequence += 1
+            event = OrderEvent(self._sequence, event_type, data)
+            self._events.append(event)
+            self._condition.notify_all()
+            for loop, waiter in self._waiters:
+                with suppress(RuntimeError):
+                    loop.call_soon_threadsafe(waiter.set)
+        return event
+
+    def get_events_after(self, sequence: int) -> list[OrderEvent] | None:
+        """Возвращает события, опубликованные после указанного.
+
+        Args:
+            sequence: Номер последнего полученного события.
+
+        Returns:
+            События по порядку или `None`, если часть из них уже вытеснена
+            из буфера.
+        """
+        with self._condition:
+            return self._get_events_after(sequence)
+
+    def wait_for_events(
+        self,
+        sequence: int,
+        timeout: float,
+    ) -> list[OrderEvent] | None:
+        """Ожидает события, опубликованные после указанного.
+
+        Args:
+            sequence: Номер последнего полученного события.
+            timeout: Максимальное время ожидания в секундах.
+
+        Returns:
+            События по порядку, пустой список по истечении времени или
+            `None`, если часть событий уже вытеснена из буфера.
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._sequence > sequence,
+                timeout,
+            )
+            return self._get_events_after(sequence)
+
+    def get_event_id(self, sequence: int) -> str:
+        """Возвращает идентификатор события для клиента.
+
+        Args:
+            sequence: Номер события.
+
+        Returns:
+            Идентификатор события с идентификатором потока процесса.
+        """
+        return f'{self.stream_id}-{sequence}'
+
+    def parse_event_id(self, event_id: str) -> int | None:
+        """Возвращает номер события по его идентификатору.
+
+        Args:
+            event_id: Идентификатор события из `Last-Event-ID`.
+
+        Returns:
+            Номер события или `None`, если идентификатор выдан другим
+            процессом или недействителен.
+        """
+        stream_id, _, sequence = event_id.rpartition('-')
+        if stream_id != self.stream_id or not sequence.isdigit():
+            return None
+        sequence = int(sequence)
+        return sequence if sequence <= self.last_sequence else None
+
+    def format_message(self, event_type: str, sequence: int, data: Any) -> str:
+        """Форматирует сообщение потока server-sent events.
+
+        Args:
+            event_type: Тип события.
+            sequence: Номер события.
+            data: Данные события.
+
+        Returns:
+            Текст сообщения.
+        """
+        return (
+            f'id: {self.get_event_id(sequence)}\n'
+            f'event: {event_type}\n'
+            f'data: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n'
+        )
+
+    async def await_events(
+        self,
+        sequence: int,
+        timeout: float,
+    ) -> list[OrderEvent] | None:
+        """Асинхронно ожидает события, опубликованные после указанного.
+
+        В отличие от `wait_for_events` не блокирует поток выполнения,
+        поэтому один цикл событий обслуживает множество подписчиков.
+
+        Args:
+            sequence: Номер последнего полученного события.
+            timeout: Максимальное время ожидания в секундах.
+
+        Returns:
+            События по порядку, пустой список по истечении времени или
+            `None`, если часть событий уже вытеснена из буфера.
+        """
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._condition:
+            if self._sequence > sequence:
+                return self._get_events_after(sequence)
+            self._waiters.add(waiter)
+        try:
+            with suppress(TimeoutError):
+                await asyncio.wait_for(waiter[1].wait(), timeout)
+        finally:
+            with self._condition:
+                self._waiters.discard(waiter)
+        return self.get_events_after(sequence)
+
+    def stream(
+        self,
+        last_event_id: str | None = None,
+        heartbeat: float = ORDER_EVENTS_HEARTBEAT_SECONDS,
+    ) -> Iterator[str]:
+        """Возвращает бесконечный поток сообщений server-sent events.
+
+        Без `last_event_id` поток начинается с новых событий. При простое
+        отправляется комментарий, чтобы соединение не закрывалось
+        промежуточными прокси.
+
+        Args:
+            last_event_id: Идентификатор последнего полученного события.
+            heartbeat: Интервал отправки комментария при простое.
+
+        Yields:
+            Сообщения потока.
+        """
+        sequence, messages = self._start_stream(last_event_id)
+        yield from messages
+        while True:
+            sequence, messages = self._get_messages(
+                sequence,
+                self.wait_for_events(sequence, heartbeat),
+            )
+            yield from messages
+
+    async def astream(
+        self,
+        last_event_id: str | None = None,
+        heartbeat: float = ORDER_EVENTS_HEARTBEAT_SECONDS,
+    ) -> AsyncIterator[str]:
+        """Асинхронная версия `stream` для ASGI.
+
+        Args:
+            last_event_id: Идентификатор последнего полученного события.
+            heartbeat: Интервал отправки комментария при простое.
+
+        Yields:
+            Сообщения потока.
+        """
+        sequence, messages = self._start_stream(last_event_id)
+        for message in messages:
+            yield message
+        while True:
+            sequence, messages = self._get_messages(
+                sequence,
+                await self.await_events(sequence, heartbeat),
+            )
+            for message in messages:
+                yield message
+
+    def _start_stream(
+        self, last_event_id: str | None
+    ) -> tuple[int, list[str]]:
+        messages = [f'retry: {ORDER_EVENTS_RETRY_MILLISECONDS}\n\n']
+        sequence = self.parse_event_id(last_event_id or '')
+        if sequence is None:
+            sequence = self.last_sequence
+            if last_event_id:
+                messages.append(
+                    self.format_message(OrderEventType.RESET, sequence, {}),
+                )
+        return sequence, messages
+
+    def _get_messages(
+        self,
+        sequence: int,
+        events: list[OrderEvent] | None,
+    ) -> tuple[int, list[str]]:
+        if events is None:
+            sequence = self.last_sequence
+            return sequence, [
+                self.format_message(OrderEventType.RESET, sequence, {}),
+            ]
+        if not events:
+            return sequence, [': ping\n\n']
+        return events[-1].sequence, [
+            self.format_message(event.type, event.sequence, event.data)
+            for event in events
+        ]
+
+    def _get_events_after(self, sequence: int) -> list[OrderEvent] | None:
+        if sequence >= self._sequence:
+            return []
+        first = self._events[0].sequence
+        if first > sequence + 1:
+            return None
+        return list(islice(self._events, sequence + 1 - first, None))
+
+
+broadcaster = OrderBroadcaster()
+
+
+def get_order_payload(order: Order) -> dict[str, Any]:
+    """Возвращает данные заказа для события.
+
+    Args:
+        order: Заказ.
+
+    Returns:
+        Идентификатор, стол, статус, стоимость, позиции и время изменения
+        заказа.
+    """
+    return {
+        'id': order.pk,
+        'table_number': order.table_number,
+        'status': order.status,
+        'price': order.total_price,
+        'items': [
+            {'meal': line.meal_id, 'quantity': line.quantity}
+            for line in order.lines.all()
+        ],
+        'updated_at': order.updated_at,
+    }
+
+
+def publish_order_events(event_type: str, orders: Iterable[Order]) -> None:
+    """Публикует события заказов после фиксации транзакции.
+
+    Данные заказов собираются сразу, чтобы событие отражало сохраненное
+    состояние.
+
+    Args:
+        event_type: Тип события.
+        orders: Созданные или измененные заказы.
+    """
+    payloads = [get_order_payload(order) for order in orders]
+    transaction.on_commit(lambda: _publish(event_type, payloads))
+
+
+def publish_order_deletions(order_ids: Iterable[int]) -> None:
+    """Публикует события удаления заказов после фиксации транзакции.
+
+    Args:
+        order_ids: Идентификаторы удаленных заказов.
+    """
+    payloads = [{'id': order_id} for order_id in order_ids]
+    transaction.on_commit(
+        lambda: _publish(OrderEventType.DELETED, payloads),
+    )
+
+
+def _publish(event_type: str, payloads: list[dict[str, Any]]) -> None:
+    for payload in payloads:
+        broadcaster.publish(event_type, payload)
+    record_order_events(event_type, payloads)
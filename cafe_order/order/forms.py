@@ -1,11 +1,75 @@
-from core.constants import OrderStatus
+from collections.abc import Iterator
+from typing import Any
+
+from core.constants import ACTIVE_ORDERS_FILTER, MAX_TABLES_NUMBER, OrderStatus
 from django import forms
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.forms.models import ModelChoiceIterator
 
+from order.menu import get_menu
 from order.models import Meal, Order
 
 
+class MenuChoiceIterator(ModelChoiceIterator):
+    """Варианты выбора блюд из снимка меню."""
+
+    def __iter__(self) -> Iterator[tuple[Any, str]]:
+        """Возвращает варианты выбора блюд без запроса к базе данных."""
+        if self.field.empty_label is not None:
+            yield '', self.field.empty_label
+        for meal in get_menu():
+            yield self.choice(meal)
+
+    def __len__(self) -> int:
+        """Возвращает количество вариантов выбора."""
+        return len(get_menu()) + (self.field.empty_label is not None)
+
+    def __bool__(self) -> bool:
+        """Проверяет наличие вариантов выбора."""
+        return self.field.empty_label is not None or bool(len(get_menu()))
+
+
+class MenuMultipleChoiceField(forms.ModelMultipleChoiceField):
+    """Поле выбора нескольких блюд, проверяемое по снимку меню."""
+
+    iterator = MenuChoiceIterator
+
+    def _check_values(self, value: list[Any]) -> list[Meal]:
+        menu = get_menu()
+        meals = []
+        for pk in value:
+            meal = menu.get_meal(pk)
+            if meal is None:
+                raise ValidationError(
+                    self.error_messages['invalid_choice'],
+                    code='invalid_choice',
+                    params={'value': pk},
+                )
+            meals.append(meal)
+        return meals
+
+
 class OrderForm(forms.ModelForm):
-    """Форма для создания заказа."""
+    """Форма для создания заказа.
+
+    Блюда сохраняются позициями заказа: у блюд, уже входивших в заказ,
+    сохраняются количество и цена на момент заказа, новые блюда
+    добавляются в одном экземпляре.
+
+    Attributes:
+        items: Поле выбора блюд заказа.
+    """
+
+    items = MenuMultipleChoiceField(
+        queryset=Meal.objects.all(),
+        widget=forms.SelectMultiple(
+            attrs={
+                'class': 'input-select',
+                'size': 20,
+            },
+        ),
+    )
 
     class Meta:
         """Метаданные формы.
@@ -19,20 +83,43 @@ class OrderForm(forms.ModelForm):
         """
 
         model = Order
-        fields = ('table_number', 'items')
+        fields = ('table_number',)
 
         widgets = {
             'table_number': forms.NumberInput(
                 attrs={'class': 'input-select'},
             ),
-            'items': forms.SelectMultiple(
-                attrs={
-                    'class': 'input-select',
-                    'size': 20,
-                },
-            ),
         }
 
+    def save(self, commit: bool = True) -> Order:
+        """Сохраняет заказ и его позиции в одной транзакции.
+
+        При `commit=False` позиции сохраняются вызовом `save_items` после
+        сохранения заказа.
+
+        Args:
+            commit: Признак сохранения заказа в базе данных.
+
+        Returns:
+            Заказ формы.
+        """
+        if not commit:
+            return super().save(commit=False)
+        with transaction.atomic():
+            order = super().save()
+            self.save_items()
+        return order
+
+    def save_items(self) -> None:
+        """Заменяет позиции сохраненного заказа выбранными блюдами."""
+        quantities = dict(self.instance.lines.values_list('meal', 'quantity'))
+        self.instance.set_items(
+            {
+                meal: quantities.get(meal.pk, 1)
+                for meal in self.cleaned_data['items']
+            },
+        )
+
 
 class OrderUpdateForm(OrderForm):
     """Форма для редактирования заказа."""
@@ -83,23 +170,27 @@ class SearchOrderForm(forms.Form):
     Attributes:
         table_number: Поле ввода номера стола.
         status: Поле выбора статуса заказа.
+        date: Поле выбора дня создания заказа.
     """
 
-    table_number = forms.IntegerField(required=False)
-    status = forms.ChoiceField(choices=OrderStatus, required=False)
-
-    class Meta:
-        """Метаданные формы.
-
-        Определяет виджеты для полей формы.
-
-        Attributes:
-            widgets: Виджеты для полей формы.
-        """
-
-        widgets = {
-            'table_number': forms.NumberInput(
-                attrs={'class': 'input-select'},
-            ),
-            'status': forms.Select(attrs={'class': 'input-select'}),
-        }
+    table_number = forms.IntegerField(
+        required=False,
+        min_value=1,
+        max_value=MAX_TABLES_NUMBER,
+        widget=forms.NumberInput(attrs={'class': 'input-select'}),
+    )
+    status = forms.ChoiceField(
+        choices=(
+            *OrderStatus.choices[:1],
+            (ACTIVE_ORDERS_FILTER, 'Active'),
+            *OrderStatus.choices[1:],
+        ),
+        required=False,
+        widget=forms.Select(attrs={'class': 'input-select'}),
+    )
+    date = forms.DateField(
+        required=False,
+        widget=forms.DateInput(
+            attrs={'class': 'input-select', 'type': 'date'},
+        ),
+    )
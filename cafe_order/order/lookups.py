@@ -0,0 +1,30 @@
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import CharField
+from django.db.models.lookups import In
+from django.db.models.sql.compiler import SQLCompiler
+
+
+@CharField.register_lookup
+class InlinedIn(In):
+    """Условие `IN` со значениями, подставленными в текст запроса.
+
+    SQLite выбирает частичный индекс, только если условие запроса совпадает
+    с условием индекса. Значения, переданные параметрами запроса, при
+    подготовке запроса неизвестны, поэтому для условий частичных индексов
+    значения подставляются в текст запроса так же, как в условие индекса.
+    Допустимо только для констант из кода.
+
+    Attributes:
+        lookup_name: Имя условия в фильтрах.
+    """
+
+    lookup_name = 'inlined_in'
+
+    def as_sql(
+        self,
+        compiler: SQLCompiler,
+        connection: BaseDatabaseWrapper,
+    ) -> tuple[str, list]:
+        sql, params = super().as_sql(compiler, connection)
+        editor = connection.SchemaEditorClass(connection)
+        return sql % tuple(editor.quote_value(value) for value in params), []
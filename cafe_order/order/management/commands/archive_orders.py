@@ -0,0 +1,98 @@
+import time
+from collections.abc import Callable
+from datetime import timedelta
+from typing import Any
+
+from core.constants import (
+    ORDER_ARCHIVE_BATCH_SIZE,
+    ORDER_ARCHIVE_DAYS,
+    ORDER_PURGE_DAYS,
+)
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+from order.models import Order
+
+
+class Command(BaseCommand):
+    """Команда переноса старых заказов из оперативных таблиц."""
+
+    help = (
+        'Moves old paid orders to the archive and purges abandoned waiting '
+        'orders in batches.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=ORDER_ARCHIVE_DAYS,
+            help='Archive paid orders created more than DAYS days ago.',
+        )
+        parser.add_argument(
+            '--purge-days',
+            type=int,
+            default=ORDER_PURGE_DAYS,
+            help='Delete waiting orders created more than PURGE_DAYS ago.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=ORDER_ARCHIVE_BATCH_SIZE,
+            help='Orders moved or deleted in one transaction.',
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0,
+            help='Seconds to wait between batches.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Переносит оплаченные и удаляет заброшенные заказы пакетами.
+
+        Каждый пакет фиксируется отдельной транзакцией, поэтому прерванную
+        команду достаточно запустить снова.
+
+        Args:
+            args: Дополнительные позиционные параметры.
+            options: Параметры команды.
+        """
+        now = timezone.now()
+        archived = self.run_batches(
+            lambda: Order.objects.archive_batch(
+                now - timedelta(days=options['days']),
+                options['batch_size'],
+            ),
+            options['pause'],
+        )
+        purged = self.run_batches(
+            lambda: Order.objects.purge_batch(
+                now - timedelta(days=options['purge_days']),
+                options['batch_size'],
+            ),
+            options['pause'],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Archived {archived} paid orders, purged {purged} waiting '
+                'orders.',
+            ),
+        )
+
+    def run_batches(self, run_batch: Callable[[], int], pause: float) -> int:
+        """Выполняет пакеты, пока они не перестанут находить заказы.
+
+        Args:
+            run_batch: Функция обработки одного пакета, возвращающая
+                количество обработанных заказов.
+            pause: Пауза между пакетами в секундах.
+
+        Returns:
+            Общее количество обработанных заказов.
+        """
+        total = 0
+        while count := run_batch():
+            total += count
+            time.sleep(pause)
+        return total
@@ -0,0 +1,59 @@
+from typing import Any
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+from order.models import DailyRevenue, Order
+
+
+class Command(BaseCommand):
+    """Команда заполнения и проверки дневной сводки выручки."""
+
+    help = 'Rebuilds or verifies the daily revenue rollup.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Compare the rollup with paid orders without changing it.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Пересчитывает или проверяет дневную сводку выручки.
+
+        Args:
+            args: Дополнительные позиционные параметры.
+            options: Параметры команды.
+
+        Raises:
+            CommandError: Если сводка расходится с оплаченными заказами.
+        """
+        if not options['verify']:
+            DailyRevenue.objects.rebuild()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'Rebuilt {DailyRevenue.objects.count()} days.',
+                ),
+            )
+            return
+        expected = Order.objects.get_total_revenue_by_day()
+        stored = {
+            row.date: (row.revenue, row.orders_count)
+            for row in DailyRevenue.objects.all()
+        }
+        mismatches = sorted(
+            date
+            for date in expected.keys() | stored.keys()
+            if expected.get(date, (0, 0)) != stored.get(date, (0, 0))
+        )
+        for date in mismatches:
+            self.stderr.write(
+                f'{date}: rollup {stored.get(date, (0, 0))}, '
+                f'orders {expected.get(date, (0, 0))}',
+            )
+        if mismatches:
+            raise CommandError(f'{len(mismatches)} days differ.')
+        self.stdout.write(self.style.SUCCESS(f'{len(expected)} days match.'))
@@ -0,0 +1,406 @@
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable
+from typing import Any
+
+from core.constants import MAX_TABLES_NUMBER, OrderStatus
+from core.db import is_lock_error, lock_stats
+from django.conf import settings
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client
+from django.urls import reverse
+
+from order.models import Meal
+
+WAITER_ACTIONS = {
+    'create_order': 5,
+    'pay_order': 3,
+    'order_list': 2,
+    'revenue': 1,
+}
+SCREEN_ACTIONS = {
+    'poll_waiting': 4,
+    'mark_ready': 3,
+    'revenue_api': 1,
+}
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values: list[float], percent: int) -> float:
+    """Возвращает процентиль упорядоченных значений.
+
+    Args:
+        values: Значения по возрастанию.
+        percent: Процентиль от 0 до 100.
+
+    Returns:
+        Значение, не меньше которого `percent` процентов значений.
+    """
+    index = max(0, -(-len(values) * percent // 100) - 1)
+    return values[index]
+
+
+class ShiftStats:
+    """Результаты запросов симуляции смены.
+
+    Attributes:
+        latencies: Задержки запросов в секундах по действиям.
+        errors: Количество ошибочных ответов и исключений по действиям.
+        lock_errors: Количество запросов, завершившихся ошибкой
+            блокировки базы данных.
+    """
+
+    def __init__(self) -> None:
+        """Создает пустые результаты."""
+        self._lock = threading.Lock()
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: Counter[str] = Counter()
+        self.lock_errors = 0
+
+    def add(
+        self,
+        action: str,
+        latency: float,
+        error: Exception | None,
+    ) -> None:
+        """Сохраняет результат запроса.
+
+        Args:
+            action: Название действия.
+            latency: Задержка запроса в секундах.
+            error: Ошибка запроса или `None` при успехе.
+        """
+        with self._lock:
+            self.latencies[action].append(latency)
+            if error is not None:
+                self.errors[action] += 1
+                self.lock_errors += is_lock_error(error)
+
+
+class Participant:
+    """Участник смены, выполняющий действия через настоящие адреса.
+
+    Каждый участник работает в своем потоке со своим клиентом и
+    соединением с базой данных и между действиями делает паузу со
+    случайной длительностью.
+
+    Attributes:
+        actions: Действия участника и их веса.
+    """
+
+    actions: dict[str, int] = {}
+
+    def __init__(
+        self,
+        stats: ShiftStats,
+        meal_ids: list[int],
+        think_time: float,
+        seed: int,
+    ) -> None:
+        """Создает участника.
+
+        Args:
+            stats: Общие результаты симуляции.
+            meal_ids: Идентификаторы блюд меню.
+            think_time: Средняя пауза между действиями в секундах.
+            seed: Начальное значение генератора случайных чисел.
+        """
+        self.stats = stats
+        self.meal_ids = meal_ids
+        self.think_time = think_time
+        self.rng = random.Random(seed)
+        self.client = Client(HTTP_HOST=get_host())
+
+    def run(self, deadline: float) -> None:
+        """Выполняет случайные действия до окончания смены.
+
+        Args:
+            deadline: Время окончания смены по `time.monotonic`.
+        """
+        names, weights = zip(*self.actions.items(), strict=True)
+        try:
+            while time.monotonic() < deadline:
+                action = self.rng.choices(names, weights)[0]
+                self.perform(action, getattr(self, action))
+                time.sleep(self.rng.expovariate(1 / self.think_time))
+        finally:
+            connection.close()
+
+    def perform(self, action: str, request: Callable[[], Any]) -> None:
+        """Выполняет действие и сохраняет его задержку и ошибку.
+
+        Args:
+            action: Название действия.
+            request: Функция, выполняющая запросы действия и возвращающая
+                последний ответ или `None`, если запрос не понадобился.
+        """
+        started = time.perf_counter()
+        error = None
+        try:
+            response = request()
+        except Exception as exc:
+            error = exc
+        else:
+            if response is None:
+                return
+            if response.status_code >= 400:
+                error = RuntimeError(f'{action}: {response.status_code}')
+        self.stats.add(action, time.perf_counter() - started, error)
+
+    def get_orders(self, status: str) -> list[dict[str, Any]]:
+        """Получает первую страницу заказов со статусом через API.
+
+        Args:
+            status: Статус заказов.
+
+        Returns:
+            Заказы из ответа API.
+        """
+        response = self.client.get('/api/v1/orders/', {'status': status})
+        if response.status_code != 200:
+            return []
+        return response.json()['results']
+
+    def update_status(
+        self,
+        order: dict[str, Any],
+        status: str,
+    ) -> HttpResponse:
+        """Меняет статус заказа через форму изменения.
+
+        Args:
+            order: Заказ из ответа API.
+            status: Новый статус заказа.
+
+        Returns:
+            Ответ формы изменения.
+        """
+        return self.client.post(
+            reverse('order:order_update', args=(order['id'],)),
+            {
+                'status': status,
+                'table_number': order['table_number'],
+                'items': sorted(set(order['items'])),
+            },
+        )
+
+
+class Waiter(Participant):
+    """Официант: принимает заказы, рассчитывает гостей, смотрит выручку."""
+
+    actions = WAITER_ACTIONS
+
+    def create_order(self) -> HttpResponse:
+        """Создает заказ со случайными блюдами через форму."""
+        return self.client.post(
+            reverse('order:order'),
+            {
+                'table_number': self.rng.randint(1, MAX_TABLES_NUMBER),
+                'items': self.rng.sample(
+                    self.meal_ids,
+                    min(len(self.meal_ids), self.rng.randint(1, 4)),
+                ),
+            },
+        )
+
+    def pay_order(self) -> HttpResponse | None:
+        """Отмечает оплаченным один из готовых заказов."""
+        orders = self.get_orders(OrderStatus.READY)
+        if not orders:
+            return None
+        return self.update_status(
+            self.rng.choice(orders),
+            OrderStatus.PAID_FOR,
+        )
+
+    def order_list(self) -> HttpResponse:
+        """Открывает список активных заказов."""
+        return self.client.get(reverse('order:order_list'))
+
+    def revenue(self) -> HttpResponse:
+        """Открывает страницу выручки за смену."""
+        return self.client.get(reverse('order:revenue'))
+
+
+class KitchenScreen(Participant):
+    """Экран кухни: следит за ожидающими заказами и отмечает готовые."""
+
+    actions = SCREEN_ACTIONS
+
+    def poll_waiting(self) -> HttpResponse:
+        """Обновляет список ожидающих заказов."""
+        return self.client.get(
+            '/api/v1/orders/',
+            {'status': OrderStatus.WAITING},
+        )
+
+    def mark_ready(self) -> HttpResponse | None:
+        """Отмечает готовым один из ожидающих заказов."""
+        orders = self.get_orders(OrderStatus.WAITING)
+        if not orders:
+            return None
+        return self.update_status(self.rng.choice(orders), OrderStatus.READY)
+
+    def revenue_api(self) -> HttpResponse:
+        """Запрашивает выручку за смену через API."""
+        return self.client.get('/api/v1/orders/revenue/')
+
+
+def get_host() -> str:
+    """Возвращает имя хоста, разрешенное настройкой `ALLOWED_HOSTS`.
+
+    Returns:
+        Первый разрешенный хост или `localhost`.
+    """
+    for host in settings.ALLOWED_HOSTS:
+        if host != '*':
+            return host.lstrip('.')
+    return 'localhost'
+
+
+class Command(BaseCommand):
+    """Команда нагрузочной симуляции смены кафе."""
+
+    help = (
+        'Simulates a busy shift: concurrent waiters and kitchen screens '
+        'drive the order pages and API against the configured database.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--waiters',
+            type=int,
+            default=10,
+            help='Concurrent waiters creating and paying orders.',
+        )
+        parser.add_argument(
+            '--screens',
+            type=int,
+            default=2,
+            help='Concurrent kitchen screens polling and marking orders.',
+        )
+        parser.add_argument(
+            '--duration',
+            type=float,
+            default=60,
+            help='Length of the simulated shift in seconds.',
+        )
+        parser.add_argument(
+            '--think-time',
+            type=float,
+            default=1,
+            help='Mean pause between actions of a participant in seconds.',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Random seed of the action mix.',
+        )
+        parser.add_argument(
+            '--allow-configured-db',
+            action='store_true',
+            help='Run against the configured database when DEBUG is off.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Запускает участников смены в потоках и выводит результаты.
+
+        Потоки обслуживаются так же, как потоками WSGI-сервера: каждый
+        запрос проходит все промежуточные слои и выполняется в своем
+        соединении с базой данных.
+
+        Args:
+            args: Дополнительные позиционные параметры.
+            options: Параметры команды.
+
+        Raises:
+            CommandError: Если `DEBUG` выключен и работа с настроенной базой
+                данных не разрешена явно или если в меню нет блюд.
+        """
+        if not (settings.DEBUG or options['allow_configured_db']):
+            raise CommandError(
+                'The simulation creates paid orders in '
+                f'{connection.settings_dict["NAME"]}. Run it with DEBUG=True '
+                'or pass --allow-configured-db.',
+            )
+        meal_ids = list(Meal.objects.values_list('pk', flat=True))
+        if not meal_ids:
+            raise CommandError('Add meals to the menu before the simulation.')
+        connection.close()
+        stats = ShiftStats()
+        participants = [
+            participant_class(
+                stats,
+                meal_ids,
+                options['think_time'],
+                options['seed'] + number,
+            )
+            for number, participant_class in enumerate(
+                [Waiter] * options['waiters']
+                + [KitchenScreen] * options['screens'],
+            )
+        ]
+        lock_stats.reset()
+        started = time.monotonic()
+        threads = [
+            threading.Thread(
+                target=participant.run,
+                args=(started + options['duration'],),
+            )
+            for participant in participants
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.report(stats, time.monotonic() - started, options)
+
+    def report(
+        self,
+        stats: ShiftStats,
+        elapsed: float,
+        options: dict[str, Any],
+    ) -> None:
+        """Выводит пропускную способность, задержки и блокировки.
+
+        Args:
+            stats: Результаты симуляции.
+            elapsed: Длительность симуляции в секундах.
+            options: Параметры команды.
+        """
+        total = sum(len(values) for values in stats.latencies.values())
+        self.stdout.write(
+            f'{options["waiters"]} waiters, {options["screens"]} screens, '
+            f'{elapsed:.1f}s: {total} requests, '
+            f'{total / elapsed:.1f} req/s, '
+            f'{sum(stats.errors.values())} errors, '
+            f'{stats.lock_errors} lock errors',
+        )
+        for action, values in sorted(stats.latencies.items()):
+            values.sort()
+            self.stdout.write(
+                f'  {action:<14} n={len(values):<6} '
+                + ' '.join(
+                    f'p{percent}={percentile(values, percent) * 1000:.1f}ms'
+                    for percent in PERCENTILES
+                )
+                + f' max={values[-1] * 1000:.1f}ms '
+                f'errors={stats.errors[action]}',
+            )
+        locks = lock_stats.as_dict()
+        self.stdout.write(
+            f'Lock waits: {locks["waits"]} '
+            f'({locks["wait_seconds"]:.3f}s), '
+            f'timeouts: {locks["timeouts"]}, '
+            f'retries: {locks["retries"]}, '
+            f'failed writes: {locks["failures"]}',
+        )
@@ -0,0 +1,48 @@
+import time
+from typing import Any
+
+from core.db import has_replica, sync_replica
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+
+class Command(BaseCommand):
+    """Команда копирования основной базы данных в реплику."""
+
+    help = 'Copies the primary SQLite database to the read replica.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Repeat the copy every INTERVAL seconds until stopped.',
+        )
+        parser.add_argument(
+            '--pages',
+            type=int,
+            default=-1,
+            help='Pages copied per step, -1 copies the database at once.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Копирует основную базу данных в реплику один раз или по кругу.
+
+        Args:
+            args: Дополнительные позиционные параметры.
+            options: Параметры команды.
+
+        Raises:
+            CommandError: Если реплика не настроена.
+        """
+        if not has_replica():
+            raise CommandError('DB_REPLICA_NAME is not set.')
+        while True:
+            sync_replica(pages=options['pages'])
+            self.stdout.write(self.style.SUCCESS('Replica is up to date.'))
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
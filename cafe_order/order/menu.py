@@ -0,0 +1,161 @@
+from collections.abc import Iterable, Iterator
+from decimal import Decimal
+from types import MappingProxyType
+from typing import Any, NamedTuple
+
+from core.metrics import metrics
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import QuerySet
+
+from order.models import Meal
+from order.versions import MENU_VERSION, get_version
+
+MEAL_FIELDS = ('id', 'name', 'price')
+
+
+class MenuItem(NamedTuple):
+    """Блюдо в снимке меню.
+
+    Attributes:
+        name: Название блюда.
+        price: Цена блюда.
+    """
+
+    name: str
+    price: Decimal
+
+
+class Menu:
+    """Неизменяемый снимок меню.
+
+    Снимок хранит название и цену каждого блюда и помечен версией меню,
+    из которой он загружен.
+
+    Attributes:
+        version: Версия меню.
+    """
+
+    __slots__ = ('_items', 'version')
+
+    def __init__(self, version: str, items: dict[int, MenuItem]) -> None:
+        """Создает снимок меню.
+
+        Args:
+            version: Версия меню.
+            items: Блюда по идентификаторам в порядке идентификаторов.
+        """
+        self.version = version
+        self._items = MappingProxyType(items)
+
+    def __len__(self) -> int:
+        """Возвращает количество блюд в меню."""
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Meal]:
+        """Возвращает блюда меню в порядке идентификаторов."""
+        return (self.make_meal(pk, item) for pk, item in self._items.items())
+
+    def get_meal(self, pk: Any) -> Meal | None:
+        """Возвращает блюдо по идентификатору.
+
+        Args:
+            pk: Идентификатор блюда в любом допустимом для поля виде.
+
+        Returns:
+            Блюдо или `None`, если его нет в меню.
+        """
+        if isinstance(pk, bool):
+            return None
+        try:
+            pk = Meal._meta.pk.to_python(pk)
+        except (TypeError, ValidationError):
+            return None
+        item = self._items.get(pk)
+        return None if item is None else self.make_meal(pk, item)
+
+    @staticmethod
+    def make_meal(pk: int, item: MenuItem) -> Meal:
+        """Создает объект блюда из записи снимка.
+
+        Объект считается загруженным из базы данных, поэтому его можно
+        использовать в связях и сохранять.
+
+        Args:
+            pk: Идентификатор блюда.
+            item: Название и цена блюда.
+
+        Returns:
+            Объект блюда.
+        """
+        return Meal.from_db(DEFAULT_DB_ALIAS, MEAL_FIELDS, (pk, *item))
+
+
+_snapshot: Menu | None = None
+
+
+def get_menu() -> Menu:
+    """Возвращает снимок меню текущей версии.
+
+    Снимок хранится в памяти процесса и загружается из базы данных только
+    после смены версии меню. Версия читается до загрузки блюд, поэтому
+    снимок не может оказаться старше своей версии.
+
+    Returns:
+        Снимок меню.
+    """
+    version = get_version(MENU_VERSION).token
+    snapshot = _get_snapshot(version)
+    _count_lookup(snapshot)
+    if snapshot is None:
+        snapshot = _set_snapshot(version, get_menu_queryset())
+    return snapshot
+
+
+async def aget_menu() -> Menu:
+    """Возвращает снимок меню текущей версии, загружая его асинхронно.
+
+    Returns:
+        Снимок меню.
+    """
+    version = get_version(MENU_VERSION).token
+    snapshot = _get_snapshot(version)
+    _count_lookup(snapshot)
+    if snapshot is None:
+        snapshot = _set_snapshot(
+            version,
+            [row async for row in get_menu_queryset()],
+        )
+    return snapshot
+
+
+def get_menu_queryset() -> QuerySet:
+    """Возвращает запрос строк снимка меню в порядке идентификаторов."""
+    return Meal.objects.order_by('pk').values_list(*MEAL_FIELDS)
+
+
+def _get_snapshot(version: str) -> Menu | None:
+    snapshot = _snapshot
+    if snapshot is None or snapshot.version != version:
+        return None
+    return snapshot
+
+
+def _count_lookup(snapshot: Menu | None) -> None:
+    metrics.inc(
+        'cafe_cache_requests_total',
+        cache='menu',
+        result='miss' if snapshot is None else 'hit',
+    )
+
+
+def _set_snapshot(
+    version: str,
+    rows: Iterable[tuple[int, str, Decimal]],
+) -> Menu:
+    global _snapshot
+    _snapshot = Menu(
+        version,
+        {pk: MenuItem(name, price) for pk, name, price in rows},
+    )
+    return _snapshot
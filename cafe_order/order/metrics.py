@@ -0,0 +1,53 @@
+from typing import Any
+
+from core.constants import (
+    ACTIVE_ORDER_STATUSES,
+    OrderEventType,
+    OrderStatus,
+)
+from core.metrics import Samples, metrics
+from django.db.models import Count
+
+from order.models import Order
+
+
+def record_order_events(
+    event_type: str,
+    payloads: list[dict[str, Any]],
+) -> None:
+    """Учитывает созданные и оплаченные заказы по их событиям.
+
+    События публикуются после фиксации транзакции, поэтому отмененные
+    изменения не учитываются. Изменить оплаченный заказ нельзя, поэтому
+    каждое событие с оплаченным заказом означает его оплату.
+
+    Args:
+        event_type: Тип события.
+        payloads: Данные заказов события.
+    """
+    if event_type == OrderEventType.CREATED:
+        metrics.inc('cafe_orders_created_total', len(payloads))
+    if event_type in (OrderEventType.CREATED, OrderEventType.UPDATED):
+        paid = sum(
+            payload['status'] == OrderStatus.PAID_FOR for payload in payloads
+        )
+        if paid:
+            metrics.inc('cafe_orders_paid_total', paid)
+
+
+def collect_active_orders() -> Samples:
+    """Считает неоплаченные заказы по статусам.
+
+    Returns:
+        Количество заказов для каждого активного статуса.
+    """
+    counts = dict(
+        Order.objects.active()
+        .order_by()
+        .values_list('status')
+        .annotate(count=Count('pk')),
+    )
+    return {
+        ('cafe_orders_active', (('status', status),)): counts.get(status, 0)
+        for status in ACTIVE_ORDER_STATUSES
+    }
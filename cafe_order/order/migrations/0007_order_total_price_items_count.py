@@ -0,0 +1,48 @@
+# Generated by Django 5.1.5 on 2026-10-18 14:56
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, DecimalField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_order_totals(apps, schema_editor):
+    Order = apps.get_model('order', 'Order')
+    items = (
+        Order.items.through.objects.filter(order=OuterRef('pk'))
+        .order_by()
+        .values('order')
+    )
+    Order.objects.update(
+        total_price=Coalesce(
+            Subquery(items.annotate(total=Sum('meal__price')).values('total')),
+            Decimal(0),
+            output_field=DecimalField(),
+        ),
+        items_count=Coalesce(
+            Subquery(items.annotate(count=Count('pk')).values('count')),
+            0,
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0006_alter_meal_name_alter_meal_price_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='items_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='total_price',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0'), editable=False, max_digits=10),
+        ),
+        migrations.RunPython(fill_order_totals, migrations.RunPython.noop),
+    ]
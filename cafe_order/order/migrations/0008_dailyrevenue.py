@@ -0,0 +1,43 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:01
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def fill_daily_revenue(apps, schema_editor):
+    Order = apps.get_model('order', 'Order')
+    DailyRevenue = apps.get_model('order', 'DailyRevenue')
+    DailyRevenue.objects.bulk_create(
+        DailyRevenue(
+            date=row['day'],
+            revenue=row['revenue'],
+            orders_count=row['orders_count'],
+        )
+        for row in Order.objects.filter(status='PAID_FOR')
+        .order_by()
+        .values(day=TruncDate('created_at'))
+        .annotate(revenue=Sum('total_price'), orders_count=Count('pk'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0007_order_total_price_items_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRevenue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=12)),
+                ('orders_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(fill_daily_revenue, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:20
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_order_items(apps, schema_editor):
+    Order = apps.get_model('order', 'Order')
+    OrderItem = apps.get_model('order', 'OrderItem')
+    rows = Order.items.through.objects.values_list(
+        'order_id',
+        'meal_id',
+        'meal__price',
+    )
+    OrderItem.objects.bulk_create(
+        (
+            OrderItem(
+                order_id=order_id,
+                meal_id=meal_id,
+                quantity=1,
+                unit_price=price,
+            )
+            for order_id, meal_id, price in rows.iterator()
+        ),
+        batch_size=500,
+    )
+
+
+def copy_order_items_back(apps, schema_editor):
+    Order = apps.get_model('order', 'Order')
+    OrderItem = apps.get_model('order', 'OrderItem')
+    Order.items.through.objects.bulk_create(
+        (
+            Order.items.through(order_id=order_id, meal_id=meal_id)
+            for order_id, meal_id in OrderItem.objects.values_list(
+                'order_id',
+                'meal_id',
+            ).iterator()
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0009_order_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.PositiveSmallIntegerField(default=1, validators=[django.core.validators.MinValueValidator(1)])),
+                ('unit_price', models.DecimalField(decimal_places=2, max_digits=6)),
+                ('meal', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='order_lines', to='order.meal')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='order.order')),
+            ],
+            options={
+                'ordering': ('meal',),
+                'constraints': [models.UniqueConstraint(fields=('order', 'meal'), name='order_item_order_meal_unique')],
+            },
+        ),
+        migrations.RunPython(copy_order_items, copy_order_items_back),
+        migrations.RemoveField(
+            model_name='order',
+            name='items',
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='items',
+            field=models.ManyToManyField(related_name='order_meals', through='order.OrderItem', to='order.meal'),
+        ),
+    ]
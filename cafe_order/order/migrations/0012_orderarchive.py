@@ -0,0 +1,43 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0011_order_updated_at_ordertombstone'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('table_number', models.PositiveSmallIntegerField()),
+                ('status', models.CharField(choices=[('', '----------'), ('WAITING', 'Waiting'), ('READY', 'Ready'), ('PAID_FOR', 'Paid for')], max_length=10)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('total_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('items_count', models.PositiveIntegerField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_at'], name='order_archive_created_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='OrderItemArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.PositiveSmallIntegerField()),
+                ('unit_price', models.DecimalField(decimal_places=2, max_digits=6)),
+                ('meal', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_order_lines', to='order.meal')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='order.orderarchive')),
+            ],
+            options={
+                'ordering': ('meal',),
+            },
+        ),
+    ]
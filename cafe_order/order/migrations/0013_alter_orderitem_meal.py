@@ -0,0 +1,19 @@
+# Generated by Django 5.1.5 on 2026-10-18 16:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0012_orderarchive'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='orderitem',
+            name='meal',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='order_lines', to='order.meal'),
+        ),
+    ]
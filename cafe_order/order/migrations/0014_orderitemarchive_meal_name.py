@@ -0,0 +1,37 @@
+# Generated by Django 5.1.5 on 2026-10-18 18:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_meal_names(apps, schema_editor):
+    Meal = apps.get_model('order', 'Meal')
+    OrderItemArchive = apps.get_model('order', 'OrderItemArchive')
+    OrderItemArchive.objects.update(
+        meal_name=Subquery(
+            Meal.objects.filter(pk=OuterRef('meal_id')).values('name'),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0013_alter_orderitem_meal'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orderitemarchive',
+            name='meal_name',
+            field=models.CharField(default='', max_length=200),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_meal_names, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='orderitemarchive',
+            name='meal',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='archived_order_lines', to='order.meal'),
+        ),
+    ]
@@ -1,31 +1,595 @@
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from datetime import date as date_type
+from datetime import datetime, timedelta
 from decimal import Decimal
+from itertools import chain
+from typing import Any
 
-from core.constants import MAX_TABLES_NUMBER, OrderStatus
+from core.constants import (
+    ACTIVE_ORDER_STATUSES,
+    MAX_TABLES_NUMBER,
+    OrderStatus,
+    RevenueBucket,
+)
+from core.db import read_from_replica, retry_on_lock
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
-from django.db.models import Sum
-from django.db.utils import cached_property
-from django.utils.timezone import datetime
+from django.db import models, router, transaction
+from django.db.models import (
+    Count,
+    DecimalField,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+)
+from django.db.models.functions import (
+    Coalesce,
+    TruncHour,
+    TruncWeek,
+)
+from django.utils import timezone
 
+from order.lookups import InlinedIn  # noqa: F401
+from order.shifts import (
+    get_shift_date,
+    get_shift_date_expression,
+    get_shift_start,
+    get_shift_week_expression,
+)
+from order.versions import ORDERS_VERSION, bump_version
 
-class OrderManager(models.Manager):
-    def get_revenue_for_day(self, date=None):
-        if not date:
-            date = datetime.now().date()
-        return (
-            self.get_queryset()
-            .filter(
+
+class BaseOrderQuerySet(models.QuerySet):
+    def created_on(self, date: date_type) -> 'BaseOrderQuerySet':
+        """Возвращает заказы, относящиеся к смене указанного дня.
+
+        Args:
+            date: День начала смены.
+
+        Returns:
+            Заказы за смену.
+        """
+        return self.created_between(date, date)
+
+    def created_between(
+        self,
+        start: date_type,
+        end: date_type,
+    ) -> 'BaseOrderQuerySet':
+        """Возвращает заказы, относящиеся к сменам указанного периода.
+
+        Условие задается полуоткрытым диапазоном времени создания от начала
+        первой смены до начала смены, следующей за последней, чтобы запрос
+        мог использовать индекс.
+
+        Args:
+            start: День начала первой смены.
+            end: День начала последней смены.
+
+        Returns:
+            Заказы за указанный период.
+        """
+        return self.filter(
+            created_at__gte=get_shift_start(start),
+            created_at__lt=get_shift_start(end + timedelta(days=1)),
+        )
+
+    def revenue_by_day(self) -> dict[date_type, tuple[Decimal, int]]:
+        """Возвращает выручку и количество оплаченных заказов по сменам.
+
+        Returns:
+            Словарь с выручкой и количеством заказов для каждого дня смены.
+        """
+        return {
+            row['day']: (row['revenue'], row['orders_count'])
+            for row in self.filter(status=OrderStatus.PAID_FOR)
+            .order_by()
+            .values(day=get_shift_date_expression())
+            .annotate(revenue=Sum('total_price'), orders_count=Count('pk'))
+        }
+
+
+class OrderQuerySet(BaseOrderQuerySet):
+    def update(self, **kwargs: Any) -> int:
+        """Обновляет заказы, время их изменения и версию заказов.
+
+        Args:
+            kwargs: Новые значения полей.
+
+        Returns:
+            Количество обновленных заказов.
+        """
+        kwargs.setdefault('updated_at', timezone.now())
+        updated = super().update(**kwargs)
+        if updated:
+            bump_version(ORDERS_VERSION)
+        return updated
+
+    def bulk_create(self, objs: Iterable['Order'], **kwargs: Any) -> list:
+        """Создает заказы одной вставкой и меняет версию заказов.
+
+        Args:
+            objs: Новые заказы.
+            kwargs: Параметры пакетной вставки.
+
+        Returns:
+            Созданные заказы.
+        """
+        orders = super().bulk_create(objs, **kwargs)
+        if orders:
+            bump_version(ORDERS_VERSION)
+        return orders
+
+    def with_items(self) -> 'OrderQuerySet':
+        """Возвращает заказы с предзагруженными позициями и блюдами.
+
+        Стоимость и количество блюд хранятся в строке заказа, поэтому
+        список заказов любой длины загружается двумя запросами.
+
+        Returns:
+            Заказы с предзагруженными позициями.
+        """
+        return self.prefetch_related(
+            models.Prefetch(
+                'lines',
+                queryset=OrderItem.objects.select_related('meal').only(
+                    'order', 'meal__name', 'quantity', 'unit_price'
+                ),
+            ),
+        )
+
+    def active(self) -> 'OrderQuerySet':
+        """Возвращает заказы, которые еще не оплачены.
+
+        Returns:
+            Заказы в статусах ожидания и готовности.
+        """
+        return self.filter(status__inlined_in=ACTIVE_ORDER_STATUSES)
+
+    def transition(self, status: str) -> tuple[list[int], list[int]]:
+        """Переводит неоплаченные заказы в указанный статус.
+
+        Обновление выполняется одним UPDATE с условием на статус, поэтому
+        оплаченные заказы не изменяются. Заказы, переведенные в статус
+        оплаты, добавляются в дневную выручку.
+
+        Args:
+            status: Новый статус заказов.
+
+        Returns:
+            Идентификаторы измененных и отклоненных оплаченных заказов.
+        """
+        with transaction.atomic():
+            changed, refused = self._split_paid()
+            unpaid = self.model.objects.filter(pk__in=changed).exclude(
                 status=OrderStatus.PAID_FOR,
-                created_at__date=date,
             )
-            .annotate(
-                total_price=Sum('items__price'),
+            unpaid.update(status=status)
+            if status == OrderStatus.PAID_FOR:
+                DailyRevenue.objects.apply_changes(
+                    self.model.objects.filter(pk__in=changed).revenue_by_day(),
+                )
+        return changed, refused
+
+    def delete_unpaid(self) -> tuple[list[int], list[int]]:
+        """Удаляет неоплаченные заказы.
+
+        Статусы читаются с блокировкой строк в транзакции удаления, поэтому
+        оплаченные заказы не удаляются. Заказы удаляются одним DELETE без
+        сигналов по каждому заказу, записи об удалении добавляются одной
+        пакетной вставкой.
+
+        Returns:
+            Идентификаторы удаленных и отклоненных оплаченных заказов.
+        """
+        with transaction.atomic():
+            changed, refused = self.select_for_update()._split_paid()
+            self.model.objects._remove(changed)
+        return changed, refused
+
+    def _split_paid(self) -> tuple[list[int], list[int]]:
+        unpaid, paid = [], []
+        for pk, status in self.order_by('pk').values_list('pk', 'status'):
+            (paid if status == OrderStatus.PAID_FOR else unpaid).append(pk)
+        return unpaid, paid
+
+    def changed_after(
+        self,
+        updated_at: datetime | None,
+        pk: int | None,
+    ) -> 'OrderQuerySet':
+        """Возвращает заказы, измененные после позиции в ленте изменений.
+
+        Args:
+            updated_at: Время изменения последнего полученного заказа.
+            pk: Идентификатор последнего полученного заказа.
+
+        Returns:
+            Заказы в порядке изменения.
+        """
+        queryset = self.order_by('updated_at', 'pk')
+        if updated_at is None or pk is None:
+            return queryset
+        return queryset.filter(
+            Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, pk__gt=pk),
+        )
+
+    def refresh_totals(self) -> int:
+        """Пересчитывает сохраненные стоимость и количество блюд заказов.
+
+        Выполняет один UPDATE с подзапросами к промежуточной таблице и
+        переносит изменение стоимости оплаченных заказов в дневную выручку.
+
+        Returns:
+            Количество обновленных заказов.
+        """
+        with transaction.atomic():
+            before = self.revenue_by_day()
+            updated = self._update_totals()
+            after = self.revenue_by_day()
+            changes = {
+                day: (revenue - before.get(day, (0, 0))[0], 0)
+                for day, (revenue, _) in after.items()
+            }
+            DailyRevenue.objects.apply_changes(changes)
+        return updated
+
+    def _update_totals(self) -> int:
+        lines = (
+            OrderItem.objects.filter(order=OuterRef('pk'))
+            .order_by()
+            .values('order')
+        )
+        return self.update(
+            total_price=Coalesce(
+                Subquery(
+                    lines.annotate(total=OrderItem.get_total()).values(
+                        'total',
+                    ),
+                ),
+                Decimal(0),
+                output_field=DecimalField(),
+            ),
+            items_count=Coalesce(
+                Subquery(
+                    lines.annotate(count=Sum('quantity')).values('count'),
+                ),
+                0,
+            ),
+        )
+
+
+class OrderManager(models.Manager.from_queryset(OrderQuerySet)):
+    def create_in_bulk(
+        self,
+        entries: list[dict[str, Any]],
+    ) -> list['Order']:
+        """Создает заказы с позициями пакетными вставками в одной транзакции.
+
+        Повторы блюда в заказе образуют одну позицию с количеством.
+        Стоимость и количество блюд вычисляются по текущим ценам блюд, а
+        оплаченные заказы сразу добавляются в дневную выручку.
+
+        Args:
+            entries: Данные заказов, где `items` содержит объекты блюд.
+
+        Returns:
+            Созданные заказы.
+        """
+        orders, order_quantities = [], []
+        for entry in entries:
+            data = dict(entry)
+            quantities = Counter(data.pop('items'))
+            orders.append(
+                self.model(
+                    **data,
+                    total_price=sum(
+                        (
+                            meal.price * quantity
+                            for meal, quantity in quantities.items()
+                        ),
+                        Decimal(0),
+                    ),
+                    items_count=quantities.total(),
+                ),
+            )
+            order_quantities.append(quantities)
+        with transaction.atomic():
+            self.bulk_create(orders)
+            OrderItem.objects.bulk_create(
+                OrderItem(
+                    order=order,
+                    meal=meal,
+                    quantity=quantity,
+                    unit_price=meal.price,
+                )
+                for order, quantities in zip(
+                    orders,
+                    order_quantities,
+                    strict=True,
+                )
+                for meal, quantity in quantities.items()
+            )
+            changes = {}
+            for order in orders:
+                date, revenue = order.get_revenue_state()
+                if date:
+                    total, count = changes.get(date, (Decimal(0), 0))
+                    changes[date] = (total + revenue, count + 1)
+            DailyRevenue.objects.apply_changes(changes)
+        return orders
+
+    @retry_on_lock
+    def archive_batch(self, before: datetime, batch_size: int) -> int:
+        """Переносит пакет старых оплаченных заказов в архив.
+
+        Заказы с позициями копируются в архивные таблицы вместе с
+        названиями блюд и удаляются из оперативных в одной транзакции,
+        поэтому прерванный перенос можно продолжить повторным вызовом.
+        Дневная сводка выручки не меняется: архивные заказы по-прежнему
+        входят в выручку.
+
+        Args:
+            before: Момент, раньше которого созданы переносимые заказы.
+            batch_size: Наибольшее количество заказов в пакете.
+
+        Returns:
+            Количество перенесенных заказов.
+        """
+        with transaction.atomic():
+            orders = list(
+                self.filter(status=OrderStatus.PAID_FOR, created_at__lt=before)
+                .order_by('created_at', 'pk')
+                .values(*OrderArchive.COPIED_FIELDS)[:batch_size],
             )
-            .aggregate(
-                revenue_per_shift=Sum('total_price', default=0),
+            pks = [order['id'] for order in orders]
+            OrderArchive.objects.bulk_create(
+                OrderArchive(**order) for order in orders
             )
+            OrderItemArchive.objects.bulk_create(
+                OrderItemArchive(**line)
+                for line in OrderItem.objects.filter(order__in=pks).values(
+                    'order_id',
+                    'meal_id',
+                    'quantity',
+                    'unit_price',
+                    meal_name=F('meal__name'),
+                )
+            )
+            self._remove(pks)
+        return len(pks)
+
+    @retry_on_lock
+    def purge_batch(self, before: datetime, batch_size: int) -> int:
+        """Удаляет пакет заброшенных заказов в статусе ожидания.
+
+        Args:
+            before: Момент, раньше которого созданы удаляемые заказы.
+            batch_size: Наибольшее количество заказов в пакете.
+
+        Returns:
+            Количество удаленных заказов.
+        """
+        with transaction.atomic():
+            pks = list(
+                self.filter(status=OrderStatus.WAITING, created_at__lt=before)
+                .order_by('created_at', 'pk')
+                .values_list('pk', flat=True)[:batch_size],
+            )
+            self._remove(pks)
+        return len(pks)
+
+    def _remove(self, pks: list[int]) -> None:
+        if not pks:
+            return
+        OrderItem.objects.filter(order__in=pks).delete()
+        OrderTombstone.objects.bulk_create(
+            OrderTombstone(order_id=pk) for pk in pks
+        )
+        # Удаление без сигналов по каждому заказу: вклад оплаченных заказов
+        # в выручку остается в дневной сводке.
+        self.filter(pk__in=pks)._raw_delete(router.db_for_write(self.model))
+        bump_version(ORDERS_VERSION)
+
+    def get_total_revenue_by_day(self) -> dict[date_type, tuple[Decimal, int]]:
+        """Возвращает выручку по сменам по оперативным и архивным заказам.
+
+        Returns:
+            Словарь с выручкой и количеством заказов для каждого дня смены.
+        """
+        revenue = self.revenue_by_day()
+        archived = OrderArchive.objects.revenue_by_day()
+        for date, (day_revenue, orders_count) in archived.items():
+            total, count = revenue.get(date, (Decimal(0), 0))
+            revenue[date] = (total + day_revenue, count + orders_count)
+        return revenue
+
+    @read_from_replica
+    def get_revenue_for_day(
+        self,
+        date: date_type | None = None,
+    ) -> dict[str, Decimal]:
+        """Возвращает выручку за смену из дневной сводки.
+
+        Args:
+            date: День начала смены. По умолчанию текущей смены.
+
+        Returns:
+            Словарь с выручкой за смену.
+        """
+        revenue = self._get_revenue_for_day_queryset(date).first()
+        return {'revenue_per_shift': revenue or Decimal(0)}
+
+    @read_from_replica
+    async def aget_revenue_for_day(
+        self,
+        date: date_type | None = None,
+    ) -> dict[str, Decimal]:
+        """Асинхронная версия `get_revenue_for_day`."""
+        revenue = await self._get_revenue_for_day_queryset(date).afirst()
+        return {'revenue_per_shift': revenue or Decimal(0)}
+
+    @read_from_replica
+    def get_revenue_series(
+        self,
+        start: date_type,
+        end: date_type,
+        bucket: str = RevenueBucket.DAY,
+        by_table: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Возвращает выручку за период, сгруппированную по интервалам.
+
+        Выручка по дням и неделям без разбивки по столам берется из дневной
+        сводки одним сгруппированным запросом. Остальные варианты считаются
+        по оплаченным заказам: оперативные и архивные заказы группируются
+        отдельными запросами, а их строки складываются.
+
+        Args:
+            start: Первый день периода.
+            end: Последний день периода включительно.
+            bucket: Интервал группировки.
+            by_table: Признак разбивки выручки по столам.
+
+        Returns:
+            Строки с началом интервала, номером стола при разбивке,
+            выручкой и количеством оплаченных заказов.
+        """
+        return self._merge_revenue_series(
+            [
+                list(queryset)
+                for queryset in self._get_revenue_series_querysets(
+                    start,
+                    end,
+                    bucket,
+                    by_table,
+                )
+            ],
         )
 
+    @read_from_replica
+    async def aget_revenue_series(
+        self,
+        start: date_type,
+        end: date_type,
+        bucket: str = RevenueBucket.DAY,
+        by_table: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Асинхронная версия `get_revenue_series`."""
+        return self._merge_revenue_series(
+            [
+                [row async for row in queryset]
+                for queryset in self._get_revenue_series_querysets(
+                    start,
+                    end,
+                    bucket,
+                    by_table,
+                )
+            ],
+        )
+
+    def _get_revenue_for_day_queryset(
+        self,
+        date: date_type | None,
+    ) -> models.QuerySet:
+        return DailyRevenue.objects.filter(
+            date=date or get_shift_date(),
+        ).values_list('revenue', flat=True)
+
+    def _get_revenue_series_querysets(
+        self,
+        start: date_type,
+        end: date_type,
+        bucket: str,
+        by_table: bool,
+    ) -> list[models.QuerySet]:
+        fields = ('table_number',) if by_table else ()
+        if bucket != RevenueBucket.HOUR and not by_table:
+            start_of_bucket = (
+                F('date') if bucket == RevenueBucket.DAY else TruncWeek('date')
+            )
+            return [
+                DailyRevenue.objects.filter(date__range=(start, end))
+                .order_by()
+                .values(start=start_of_bucket)
+                .annotate(
+                    revenue=Sum('revenue'),
+                    orders_count=Sum('orders_count'),
+                )
+                .order_by('start'),
+            ]
+        start_of_bucket = {
+            RevenueBucket.HOUR: TruncHour('created_at'),
+            RevenueBucket.DAY: get_shift_date_expression(),
+            RevenueBucket.WEEK: get_shift_week_expression(),
+        }[bucket]
+        return [
+            queryset.filter(status=OrderStatus.PAID_FOR)
+            .created_between(start, end)
+            .order_by()
+            .values(*fields, start=start_of_bucket)
+            .annotate(revenue=Sum('total_price'), orders_count=Count('pk'))
+            .order_by('start', *fields)
+            for queryset in (self.get_queryset(), OrderArchive.objects.all())
+        ]
+
+    @staticmethod
+    def _merge_revenue_series(
+        parts: list[list[dict[str, Any]]],
+    ) -> list[dict[str, Any]]:
+        if len(parts) == 1:
+            return parts[0]
+        rows: dict[tuple, dict[str, Any]] = {}
+        for row in chain.from_iterable(parts):
+            key = (row['start'], row.get('table_number', 0))
+            if key in rows:
+                rows[key]['revenue'] += row['revenue']
+                rows[key]['orders_count'] += row['orders_count']
+            else:
+                rows[key] = dict(row)
+        return [rows[key] for key in sorted(rows)]
+
+
+class DailyRevenueManager(models.Manager):
+    def apply_changes(
+        self,
+        changes: dict[date_type, tuple[Decimal, int]],
+    ) -> None:
+        """Добавляет изменения выручки и количества заказов к сводке.
+
+        Args:
+            changes: Изменения выручки и количества оплаченных заказов
+                по дням.
+        """
+        for date, (revenue, orders_count) in changes.items():
+            if not revenue and not orders_count:
+                continue
+            self.get_or_create(date=date)
+            self.filter(date=date).update(
+                revenue=F('revenue') + revenue,
+                orders_count=F('orders_count') + orders_count,
+            )
+
+    def rebuild(self) -> None:
+        """Пересчитывает сводку по оперативным и архивным заказам."""
+        revenue = Order.objects.get_total_revenue_by_day()
+        with transaction.atomic():
+            self.exclude(date__in=revenue).delete()
+            self.bulk_create(
+                (
+                    DailyRevenue(
+                        date=date,
+                        revenue=day_revenue,
+                        orders_count=orders_count,
+                    )
+                    for date, (day_revenue, orders_count) in revenue.items()
+                ),
+                update_conflicts=True,
+                unique_fields=('date',),
+                update_fields=('revenue', 'orders_count'),
+            )
+
 
 class Meal(models.Model):
     """Модель блюда.
@@ -54,15 +618,21 @@ class Order(models.Model):
     """Модель заказа.
 
     Attributes:
-        items: Блюда, входящие в заказ.
+        items: Блюда, входящие в заказ, через позиции заказа.
         table_number: Номер стола, за которым был сделан заказ.
         status: Статус заказа.
         created_at: Время создания заказа.
+        updated_at: Время последнего изменения заказа.
+        total_price: Общая стоимость блюд в заказе.
+        items_count: Количество блюд в заказе.
     """
 
+    REVENUE_FIELDS = frozenset(('status', 'created_at', 'total_price'))
+
     objects = OrderManager()
     items = models.ManyToManyField(
         Meal,
+        through='OrderItem',
         related_name='order_meals',
     )
     table_number = models.PositiveSmallIntegerField(
@@ -79,17 +649,176 @@ class Order(models.Model):
     created_at = models.DateTimeField(
         auto_now_add=True,
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+    )
+    total_price = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        default=Decimal(0),
+        editable=False,
+    )
+    items_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+
+    class Meta:
+        """Метаданные модели.
+
+        Определяет индексы под фильтры списка заказов, выборку выручки и
+        постраничную выдачу API.
+
+        Attributes:
+            indexes: Индексы таблицы заказов.
+        """
+
+        indexes = (
+            models.Index(
+                fields=('status', 'created_at'),
+                name='order_status_created_idx',
+            ),
+            models.Index(
+                fields=('table_number', 'status'),
+                name='order_table_status_idx',
+            ),
+            models.Index(
+                fields=('created_at', 'id'),
+                name='order_created_idx',
+            ),
+            models.Index(
+                fields=('created_at',),
+                condition=Q(status__in=ACTIVE_ORDER_STATUSES),
+                name='order_active_created_idx',
+            ),
+            models.Index(
+                fields=('updated_at', 'id'),
+                name='order_updated_idx',
+            ),
+        )
 
-    @cached_property
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        """Сохраняет заказ и обновляет дневную выручку.
+
+        Прежний вклад заказа в выручку читается из базы внутри транзакции
+        сохранения, поэтому одновременные сохранения одного заказа не
+        учитывают его в сводке дважды.
+
+        Args:
+            args: Позиционные параметры сохранения модели.
+            kwargs: Именованные параметры сохранения модели.
+        """
+        with transaction.atomic():
+            previous = self.get_saved_revenue_state()
+            super().save(*args, **kwargs)
+            self.apply_revenue_change(previous, self.get_revenue_state())
+
+    def get_revenue_state(self) -> tuple[date_type | None, Decimal]:
+        """Возвращает день и сумму, на которые заказ влияет в выручке.
+
+        Returns:
+            День и стоимость оплаченного заказа или `None` и ноль для
+            неоплаченного.
+        """
+        if self.status != OrderStatus.PAID_FOR or not self.created_at:
+            return None, Decimal(0)
+        return get_shift_date(self.created_at), self.total_price
+
+    def get_saved_revenue_state(self) -> tuple[date_type | None, Decimal]:
+        """Возвращает вклад заказа в выручку по данным базы.
+
+        Строка заказа блокируется до конца транзакции, поэтому метод
+        вызывается внутри `transaction.atomic` перед записью заказа.
+
+        Returns:
+            День и стоимость заказа, сохраненные в базе.
+        """
+        if self._state.adding:
+            return None, Decimal(0)
+        saved = (
+            type(self)
+            .objects.select_for_update()
+            .filter(pk=self.pk)
+            .only(*self.REVENUE_FIELDS)
+            .first()
+        )
+        return saved.get_revenue_state() if saved else (None, Decimal(0))
+
+    def apply_revenue_change(
+        self,
+        previous: tuple[date_type | None, Decimal],
+        current: tuple[date_type | None, Decimal],
+    ) -> None:
+        """Переносит изменение вклада заказа в дневную выручку.
+
+        Args:
+            previous: Прежние день и стоимость оплаченного заказа.
+            current: Новые день и стоимость оплаченного заказа.
+        """
+        changes = {}
+        if previous[0]:
+            changes[previous[0]] = (-previous[1], -1)
+        if current[0]:
+            revenue, orders_count = changes.get(current[0], (0, 0))
+            changes[current[0]] = (revenue + current[1], orders_count + 1)
+        DailyRevenue.objects.apply_changes(changes)
+
+    @property
     def price(self) -> Decimal:
         """Возвращает общую стоимость всех блюд в заказе."""
-        return (
-            self.items.values('order_meals')
-            .aggregate(
-                total_price=models.Sum('price'),
+        return self.total_price
+
+    def set_items(self, quantities: Mapping[Meal, int]) -> None:
+        """Заменяет позиции заказа и пересчитывает его стоимость.
+
+        Цена новых позиций берется из текущей цены блюда, у оставшихся
+        позиций сохраняется цена на момент заказа и меняется только
+        количество.
+
+        Args:
+            quantities: Количество каждого блюда в заказе.
+        """
+        with transaction.atomic():
+            self.lines.exclude(meal__in=quantities).delete()
+            OrderItem.objects.bulk_create(
+                (
+                    OrderItem(
+                        order=self,
+                        meal=meal,
+                        quantity=quantity,
+                        unit_price=meal.price,
+                    )
+                    for meal, quantity in quantities.items()
+                ),
+                update_conflicts=True,
+                unique_fields=('order', 'meal'),
+                update_fields=('quantity',),
+            )
+            self.refresh_totals()
+        prefetched = getattr(self, '_prefetched_objects_cache', {})
+        prefetched.pop('lines', None)
+        prefetched.pop('items', None)
+
+    def refresh_totals(self) -> None:
+        """Пересчитывает сохраненные стоимость и количество блюд заказа."""
+        with transaction.atomic():
+            previous = self.get_saved_revenue_state()
+            totals = self.lines.aggregate(
+                total_price=Coalesce(
+                    OrderItem.get_total(),
+                    Decimal(0),
+                    output_field=DecimalField(),
+                ),
+                items_count=Coalesce(Sum('quantity'), 0),
+            )
+            totals['updated_at'] = timezone.now()
+            type(self).objects.filter(pk=self.pk).update(**totals)
+            for field, value in totals.items():
+                setattr(self, field, value)
+            self.apply_revenue_change(
+                previous,
+                self.get_saved_revenue_state(),
             )
-            .get('total_price')
-        )
 
     def __str__(self) -> str:
         """Возвращает строковое представление объекта заказа."""
@@ -97,3 +826,231 @@ class Order(models.Model):
             f'{type(self).__name__} #{self.pk}: '
             f'{self.table_number} - {self.status}'
         )
+
+
+class OrderItem(models.Model):
+    """Модель позиции заказа.
+
+    Attributes:
+        order: Заказ, в который входит позиция.
+        meal: Заказанное блюдо.
+        quantity: Количество блюда в заказе.
+        unit_price: Цена блюда на момент заказа.
+    """
+
+    order = models.ForeignKey(
+        Order,
+        on_delete=models.CASCADE,
+        related_name='lines',
+    )
+    meal = models.ForeignKey(
+        Meal,
+        on_delete=models.PROTECT,
+        related_name='order_lines',
+    )
+    quantity = models.PositiveSmallIntegerField(
+        default=1,
+        validators=(MinValueValidator(1),),
+    )
+    unit_price = models.DecimalField(
+        max_digits=6,
+        decimal_places=2,
+    )
+
+    class Meta:
+        """Метаданные модели.
+
+        Attributes:
+            ordering: Порядок позиций заказа по блюдам.
+            constraints: Ограничения таблицы позиций заказа.
+        """
+
+        ordering = ('meal',)
+        constraints = (
+            models.UniqueConstraint(
+                fields=('order', 'meal'),
+                name='order_item_order_meal_unique',
+            ),
+        )
+
+    @staticmethod
+    def get_total() -> Sum:
+        """Возвращает выражение суммарной стоимости позиций.
+
+        Returns:
+            Сумма произведений количества на цену блюда.
+        """
+        return Sum(F('quantity') * F('unit_price'))
+
+    def __str__(self) -> str:
+        """Возвращает строковое представление объекта позиции заказа."""
+        return (
+            f'{type(self).__name__} #{self.pk}: '
+            f'{self.meal_id} x {self.quantity} - {self.unit_price}'
+        )
+
+
+class OrderTombstone(models.Model):
+    """Модель записи об удаленном заказе для ленты изменений.
+
+    Attributes:
+        order_id: Идентификатор удаленного заказа.
+        deleted_at: Время удаления заказа.
+    """
+
+    order_id = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(
+        auto_now_add=True,
+    )
+
+    def __str__(self) -> str:
+        """Возвращает строковое представление объекта записи."""
+        return f'{type(self).__name__} #{self.pk}: order {self.order_id}'
+
+
+class OrderArchive(models.Model):
+    """Модель архивного оплаченного заказа.
+
+    Заказ переносится в архив с тем же идентификатором и значениями полей,
+    которые были у него в оперативной таблице.
+
+    Attributes:
+        table_number: Номер стола, за которым был сделан заказ.
+        status: Статус заказа на момент переноса.
+        created_at: Время создания заказа.
+        updated_at: Время последнего изменения заказа.
+        total_price: Общая стоимость блюд в заказе.
+        items_count: Количество блюд в заказе.
+        archived_at: Время переноса заказа в архив.
+    """
+
+    COPIED_FIELDS = (
+        'id',
+        'table_number',
+        'status',
+        'created_at',
+        'updated_at',
+        'total_price',
+        'items_count',
+    )
+
+    objects = BaseOrderQuerySet.as_manager()
+    id = models.BigIntegerField(
+        primary_key=True,
+    )
+    table_number = models.PositiveSmallIntegerField()
+    status = models.CharField(
+        choices=OrderStatus,
+        max_length=10,
+    )
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    total_price = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+    )
+    items_count = models.PositiveIntegerField()
+    archived_at = models.DateTimeField(
+        auto_now_add=True,
+    )
+
+    class Meta:
+        """Метаданные модели.
+
+        Attributes:
+            indexes: Индексы таблицы архивных заказов.
+        """
+
+        indexes = (
+            models.Index(
+                fields=('created_at',),
+                name='order_archive_created_idx',
+            ),
+        )
+
+    def __str__(self) -> str:
+        """Возвращает строковое представление объекта архивного заказа."""
+        return (
+            f'{type(self).__name__} #{self.pk}: '
+            f'{self.table_number} - {self.status}'
+        )
+
+
+class OrderItemArchive(models.Model):
+    """Модель позиции архивного заказа.
+
+    Название и цена блюда копируются в позицию, поэтому удаление блюда из
+    меню не затрагивает архив: ссылка на блюдо остается без ограничения
+    внешнего ключа.
+
+    Attributes:
+        order: Архивный заказ, в который входит позиция.
+        meal: Заказанное блюдо.
+        meal_name: Название блюда на момент переноса в архив.
+        quantity: Количество блюда в заказе.
+        unit_price: Цена блюда на момент заказа.
+    """
+
+    order = models.ForeignKey(
+        OrderArchive,
+        on_delete=models.CASCADE,
+        related_name='lines',
+    )
+    meal = models.ForeignKey(
+        Meal,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='archived_order_lines',
+    )
+    meal_name = models.CharField(max_length=200)
+    quantity = models.PositiveSmallIntegerField()
+    unit_price = models.DecimalField(
+        max_digits=6,
+        decimal_places=2,
+    )
+
+    class Meta:
+        """Метаданные модели.
+
+        Attributes:
+            ordering: Порядок позиций заказа по блюдам.
+        """
+
+        ordering = ('meal',)
+
+    def __str__(self) -> str:
+        """Возвращает строковое представление объекта позиции заказа."""
+        return (
+            f'{type(self).__name__} #{self.pk}: '
+            f'{self.meal_name} x {self.quantity} - {self.unit_price}'
+        )
+
+
+class DailyRevenue(models.Model):
+    """Модель дневной сводки выручки.
+
+    Обновляется в той же транзакции, в которой заказ получает или теряет
+    статус `OrderStatus.PAID_FOR`.
+
+    Attributes:
+        date: День создания оплаченных заказов.
+        revenue: Выручка за день.
+        orders_count: Количество оплаченных заказов за день.
+    """
+
+    objects = DailyRevenueManager()
+    date = models.DateField(
+        unique=True,
+    )
+    revenue = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal(0),
+    )
+    orders_count = models.IntegerField(
+        default=0,
+    )
+
+    def __str__(self) -> str:
+        """Возвращает строковое представление объекта сводки."""
+        return f'{type(self).__name__} {self.date}: {self.revenue}'
@@ -0,0 +1,85 @@
+from datetime import date, datetime, timedelta
+
+from django.conf import settings
+from django.db.models import DateField, DateTimeField, ExpressionWrapper, F
+from django.db.models.functions import TruncDate, TruncWeek
+from django.utils import timezone
+
+
+def get_shift_offset() -> timedelta:
+    """Возвращает смещение начала смены от начала суток.
+
+    Returns:
+        Время начала смены в виде интервала от полуночи.
+    """
+    start = settings.SHIFT_START
+    return timedelta(hours=start.hour, minutes=start.minute)
+
+
+def get_shift_date(moment: datetime | None = None) -> date:
+    """Возвращает день смены, к которой относится момент времени.
+
+    Момент относится к смене, начавшейся последней до него: смена длится
+    до начала следующей, поэтому заказы после закрытия кафе учитываются
+    в последней открытой смене.
+
+    Args:
+        moment: Момент времени. По умолчанию текущий.
+
+    Returns:
+        День начала смены.
+    """
+    return (timezone.localtime(moment) - get_shift_offset()).date()
+
+
+def get_shift_start(shift_date: date) -> datetime:
+    """Возвращает время начала смены.
+
+    Args:
+        shift_date: День начала смены.
+
+    Returns:
+        Время начала смены с учетом часового пояса.
+    """
+    return timezone.make_aware(
+        datetime.combine(shift_date, settings.SHIFT_START),
+    )
+
+
+def get_shifted_moment(field: str = 'created_at') -> ExpressionWrapper:
+    """Возвращает выражение момента времени, сдвинутого к началу суток.
+
+    Args:
+        field: Поле с моментом времени.
+
+    Returns:
+        Выражение момента времени за вычетом смещения начала смены.
+    """
+    return ExpressionWrapper(
+        F(field) - get_shift_offset(),
+        output_field=DateTimeField(),
+    )
+
+
+def get_shift_date_expression(field: str = 'created_at') -> TruncDate:
+    """Возвращает выражение дня смены для группировки в SQL.
+
+    Args:
+        field: Поле с моментом времени.
+
+    Returns:
+        Выражение дня смены.
+    """
+    return TruncDate(get_shifted_moment(field))
+
+
+def get_shift_week_expression(field: str = 'created_at') -> TruncWeek:
+    """Возвращает выражение первого дня недели смены для группировки в SQL.
+
+    Args:
+        field: Поле с моментом времени.
+
+    Returns:
+        Выражение первого дня недели смены.
+    """
+    return TruncWeek(get_shifted_moment(field), output_field=DateField())
@@ -0,0 +1,134 @@
+from decimal import Decimal
+from typing import Any
+
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+
+from order.models import Meal, Order, OrderTombstone
+from order.versions import MENU_VERSION, ORDERS_VERSION, bump_version
+
+
+@receiver(m2m_changed, sender=Order.items.through)
+def update_order_totals(
+    sender: type,
+    instance: Order | Meal,
+    action: str,
+    reverse: bool,
+    pk_set: set[int] | None,
+    **kwargs: Any,
+) -> None:
+    """Обновляет сохраненную стоимость заказа при изменении его блюд.
+
+    При изменении связи со стороны блюда пересчитываются все затронутые
+    заказы.
+
+    Args:
+        sender: Промежуточная модель связи заказов и блюд.
+        instance: Заказ или блюдо, связь которого изменилась.
+        action: Тип изменения связи.
+        reverse: Признак изменения связи со стороны блюда.
+        pk_set: Первичные ключи добавленных или удаленных объектов.
+        kwargs: Дополнительные именованные параметры.
+    """
+    if reverse:
+        if action == 'pre_clear':
+            remember_meal_orders(sender=Meal, instance=instance)
+        elif action == 'post_clear':
+            Order.objects.filter(
+                pk__in=getattr(instance, '_order_ids', ()),
+            ).refresh_totals()
+        elif action in ('post_add', 'post_remove'):
+            Order.objects.filter(pk__in=pk_set).refresh_totals()
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        instance.refresh_totals()
+
+
+@receiver(pre_delete, sender=Order)
+def remove_order_revenue(
+    sender: type[Order],
+    instance: Order,
+    **kwargs: Any,
+) -> None:
+    """Вычитает удаляемый оплаченный заказ из дневной выручки.
+
+    Args:
+        sender: Модель заказа.
+        instance: Удаляемый заказ.
+        kwargs: Дополнительные именованные параметры.
+    """
+    instance.apply_revenue_change(
+        instance.get_saved_revenue_state(),
+        (None, Decimal(0)),
+    )
+
+
+def remember_meal_orders(
+    sender: type[Meal],
+    instance: Meal,
+    **kwargs: Any,
+) -> None:
+    """Запоминает заказы, в которые входит блюдо, до удаления связей.
+
+    Args:
+        sender: Модель блюда.
+        instance: Блюдо, связи которого будут удалены.
+        kwargs: Дополнительные именованные параметры.
+    """
+    instance._order_ids = list(
+        instance.order_meals.values_list('pk', flat=True),
+    )
+
+
+@receiver(post_save, sender=Meal)
+@receiver(post_delete, sender=Meal)
+def change_menu_version(
+    sender: type[Meal],
+    instance: Meal,
+    **kwargs: Any,
+) -> None:
+    """Меняет версию меню после изменения или удаления блюда.
+
+    Args:
+        sender: Модель блюда.
+        instance: Измененное или удаленное блюдо.
+        kwargs: Дополнительные именованные параметры.
+    """
+    bump_version(MENU_VERSION)
+
+
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+def change_orders_version(
+    sender: type[Order],
+    instance: Order,
+    **kwargs: Any,
+) -> None:
+    """Меняет версию заказов после изменения или удаления заказа.
+
+    Args:
+        sender: Модель заказа.
+        instance: Измененный или удаленный заказ.
+        kwargs: Дополнительные именованные параметры.
+    """
+    bump_version(ORDERS_VERSION)
+
+
+@receiver(post_delete, sender=Order)
+def record_order_tombstone(
+    sender: type[Order],
+    instance: Order,
+    **kwargs: Any,
+) -> None:
+    """Записывает удаление заказа для ленты изменений.
+
+    Args:
+        sender: Модель заказа.
+        instance: Удаленный заказ.
+        kwargs: Дополнительные именованные параметры.
+    """
+    OrderTombstone.objects.create(order_id=instance.pk)
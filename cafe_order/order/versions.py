@@ -0,0 +1,97 @@
+from datetime import datetime
+from functools import partial
+from typing import NamedTuple
+from uuid import uuid4
+
+from core.metrics import metrics
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+MENU_VERSION = 'menu'
+ORDERS_VERSION = 'orders'
+
+
+class Version(NamedTuple):
+    """Версия набора данных.
+
+    Attributes:
+        token: Уникальный признак версии.
+        modified: Время появления версии.
+    """
+
+    token: str
+    modified: datetime
+
+
+def get_version_key(name: str) -> str:
+    """Возвращает ключ кэша с версией набора данных.
+
+    Args:
+        name: Название набора данных.
+
+    Returns:
+        Ключ кэша.
+    """
+    return f'order:version:{name}'
+
+
+def make_version() -> tuple[str, datetime]:
+    """Создает новую версию для сохранения в кэше.
+
+    Returns:
+        Признак и время появления версии.
+    """
+    return uuid4().hex, timezone.now()
+
+
+def get_version(name: str) -> Version:
+    """Возвращает текущую версию набора данных.
+
+    Если версии в кэше нет, например после его очистки, создается новая.
+
+    Args:
+        name: Название набора данных.
+
+    Returns:
+        Версия набора данных.
+    """
+    key = get_version_key(name)
+    version = cache.get(key)
+    metrics.inc(
+        'cafe_cache_requests_total',
+        cache='versions',
+        result='miss' if version is None else 'hit',
+    )
+    if version is None:
+        cache.add(key, make_version(), timeout=None)
+        version = cache.get(key)
+    return Version(*version)
+
+
+def set_version(name: str) -> Version:
+    """Сохраняет в кэше новую версию набора данных.
+
+    Args:
+        name: Название набора данных.
+
+    Returns:
+        Сохраненная версия.
+    """
+    version = make_version()
+    cache.set(get_version_key(name), version, timeout=None)
+    return Version(*version)
+
+
+def bump_version(name: str) -> None:
+    """Меняет версию набора данных после его изменения.
+
+    Версия меняется сразу, чтобы изменение было видно в текущей
+    транзакции, и повторно после ее фиксации, чтобы данные, прочитанные
+    другим процессом до фиксации, не считались актуальными.
+
+    Args:
+        name: Название набора данных.
+    """
+    set_version(name)
+    transaction.on_commit(partial(set_version, name))
@@ -1,10 +1,20 @@
 from typing import Any
 
-from core.constants import DELETE_PROHIBITED_MESSAGE, UPDATE_PROHIBITED_MESSAGE
-from django.db.models import QuerySet
-from django.http import HttpRequest, HttpResponse
-from django.shortcuts import render
-from django.urls import reverse_lazy
+from core.constants import (
+    ACTIVE_ORDERS_FILTER,
+    DELETE_PROHIBITED_MESSAGE,
+    ORDER_LIST_PAGE_SIZE,
+    UPDATE_PROHIBITED_MESSAGE,
+    OrderEventType,
+)
+from core.db import read_from_replica, retry_on_lock
+from django.db import transaction
+from django.db.models import Q, QuerySet, Subquery
+from django.forms import Form
+from django.http import HttpRequest, HttpResponse, QueryDict
+from django.shortcuts import redirect, render
+from django.urls import reverse, reverse_lazy
+from django.utils.decorators import method_decorator
 from django.views.generic import (
     CreateView,
     DeleteView,
@@ -14,6 +24,8 @@ from django.views.generic import (
 )
 
 from order import forms, mixins, models
+from order.events import publish_order_deletions, publish_order_events
+from order.shifts import get_shift_date
 
 
 class MealsCreateView(CreateView):
@@ -47,6 +59,24 @@ class OrderCreateView(CreateView):
     success_url = reverse_lazy('order:order')
     template_name = 'order/order_create.html'
 
+    @retry_on_lock
+    def form_valid(self, form: forms.OrderForm) -> HttpResponse:
+        """Сохраняет заказ и публикует событие его создания.
+
+        Заказ и его позиции сохраняются в одной транзакции, поэтому при
+        блокировке базы данных повторяется вся запись.
+
+        Args:
+            form: Заполненная форма заказа.
+
+        Returns:
+            Перенаправление на страницу успеха.
+        """
+        with transaction.atomic():
+            response = super().form_valid(form)
+            publish_order_events(OrderEventType.CREATED, [self.object])
+        return response
+
 
 class OrderDeleteView(mixins.DispatchUpdateDeleteViewMixin, DeleteView):
     """Представление для удаления существующего заказа.
@@ -60,54 +90,139 @@ class OrderDeleteView(mixins.DispatchUpdateDeleteViewMixin, DeleteView):
     success_url = reverse_lazy('order:order_list')
     warning_message = DELETE_PROHIBITED_MESSAGE
 
+    @retry_on_lock
+    def form_valid(self, form: Form) -> HttpResponse:
+        """Удаляет заказ и публикует событие его удаления.
 
+        Args:
+            form: Форма подтверждения удаления.
+
+        Returns:
+            Перенаправление на страницу успеха.
+        """
+        order_id = self.object.pk
+        response = super().form_valid(form)
+        publish_order_deletions([order_id])
+        return response
+
+
+@method_decorator(read_from_replica, name='get')
 class OrderListView(ListView):
     """Представление для списка заказов.
 
+    Заказы фильтруются по параметрам GET-запроса и выводятся страницами
+    в порядке создания. Без параметров выводятся активные заказы за текущий
+    день.
+
     Attributes:
         model: Модель заказа.
         template_name: Шаблон для отображения списка.
         form_class: Форма для поиска заказов.
+        paginate_by: Количество заказов на странице.
+        after_param: Параметр запроса с идентификатором последнего заказа
+            предыдущей страницы.
     """
 
     model = models.Order
     template_name = 'order/order_list.html'
     context_object_name = 'orders'
     form_class = forms.SearchOrderForm
+    paginate_by = ORDER_LIST_PAGE_SIZE
+    after_param = 'after'
+
+    def get_form(self) -> forms.SearchOrderForm:
+        """Возвращает форму поиска, заполненную параметрами запроса.
+
+        Returns:
+            Форма поиска с фильтрами из запроса или фильтрами по умолчанию.
+        """
+        data = self.request.GET
+        if not any(field in data for field in self.form_class.base_fields):
+            data = {
+                'status': ACTIVE_ORDERS_FILTER,
+                'date': get_shift_date().isoformat(),
+            }
+        return self.form_class(data)
+
+    def get_queryset(self) -> QuerySet:
+        """Возвращает заказы страницы, отфильтрованные по данным формы.
+
+        Выбирается на один заказ больше размера страницы, чтобы определить
+        наличие следующей страницы.
+
+        Returns:
+            Заказы для отображения в списке.
+        """
+        self.form = self.get_form()
+        if not self.form.is_valid():
+            return self.model.objects.none()
+        data = self.form.cleaned_data
+        queryset = self.model.objects.with_items()
+        if data.get('table_number'):
+            queryset = queryset.filter(table_number=data['table_number'])
+        if data.get('status') == ACTIVE_ORDERS_FILTER:
+            queryset = queryset.active()
+        elif data.get('status'):
+            queryset = queryset.filter(status=data['status'])
+        if data.get('date'):
+            queryset = queryset.created_on(data['date'])
+        after = self.request.GET.get(self.after_param, '')
+        if after.isdigit():
+            created_at = self.model.objects.filter(pk=after).values(
+                'created_at',
+            )
+            queryset = queryset.filter(
+                Q(created_at__gt=Subquery(created_at))
+                | Q(created_at=Subquery(created_at), pk__gt=after),
+            )
+        return queryset.order_by('created_at', 'pk')[: self.paginate_by + 1]
+
+    def paginate_queryset(
+        self,
+        queryset: QuerySet,
+        page_size: int,
+    ) -> tuple[None, None, list[models.Order], bool]:
+        """Отделяет заказы страницы от признака следующей страницы.
+
+        Args:
+            queryset: Заказы страницы с одним лишним заказом.
+            page_size: Количество заказов на странице.
+
+        Returns:
+            Кортеж из пагинатора, страницы, заказов страницы и признака
+            наличия следующей страницы.
+        """
+        orders = list(queryset)
+        return None, None, orders[:page_size], len(orders) > page_size
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
-        context['form'] = self.form_class()
+        context['form'] = self.form
+        context['next_page_query'] = None
+        if context['is_paginated']:
+            query = QueryDict(mutable=True)
+            query.update(self.form.data)
+            query[self.after_param] = context['object_list'][-1].pk
+            context['next_page_query'] = query.urlencode()
         return context
 
     def post(self, request: HttpRequest) -> HttpResponse:
-        """Фильтрует список заказов на основе данных формы.
+        """Перенаправляет поиск из формы на адрес с параметрами запроса.
 
         Args:
             request: Объект HTTP-запроса.
 
         Returns:
-            Ответ с HTML-контентом страницы.
+            Перенаправление на страницу списка заказов.
         """
-        form = self.form_class(request.POST)
-        if form.is_valid():
-            data = form.cleaned_data
-            filters = {}
-            if data.get('table_number'):
-                filters['table_number'] = data['table_number']
-            if data.get('status'):
-                filters['status'] = data['status']
-            queryset = self.model.objects.filter(**filters)
-        else:
-            queryset = self.model.objects.none()
-        return render(
-            request,
-            self.template_name,
-            self.get_context_data(
-                form=form,
-                object_list=queryset,
-            ),
+        query = QueryDict(mutable=True)
+        query.update(
+            {
+                field: request.POST.get(field, '')
+                for field in self.form_class.base_fields
+            },
         )
+        return redirect(f'{reverse("order:order_list")}?{query.urlencode()}')
 
 
 class OrderUpdateView(mixins.DispatchUpdateDeleteViewMixin, UpdateView):
@@ -137,6 +252,24 @@ class OrderUpdateView(mixins.DispatchUpdateDeleteViewMixin, UpdateView):
         initial['items'] = self.object.items.all()
         return initial
 
+    @retry_on_lock
+    def form_valid(self, form: forms.OrderUpdateForm) -> HttpResponse:
+        """Сохраняет заказ и публикует событие его изменения.
+
+        Заказ и его позиции сохраняются в одной транзакции, поэтому при
+        блокировке базы данных повторяется вся запись.
+
+        Args:
+            form: Заполненная форма заказа.
+
+        Returns:
+            Перенаправление на страницу успеха.
+        """
+        with transaction.atomic():
+            response = super().form_valid(form)
+            publish_order_events(OrderEventType.UPDATED, [self.object])
+        return response
+
 
 class CurrentDayRevenueView(View):
     """Представление для выручки за смену.
@@ -0,0 +1,127 @@
+import importlib
+import json
+from collections.abc import Callable, Iterator
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from api.asynchronous import AsyncReadView
+from api.urls.v1 import router_views
+from api.views import OrderViewSet
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import clear_url_caches, resolve
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.test import APIClient, APIRequestFactory
+
+pytestmark = pytest.mark.django_db
+
+ASYNC_READ_PATHS = (
+    '/api/v1/meals/',
+    '/api/v1/orders/',
+    '/api/v1/orders/1/',
+    '/api/v1/orders/revenue/',
+)
+
+
+def reload_urls() -> None:
+    for name in ('api.urls.v1', 'api.urls', 'cafe_order.urls'):
+        importlib.reload(importlib.import_module(name))
+    clear_url_caches()
+
+
+@pytest.fixture()
+def async_api_reads(settings: Any) -> Iterator[None]:
+    settings.ASYNC_API_READS = True
+    reload_urls()
+    yield
+    settings.ASYNC_API_READS = False
+    reload_urls()
+
+
+def get_sync_data(name: str, path: str, **kwargs: int) -> dict:
+    response = router_views[name](APIRequestFactory().get(path), **kwargs)
+    return json.loads(response.render().content)
+
+
+@pytest.mark.parametrize('path', ASYNC_READ_PATHS)
+def test_wsgi_routes_are_sync(path: str) -> None:
+    assert not hasattr(resolve(path).func, 'view_class')
+
+
+@pytest.mark.usefixtures('async_api_reads')
+class TestAsyncReadViews:
+    @pytest.mark.parametrize('path', ASYNC_READ_PATHS)
+    def test_routes(self, path: str) -> None:
+        assert resolve(path).func.view_class is AsyncReadView
+
+    def test_permissions_are_checked(self) -> None:
+        with patch.object(
+            OrderViewSet,
+            'permission_classes',
+            (IsAuthenticated,),
+        ):
+            response = async_to_sync(AsyncClient().get)('/api/v1/orders/')
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_asgi_responses_match_sync_views(
+        self,
+        fill_order_batch: Callable,
+    ) -> None:
+        orders = fill_order_batch(3, is_paid=True)
+        client = AsyncClient()
+        for name, path, kwargs in (
+            ('meal-list', '/api/v1/meals/', {}),
+            ('order-list', '/api/v1/orders/', {}),
+            ('order-detail', f'/api/v1/orders/{orders[0].pk}/', {}),
+            ('order-revenue', '/api/v1/orders/revenue/', {}),
+        ):
+            response = async_to_sync(client.get)(path)
+            assert response.status_code == status.HTTP_200_OK
+            if name == 'order-detail':
+                kwargs = {'pk': orders[0].pk}
+            assert response.json() == get_sync_data(name, path, **kwargs)
+
+    def test_revenue_series(self, api_client: APIClient) -> None:
+        params = {'from': '2025-01-01', 'to': '2025-01-02'}
+        response = api_client.get('/api/v1/orders/revenue/', params)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['starts'] == []
+        params['bucket'] = 'year'
+        response = api_client.get('/api/v1/orders/revenue/', params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'bucket' in response.data
+
+    def test_not_found(self, api_client: APIClient) -> None:
+        response = api_client.get('/api/v1/orders/1/')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.headers['Content-Type'] == 'application/json'
+        assert 'detail' in response.data
+
+    def test_browsable_api_falls_back_to_sync_view(
+        self,
+        api_client: APIClient,
+        fill_order_batch: Callable,
+    ) -> None:
+        fill_order_batch()
+        response = api_client.get('/api/v1/orders/', HTTP_ACCEPT='text/html')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers['Content-Type'].startswith('text/html')
+
+    def test_writes_fall_back_to_sync_view(
+        self,
+        api_client: APIClient,
+        fill_order_batch: Callable,
+    ) -> None:
+        order = fill_order_batch(1)[0]
+        response = api_client.patch(
+            f'/api/v1/orders/{order.pk}/',
+            {'table_number': 5},
+            format='json',
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['table_number'] == 5
+        assert response.headers['Allow'] == (
+            'GET, PUT, PATCH, DELETE, HEAD, OPTIONS'
+        )
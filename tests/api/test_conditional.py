@@ -0,0 +1,97 @@
+import json
+from collections.abc import Callable
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from core.constants import OrderStatus
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from order.versions import ORDERS_VERSION, get_version
+from rest_framework import status
+from rest_framework.test import APIClient
+
+MEALS_ENDPOINT = '/api/v1/meals/'
+ORDERS_ENDPOINT = '/api/v1/orders/'
+
+pytestmark = pytest.mark.django_db
+
+
+class TestConditionalGet:
+    def test_meals_not_modified(
+        self,
+        api_client: APIClient,
+        fill_meal_batch: Callable,
+    ) -> None:
+        meals = fill_meal_batch()
+        response = api_client.get(MEALS_ENDPOINT)
+        assert response.status_code == status.HTTP_200_OK
+        etag = response.headers['ETag']
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(MEALS_ENDPOINT, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert len(context) == 0
+
+        meals[0].name = 'Espresso'
+        meals[0].save()
+        response = api_client.get(MEALS_ENDPOINT, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers['ETag'] != etag
+
+    def test_orders_not_modified(
+        self,
+        api_client: APIClient,
+        fill_order_batch: Callable,
+    ) -> None:
+        orders = fill_order_batch()
+        response = api_client.get(ORDERS_ENDPOINT)
+        etag = response.headers['ETag']
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(
+                ORDERS_ENDPOINT,
+                HTTP_IF_NONE_MATCH=etag,
+            )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert len(context) == 0
+
+        api_client.post(
+            f'{ORDERS_ENDPOINT}transition/',
+            json.dumps({'ids': [orders[0].pk], 'status': OrderStatus.READY}),
+            content_type='application/json',
+        )
+        response = api_client.get(ORDERS_ENDPOINT, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_last_modified_after_its_second(
+        self,
+        api_client: APIClient,
+        fill_order_batch: Callable,
+    ) -> None:
+        fill_order_batch()
+        modified = get_version(ORDERS_VERSION).modified
+        with patch('django.utils.timezone.now', return_value=modified):
+            response = api_client.get(ORDERS_ENDPOINT)
+        assert 'Last-Modified' not in response.headers
+        later = modified + timedelta(seconds=1)
+        with patch('django.utils.timezone.now', return_value=later):
+            response = api_client.get(ORDERS_ENDPOINT)
+            response = api_client.get(
+                ORDERS_ENDPOINT,
+                HTTP_IF_MODIFIED_SINCE=response.headers['Last-Modified'],
+            )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_etag_depends_on_query(
+        self,
+        api_client: APIClient,
+        fill_order_batch: Callable,
+    ) -> None:
+        fill_order_batch()
+        etag = api_client.get(ORDERS_ENDPOINT).headers['ETag']
+        response = api_client.get(
+            ORDERS_ENDPOINT,
+            {'page_size': 2},
+            HTTP_IF_NONE_MATCH=etag,
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers['ETag'] != etag
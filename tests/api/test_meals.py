@@ -2,7 +2,9 @@ import json
 from collections.abc import Callable
 
 import pytest
+from django.db import connection
 from django.db.models import Model
+from django.test.utils import CaptureQueriesContext
 from order.models import Meal
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -33,12 +35,33 @@ class TestGetMeals:
     ) -> None:
         meals = fill_meal_batch()
         response = api_client.get(ENDPOINT)
-        response_data = response.data
+        response_data = response.data['results']
         assert response.status_code == status.HTTP_200_OK
         assert len(meals) == len(response_data)
         for meal, data in zip(meals, response_data, strict=False):
             self.make_fields_subtest(meal, data)
 
+    def test_get_list_from_menu(
+        self,
+        api_client: APIClient,
+        fill_meal_batch: Callable,
+    ) -> None:
+        meals = fill_meal_batch()
+        api_client.get(ENDPOINT)
+        with CaptureQueriesContext(connection) as context:
+            first = api_client.get(ENDPOINT, {'page_size': 3})
+            second = api_client.get(first.data['next'])
+            detail = api_client.get(f'{ENDPOINT}{meals[0].pk}/')
+        assert len(context) == 0
+        assert [data['id'] for data in first.data['results']] == [
+            meal.pk for meal in meals[:3]
+        ]
+        assert [data['id'] for data in second.data['results']] == [
+            meal.pk for meal in meals[3:]
+        ]
+        assert second.data['next'] is None
+        assert detail.data['name'] == meals[0].name
+
     def test_get_by_id(
         self,
         api_client: APIClient,
@@ -193,3 +216,13 @@ class TestDeleteMeals:
     ) -> None:
         response = api_client.delete(f'{ENDPOINT}101/')
         assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_delete_ordered(
+        self,
+        api_client: APIClient,
+        fill_order_batch: Callable,
+    ) -> None:
+        meal_id = fill_order_batch(1)[0].items.get().pk
+        response = api_client.delete(f'{ENDPOINT}{meal_id}/')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert Meal.objects.filter(pk=meal_id).exists()
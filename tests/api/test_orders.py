@@ -1,12 +1,22 @@
 import json
 from collections.abc import Callable
+from datetime import timedelta
 
 import pytest
-from core.constants import OrderStatus
-from order.models import Order
+from api.serializers import OrderSerializer
+from core.constants import ORDER_BULK_MAX_SIZE, OrderStatus
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from order.events import broadcaster
+from order.models import DailyRevenue, Order, OrderTombstone
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
 from rest_framework.test import APIClient
 
+from tests.factories import OrderFactory
+
 ENDPOINT = '/api/v1/orders/'
 
 pytestmark = pytest.mark.django_db
@@ -20,7 +30,7 @@ class TestGetOrders:
     ) -> None:
         orders = fill_order_batch()
         response = api_client.get(ENDPOINT)
-        response_data = response.data
+        response_data = response.data['results']
         assert response.status_code == status.HTTP_200_OK
         assert len(orders) == len(response_data)
 
@@ -63,6 +73,230 @@ class TestGetOrders:
         assert response.status_code == status.HTTP_200_OK
         assert response.data.get('revenue_per_shift') == 0
 
+    @pytest.mark.parametrize('params', ({'format': 'json'}, {'_': '123'}))
+    def test_get_revenue_ignores_other_params(
+        self,
+        api_client: APIClient,
+        fill_order_batch: Callable,
+        params: dict[str, str],
+    ) -> None:
+        orders = fill_order_batch(is_paid=True)
+        response = api_client.get(f'{ENDPOINT}revenue/', params)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            'revenue_per_shift': float(sum(order.price for order in orders)),
+        }
+
+
+class TestOrderRows:
+    @staticmethod
+    def get_model_data(orders: list[Order]) -> list[dict]:
+        return json.loads(
+            JSONRenderer().render(
+                OrderSerializer(
+                    Order.objects.with_items().filter(
+                        pk__in=[order.pk for order in orders],
+                    ),
+                    many=True,
+                ).data,
+            ),
+        )
+
+    def test_list_matches_model_serializer(
+        self,
+        api_client: APIClient,
+        fill_order_batch: Callable,
+    ) -> None:
+        orders = fill_order_batch()
+        OrderFactory(items=[[orders[0].items.first()] * 2])
+        response = api_client.get(ENDPOINT)
+        expected = self.get_model_data(Order.objects.all())
+        assert response.json()['results'] == sorted(
+            expected,
+            key=lambda order: (order['created_at'], order['id']),
+            reverse=True,
+        )
+
+    def test_retrieve_matches_model_serializer(
+        self,
+        api_client: APIClient,
+        fill_order_batch: Callable,
+    ) -> None:
+        order = fill_order_batch(1)[0]
+        response = api_client.get(f'{ENDPOINT}{order.pk}/')
+        assert response.json() == self.get_model_data([order])[0]
+
+
+class TestGetRevenueSeries:
+    @staticmethod
+    def make_paid_orders(
+        days_ago: list[int],
+        table_number: int = 1,
+    ) -> list[Order]:
+        orders = OrderFactory.create_batch(
+            len(days_ago),
+            status=OrderStatus.PAID_FOR,
+            table_number=table_number,
+        )
+        for order, days in zip(orders, days_ago, strict=True):
+            order.created_at -= timedelta(days=days)
+            order.save()
+        DailyRevenue.objects.rebuild()
+        return orders
+
+    def test_daily_buckets(self, api_client: APIClient) -> None:
+        orders = self.make_paid_orders([0, 2, 2])
+        today = timezone.localdate()
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(
+                f'{ENDPOINT}revenue/',
+                {'from': today - timedelta(days=3), 'to': today},
+            )
+        assert len(context) == 1
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['starts'] == [
+            today - timedelta(days=2),
+            today,
+        ]
+        assert response.data['revenue'] == [
+            orders[1].total_price + orders[2].total_price,
+            orders[0].total_price,
+        ]
+        assert response.data['orders_count'] == [2, 1]
+
+    def test_hourly_buckets_by_table(self, api_client: APIClient) -> None:
+        orders = [
+            *self.make_paid_orders([0], table_number=3),
+            *self.make_paid_orders([0], table_number=5),
+        ]
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(
+                f'{ENDPOINT}revenue/',
+                {'bucket': 'hour', 'group_by': 'table'},
+            )
+        assert len(context) == 2
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['tables'] == [3, 5]
+        assert response.data['revenue'] == [
+            order.total_price for order in orders
+        ]
+
+    @pytest.mark.parametrize(
+        'params',
+        (
+            {'from': '2025-02-01', 'to': '2025-01-01'},
+            {'from': '2020-01-01', 'to': '2025-01-01'},
+            {'bucket': 'month'},
+        ),
+    )
+    def test_invalid_params(
+        self,
+        api_client: APIClient,
+        params: dict[str, str],
+    ) -> None:
+        response = api_client.get(f'{ENDPOINT}revenue/', params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestGetOrdersQueries:
+    @staticmethod
+    def count_queries(api_client: APIClient) -> int:
+        with CaptureQueriesContext(connection) as context:
+            assert api_client.get(ENDPOINT).status_code == status.HTTP_200_OK
+        return len(context)
+
+    def test_get_list_constant_queries(
+        self,
+        api_client: APIClient,
+        fill_order_bulk: Callable,
+    ) -> None:
+        fill_order_bulk(10)
+        few = self.count_queries(api_client)
+        fill_order_bulk(9990)
+        assert self.count_queries(api_client) == few
+
+
+class TestFilterOrders:
+    @staticmethod
+    def get_ids(api_client: APIClient, params: dict) -> set[int]:
+        response = api_client.get(ENDPOINT, params)
+        assert response.status_code == status.HTTP_200_OK
+        return {order['id'] for order in response.data['results']}
+
+    def test_exact_table_number(self, api_client: APIClient) -> None:
+        orders = [
+            OrderFactory(table_number=number) for number in (7, 17, 70, 7)
+        ]
+        assert self.get_ids(api_client, {'table_number': 7}) == {
+            orders[0].pk,
+            orders[3].pk,
+        }
+
+    def test_multiple_statuses(
+        self,
+        api_client: APIClient,
+        fill_order_batch: Callable,
+    ) -> None:
+        waiting = fill_order_batch(1)[0]
+        paid = fill_order_batch(1, is_paid=True)[0]
+        ready = OrderFactory(status=OrderStatus.READY)
+        params = {'status': [OrderStatus.READY, OrderStatus.PAID_FOR]}
+        assert self.get_ids(api_client, params) == {paid.pk, ready.pk}
+        params = {'status': OrderStatus.WAITING}
+        assert self.get_ids(api_client, params) == {waiting.pk}
+
+    def test_created_at_range(
+        self,
+        api_client: APIClient,
+        fill_order_batch: Callable,
+    ) -> None:
+        old, recent = fill_order_batch(2)
+        moment = timezone.now() - timedelta(hours=1)
+        Order.objects.filter(pk=old.pk).update(
+            created_at=moment - timedelta(hours=1),
+        )
+        params = {'created_after': moment.isoformat()}
+        assert self.get_ids(api_client, params) == {recent.pk}
+        params = {'created_before': moment.isoformat()}
+        assert self.get_ids(api_client, params) == {old.pk}
+
+    def test_meal(
+        self,
+        api_client: APIClient,
+        fill_order_batch: Callable,
+    ) -> None:
+        orders = fill_order_batch(3)
+        meals = [order.items.get() for order in orders]
+        orders[1].set_items({meals[0]: 1, meals[1]: 2})
+        params = {
+            'meal': [meals[0].pk],
+            'table_number': orders[1].table_number,
+        }
+        assert orders[1].pk in self.get_ids(api_client, params)
+        params = {'meal': [meals[0].pk]}
+        assert self.get_ids(api_client, params) == {orders[0].pk, orders[1].pk}
+
+    @pytest.mark.parametrize(
+        'params',
+        (
+            {'table_number': 'x'},
+            {'table_number': 0},
+            {'status': 'DONE'},
+            {'meal': 'x'},
+            {
+                'created_after': '2025-01-02T00:00:00Z',
+                'created_before': '2025-01-01T00:00:00Z',
+            },
+        ),
+    )
+    def test_invalid_params(
+        self,
+        api_client: APIClient,
+        params: dict[str, str],
+    ) -> None:
+        response = api_client.get(ENDPOINT, params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
 
 class TestPostOrders:
     def test_post_valid_data(
@@ -83,6 +317,53 @@ class TestPostOrders:
         for key, value in body.items():
             assert value == response.data.get(key)
 
+    def test_post_stores_total_price(
+        self,
+        api_client: APIClient,
+        fill_meal_batch: Callable,
+    ) -> None:
+        meals = fill_meal_batch()
+        body = {
+            'table_number': 1,
+            'items': [meal.pk for meal in meals],
+        }
+        response = api_client.post(
+            ENDPOINT,
+            json.dumps(body),
+            content_type='application/json',
+        )
+        total_price = sum(meal.price for meal in meals)
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data.get('price') == total_price
+        order = Order.objects.get(pk=response.data.get('id'))
+        assert order.total_price == total_price
+        assert order.items_count == len(meals)
+
+    def test_post_repeated_items(
+        self,
+        api_client: APIClient,
+        fill_meal_batch: Callable,
+    ) -> None:
+        coffee, cake = fill_meal_batch(2)
+        body = {
+            'table_number': 6,
+            'items': [coffee.pk] * 6 + [cake.pk],
+        }
+        response = api_client.post(
+            ENDPOINT,
+            json.dumps(body),
+            content_type='application/json',
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert sorted(response.data['items']) == sorted(body['items'])
+        assert response.data['price'] == coffee.price * 6 + cake.price
+        lines = {line['meal']: line for line in response.data['lines']}
+        assert lines[coffee.pk]['quantity'] == 6
+        assert lines[coffee.pk]['unit_price'] == str(coffee.price)
+        order = Order.objects.get(pk=response.data['id'])
+        assert order.lines.count() == 2
+        assert order.items_count == 7
+
     def test_post_invalid_data(
         self,
         api_client: APIClient,
@@ -99,6 +380,82 @@ class TestPostOrders:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
 
+class TestPostOrdersBulk:
+    @staticmethod
+    def post(api_client: APIClient, body: list) -> Response:
+        return api_client.post(
+            ENDPOINT,
+            json.dumps(body),
+            content_type='application/json',
+        )
+
+    def test_post_list(
+        self,
+        api_client: APIClient,
+        fill_meal_batch: Callable,
+    ) -> None:
+        meals = fill_meal_batch()
+        body = [
+            {'table_number': number, 'items': [meal.pk for meal in meals]}
+            for number in range(1, 21)
+        ]
+        with CaptureQueriesContext(connection) as context:
+            response = self.post(api_client, body)
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(context) <= 8
+        assert [order['table_number'] for order in response.data] == list(
+            range(1, 21),
+        )
+        total_price = sum(meal.price for meal in meals)
+        for order in Order.objects.all():
+            assert order.total_price == total_price
+            assert order.items_count == len(meals)
+            assert order.items.count() == len(meals)
+
+    def test_post_list_with_errors(
+        self,
+        api_client: APIClient,
+        fill_meal_batch: Callable,
+    ) -> None:
+        meal = fill_meal_batch(1)[0]
+        body = [
+            {'table_number': 1, 'items': [meal.pk]},
+            {'table_number': 2, 'items': [meal.pk + 1]},
+            {'table_number': 0, 'items': ['x']},
+        ]
+        response = self.post(api_client, body)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data[0] == {}
+        assert set(response.data[1]) == {'items'}
+        assert set(response.data[2]) == {'table_number', 'items'}
+        assert not Order.objects.exists()
+
+    def test_post_list_too_long(self, api_client: APIClient) -> None:
+        body = [{'table_number': 1, 'items': [1]}] * (ORDER_BULK_MAX_SIZE + 1)
+        response = self.post(api_client, body)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_post_paid_list_updates_rollup(
+        self,
+        api_client: APIClient,
+        fill_meal_batch: Callable,
+    ) -> None:
+        meals = fill_meal_batch(2)
+        body = [
+            {
+                'table_number': 1,
+                'items': [meal.pk],
+                'status': OrderStatus.PAID_FOR,
+            }
+            for meal in meals
+        ]
+        response = self.post(api_client, body)
+        assert response.status_code == status.HTTP_201_CREATED
+        rollup = DailyRevenue.objects.get(date=timezone.localdate())
+        assert rollup.revenue == sum(meal.price for meal in meals)
+        assert rollup.orders_count == len(meals)
+
+
 class TestPatchOrders:
     def test_patch_valid_data(
         self,
@@ -211,3 +568,202 @@ class TestDeleteOrders:
     ) -> None:
         response = api_client.delete(f'{ENDPOINT}101/')
         assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestBulkActions:
+    @staticmethod
+    def post(api_client: APIClient, action: str, body: dict) -> Response:
+        return api_client.post(
+            f'{ENDPOINT}{action}/',
+            json.dumps(body),
+            content_type='application/json',
+        )
+
+    def test_transition(
+        self,
+        api_client: APIClient,
+        fill_order_batch: Callable,
+    ) -> None:
+        waiting = fill_order_batch(3)
+        paid = fill_order_batch(2, is_paid=True)
+        ids = [order.pk for order in waiting + paid]
+        with CaptureQueriesContext(connection) as context:
+            response = self.post(
+                api_client,
+                'transition',
+                {'ids': [*ids, 1000], 'status': OrderStatus.READY},
+            )
+        statements = [
+            query['sql'].split()[0]
+            for query in context
+            if not query['sql'].startswith(('SAVEPOINT', 'RELEASE'))
+        ]
+        assert response.status_code == status.HTTP_200_OK
+        assert statements == ['SELECT', 'UPDATE', 'SELECT', 'SELECT']
+        assert response.data == {
+            'changed': [order.pk for order in waiting],
+            'refused': [order.pk for order in paid],
+            'not_found': [1000],
+        }
+        assert set(
+            Order.objects.filter(pk__in=ids).values_list('status', flat=True),
+        ) == {OrderStatus.READY, OrderStatus.PAID_FOR}
+
+    def test_transition_to_paid_updates_rollup(
+        self,
+        api_client: APIClient,
+        fill_order_batch: Callable,
+    ) -> None:
+        orders = fill_order_batch(3)
+        response = self.post(
+            api_client,
+            'transition',
+            {
+                'ids': [order.pk for order in orders],
+                'status': OrderStatus.PAID_FOR,
+            },
+        )
+        assert response.status_code == status.HTTP_200_OK
+        rollup = DailyRevenue.objects.get(date=timezone.localdate())
+        assert rollup.revenue == sum(order.total_price for order in orders)
+        assert rollup.orders_count == len(orders)
+
+    def test_transition_invalid_data(self, api_client: APIClient) -> None:
+        response = self.post(
+            api_client,
+            'transition',
+            {'ids': [], 'status': 'DONE'},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert set(response.data) == {'ids', 'status'}
+
+    def test_bulk_delete(
+        self,
+        api_client: APIClient,
+        fill_order_batch: Callable,
+    ) -> None:
+        waiting = fill_order_batch(3)
+        paid = fill_order_batch(2, is_paid=True)
+        with CaptureQueriesContext(connection) as context:
+            response = self.post(
+                api_client,
+                'bulk-delete',
+                {'ids': [order.pk for order in waiting + paid]},
+            )
+        statements = [
+            query['sql'].split()[0]
+            for query in context
+            if not query['sql'].startswith(('SAVEPOINT', 'RELEASE'))
+        ]
+        assert response.status_code == status.HTTP_200_OK
+        assert statements == ['SELECT', 'DELETE', 'INSERT', 'DELETE']
+        assert OrderTombstone.objects.count() == len(waiting)
+        assert response.data == {
+            'changed': [order.pk for order in waiting],
+            'refused': [order.pk for order in paid],
+            'not_found': [],
+        }
+        assert list(Order.objects.values_list('pk', flat=True)) == [
+            order.pk for order in paid
+        ]
+        rollup = DailyRevenue.objects.get(date=timezone.localdate())
+        assert rollup.orders_count == len(paid)
+
+
+class TestGetOrderChanges:
+    def test_changes_since_cursor(
+        self,
+        api_client: APIClient,
+        fill_order_batch: Callable,
+    ) -> None:
+        orders = fill_order_batch(3)
+        response = api_client.get(f'{ENDPOINT}changes/')
+        assert response.status_code == status.HTTP_200_OK
+        assert [order['id'] for order in response.data['changed']] == [
+            order.pk for order in orders
+        ]
+        assert response.data['deleted'] == []
+        assert not response.data['has_more']
+
+        next_link = response.data['next']
+        response = api_client.get(next_link)
+        assert response.data['changed'] == []
+        assert response.data['next'] == next_link
+
+        api_client.patch(
+            f'{ENDPOINT}{orders[0].pk}/',
+            json.dumps({'status': OrderStatus.READY}),
+            content_type='application/json',
+        )
+        api_client.delete(f'{ENDPOINT}{orders[1].pk}/')
+        created = OrderFactory()
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(next_link)
+        assert len(context) == 3
+        assert [order['id'] for order in response.data['changed']] == [
+            orders[0].pk,
+            created.pk,
+        ]
+        assert response.data['changed'][0]['status'] == OrderStatus.READY
+        assert response.data['deleted'] == [orders[1].pk]
+
+    def test_changes_in_pages(
+        self,
+        api_client: APIClient,
+        fill_order_batch: Callable,
+    ) -> None:
+        orders = fill_order_batch(5)
+        Order.objects.filter(pk__in=[orders[0].pk, orders[1].pk]).update(
+            status=OrderStatus.READY,
+        )
+        received = []
+        response = api_client.get(f'{ENDPOINT}changes/', {'page_size': 2})
+        received += [order['id'] for order in response.data['changed']]
+        while response.data['has_more']:
+            response = api_client.get(response.data['next'])
+            received += [order['id'] for order in response.data['changed']]
+        assert received == [order.pk for order in orders[2:] + orders[:2]]
+
+    def test_invalid_cursor(self, api_client: APIClient) -> None:
+        response = api_client.get(f'{ENDPOINT}changes/', {'since': 'x'})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestOrderEvents:
+    def test_stream_order_changes(
+        self,
+        api_client: APIClient,
+        fill_order_batch: Callable,
+        django_capture_on_commit_callbacks: Callable,
+    ) -> None:
+        orders = fill_order_batch(2)
+        last_event_id = broadcaster.get_event_id(broadcaster.last_sequence)
+        response = api_client.get(
+            f'{ENDPOINT}events/',
+            HTTP_LAST_EVENT_ID=last_event_id,
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers['Content-Type'] == 'text/event-stream'
+        assert response.headers['Cache-Control'] == 'no-cache'
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post(
+                f'{ENDPOINT}transition/',
+                json.dumps(
+                    {'ids': [orders[0].pk], 'status': OrderStatus.READY},
+                ),
+                content_type='application/json',
+            )
+            api_client.post(
+                f'{ENDPOINT}bulk-delete/',
+                json.dumps({'ids': [orders[1].pk]}),
+                content_type='application/json',
+            )
+        content = iter(response.streaming_content)
+        assert next(content).startswith(b'retry: ')
+        messages = [next(content).decode() for _ in range(2)]
+        assert 'event: updated\n' in messages[0]
+        assert f'"id": {orders[0].pk}' in messages[0]
+        assert '"status": "READY"' in messages[0]
+        assert 'event: deleted\n' in messages[1]
+        assert f'"id": {orders[1].pk}' in messages[1]
+        response.close()
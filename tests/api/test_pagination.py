@@ -0,0 +1,78 @@
+from collections.abc import Callable
+
+import pytest
+from api.pagination import KeysetPagination
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from order.models import Meal, Order
+from rest_framework import status
+from rest_framework.test import APIClient
+
+pytestmark = pytest.mark.django_db
+
+
+def collect_pages(api_client: APIClient, url: str) -> list[list[dict]]:
+    pages = []
+    while url:
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        pages.append(response.data['results'])
+        url = response.data['next']
+    return pages
+
+
+class TestMealPagination:
+    def test_walks_all_meals_by_id(
+        self,
+        api_client: APIClient,
+        fill_meal_batch: Callable,
+    ) -> None:
+        fill_meal_batch(7)
+        pages = collect_pages(api_client, '/api/v1/meals/?page_size=3')
+        assert [len(page) for page in pages] == [3, 3, 1]
+        assert [meal['id'] for page in pages for meal in page] == list(
+            Meal.objects.order_by('pk').values_list('pk', flat=True),
+        )
+
+
+class TestOrderPagination:
+    def test_walks_all_orders_newest_first(
+        self,
+        api_client: APIClient,
+        fill_order_bulk: Callable,
+    ) -> None:
+        fill_order_bulk(12)
+        pages = collect_pages(api_client, '/api/v1/orders/?page_size=5')
+        assert [len(page) for page in pages] == [5, 5, 2]
+        assert [order['id'] for page in pages for order in page] == list(
+            Order.objects.order_by('-created_at', '-pk').values_list(
+                'pk',
+                flat=True,
+            ),
+        )
+
+    def test_deep_page_has_no_offset(
+        self,
+        api_client: APIClient,
+        fill_order_bulk: Callable,
+    ) -> None:
+        fill_order_bulk(12)
+        url = api_client.get('/api/v1/orders/?page_size=5').data['next']
+        with CaptureQueriesContext(connection) as context:
+            api_client.get(url)
+        assert not any('OFFSET' in query['sql'] for query in context)
+
+    def test_page_size_is_limited(
+        self,
+        api_client: APIClient,
+        fill_order_bulk: Callable,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(KeysetPagination, 'max_page_size', 4)
+        fill_order_bulk(6)
+        response = api_client.get('/api/v1/orders/?page_size=100')
+        assert len(response.data['results']) == 4
+
+    def test_invalid_cursor(self, api_client: APIClient) -> None:
+        response = api_client.get('/api/v1/orders/?cursor=invalid')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,67 @@
+import io
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import pytest
+from api import parsers, renderers
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+DATA = {
+    'id': 1,
+    'price': Decimal('10.50'),
+    'created_at': datetime(2025, 1, 2, 3, 4, 5, 678000, tzinfo=UTC),
+    'lines': [{'meal': 2, 'unit_price': '5.25'}],
+    'status': 'Готово',
+    'counts': {1: 2},
+    'meals': (1, 2),
+    'empty': None,
+}
+
+
+@pytest.fixture(params=(True, False), ids=('orjson', 'stdlib'))
+def fast(
+    request: pytest.FixtureRequest,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    if request.param:
+        pytest.importorskip('orjson')
+    else:
+        monkeypatch.setattr(renderers, 'orjson', None)
+        monkeypatch.setattr(parsers, 'orjson', None)
+
+
+@pytest.mark.usefixtures('fast')
+class TestFastJSONRenderer:
+    def test_matches_json_renderer(self) -> None:
+        assert FastJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+
+    def test_empty(self) -> None:
+        assert FastJSONRenderer().render(None) == b''
+
+    def test_indent(self) -> None:
+        content = FastJSONRenderer().render(
+            DATA,
+            'application/json; indent=2',
+        )
+        assert content == JSONRenderer().render(
+            DATA,
+            'application/json; indent=2',
+        )
+
+
+@pytest.mark.usefixtures('fast')
+class TestFastJSONParser:
+    def test_parse(self) -> None:
+        content = JSONRenderer().render(DATA)
+        assert FastJSONParser().parse(io.BytesIO(content)) == (
+            JSONParser().parse(io.BytesIO(content))
+        )
+
+    @pytest.mark.parametrize('content', (b'{"id": 1', b'', b'[NaN]'))
+    def test_invalid(self, content: bytes) -> None:
+        with pytest.raises(ParseError):
+            FastJSONParser().parse(io.BytesIO(content))
@@ -2,12 +2,19 @@ from collections.abc import Callable
 
 import pytest
 from core.constants import OrderStatus
+from django.core.cache import cache
 from django.test import Client, RequestFactory
 from factory.django import DjangoModelFactory
+from order.models import Order, OrderItem
 
 from tests.factories import MealFactory, OrderFactory
 
 
+@pytest.fixture(autouse=True)
+def clear_cache() -> None:
+    cache.clear()
+
+
 @pytest.fixture()
 def fill_meal_batch() -> Callable:
     def wrap(meal_quantity: int = 5) -> DjangoModelFactory:
@@ -30,6 +37,27 @@ def fill_order_batch() -> Callable:
     return wrap
 
 
+@pytest.fixture()
+def fill_order_bulk() -> Callable:
+    def wrap(order_quantity: int = 5, items_per_order: int = 2) -> None:
+        meals = MealFactory.create_batch(items_per_order)
+        orders = Order.objects.bulk_create(
+            Order(
+                table_number=number % 10 + 1,
+                total_price=sum(meal.price for meal in meals),
+                items_count=len(meals),
+            )
+            for number in range(order_quantity)
+        )
+        OrderItem.objects.bulk_create(
+            OrderItem(order=order, meal=meal, unit_price=meal.price)
+            for order in orders
+            for meal in meals
+        )
+
+    return wrap
+
+
 @pytest.fixture
 def rf() -> RequestFactory:
     return RequestFactory()
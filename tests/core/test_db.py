@@ -0,0 +1,210 @@
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from core.constants import PRIMARY_PIN_COOKIE, REPLICA_DB_ALIAS
+from core.db import (
+    ReplicaRouter,
+    lock_stats,
+    read_from_replica,
+    retry_on_lock,
+    sync_replica,
+    track_lock_waits,
+    unpin_primary,
+)
+from django.core.management import call_command
+from django.db import OperationalError, connection, connections
+from django.test import Client
+from django.urls import reverse
+from order.models import Order
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(settings: Any) -> None:
+    settings.DATABASE_LOCK_RETRIES = 2
+    settings.DATABASE_LOCK_RETRY_DELAY = 0
+    lock_stats.reset()
+
+
+@pytest.fixture()
+def replica(tmp_path: Path) -> Iterator[None]:
+    connections.settings[REPLICA_DB_ALIAS] = {
+        **connections.settings['default'],
+        'NAME': str(tmp_path.joinpath('replica.sqlite3')),
+    }
+    connections[REPLICA_DB_ALIAS].connect()
+    yield
+    connections[REPLICA_DB_ALIAS].close()
+    del connections[REPLICA_DB_ALIAS]
+    del connections.settings[REPLICA_DB_ALIAS]
+
+
+def make_write(errors: list[Exception]) -> Callable:
+    calls = []
+
+    @retry_on_lock
+    def write() -> int:
+        calls.append(1)
+        if errors:
+            raise errors.pop(0)
+        return len(calls)
+
+    return write
+
+
+class TestRetryOnLock:
+    def test_retries_until_success(self) -> None:
+        write = make_write([OperationalError('database is locked')] * 2)
+        assert write() == 3
+        assert lock_stats.as_dict()['retries'] == 2
+        assert lock_stats.as_dict()['failures'] == 0
+
+    def test_gives_up_after_retries(self) -> None:
+        write = make_write([OperationalError('database is locked')] * 3)
+        with pytest.raises(OperationalError):
+            write()
+        assert lock_stats.as_dict()['retries'] == 2
+        assert lock_stats.as_dict()['failures'] == 1
+
+    def test_other_errors_are_not_retried(self) -> None:
+        write = make_write([OperationalError('no such table: order_order')])
+        with pytest.raises(OperationalError):
+            write()
+        assert lock_stats.as_dict()['retries'] == 0
+
+    @pytest.mark.django_db
+    def test_no_retry_inside_transaction(self) -> None:
+        write = make_write([OperationalError('database is locked')])
+        with pytest.raises(OperationalError):
+            write()
+        assert lock_stats.as_dict()['retries'] == 0
+
+
+class TestTrackLockWaits:
+    @staticmethod
+    def execute(sql: str, params: Any, many: bool, context: Any) -> str:
+        time.sleep(0.002)
+        return sql
+
+    def test_counts_slow_begin(self) -> None:
+        track_lock_waits(self.execute, 'SELECT 1', None, False, {})
+        assert lock_stats.as_dict()['waits'] == 0
+        track_lock_waits(self.execute, 'BEGIN IMMEDIATE', None, False, {})
+        stats = lock_stats.as_dict()
+        assert stats['waits'] == 1
+        assert stats['wait_seconds'] >= 0.002
+
+    def test_counts_timeouts(self) -> None:
+        def execute(*args: Any) -> None:
+            raise OperationalError('database is locked')
+
+        with pytest.raises(OperationalError):
+            track_lock_waits(execute, 'BEGIN IMMEDIATE', None, False, {})
+        assert lock_stats.as_dict()['timeouts'] == 1
+
+
+@pytest.mark.django_db
+class TestConnectionProfile:
+    def test_pragmas_and_lock_tracking(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            assert cursor.fetchone() == (1,)
+            cursor.execute('PRAGMA cache_size')
+            assert cursor.fetchone() == (-20000,)
+        assert connection.transaction_mode == 'IMMEDIATE'
+        assert track_lock_waits in connection.execute_wrappers
+
+
+class TestReplicaRouter:
+    @read_from_replica
+    def read(self) -> str | None:
+        return ReplicaRouter().db_for_read(Order)
+
+    def test_reads_default_without_replica(self) -> None:
+        unpin_primary()
+        assert self.read() is None
+
+    @pytest.mark.django_db
+    def test_replica_reads_until_write(self, replica: None) -> None:
+        router = ReplicaRouter()
+        unpin_primary()
+        assert router.db_for_read(Order) is None
+        assert self.read() == REPLICA_DB_ALIAS
+        assert router.db_for_write(Order) == 'default'
+        assert self.read() is None
+        unpin_primary()
+        assert self.read() == REPLICA_DB_ALIAS
+
+    def test_replica_is_not_migrated(self) -> None:
+        router = ReplicaRouter()
+        assert router.allow_migrate(REPLICA_DB_ALIAS, 'order') is False
+        assert router.allow_migrate('default', 'order') is None
+
+
+@pytest.mark.django_db(transaction=True)
+class TestReplicaSync:
+    def test_versioned_list_reads_primary(
+        self,
+        replica: None,
+        fill_order_batch: Callable,
+    ) -> None:
+        fill_order_batch(2)
+        sync_replica()
+        fill_order_batch(1)
+        response = APIClient().get('/api/v1/orders/')
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == 3
+
+    def test_list_reads_own_writes(
+        self,
+        replica: None,
+        fill_order_batch: Callable,
+    ) -> None:
+        order = fill_order_batch(1)[0]
+        sync_replica()
+        client = Client()
+        response = client.post(
+            reverse('order:order_update', args=(order.pk,)),
+            {
+                'items': [order.items.get().pk],
+                'table_number': order.table_number % 99 + 1,
+                'status': order.status,
+            },
+            follow=True,
+        )
+        assert PRIMARY_PIN_COOKIE in client.cookies
+        assert [row.table_number for row in response.context['orders']] == [
+            order.table_number % 99 + 1,
+        ]
+        response = Client().get(reverse('order:order_list'))
+        assert [row.table_number for row in response.context['orders']] == [
+            order.table_number,
+        ]
+
+    def test_write_pins_reads_to_primary(
+        self,
+        replica: None,
+        fill_order_batch: Callable,
+    ) -> None:
+        sync_replica()
+        order = fill_order_batch(1, is_paid=True)[0]
+        assert Order.objects.get_revenue_for_day() == {
+            'revenue_per_shift': order.total_price,
+        }
+        unpin_primary()
+        assert Order.objects.get_revenue_for_day() == {
+            'revenue_per_shift': 0,
+        }
+
+    def test_command_copies_primary(
+        self,
+        replica: None,
+        fill_order_batch: Callable,
+    ) -> None:
+        fill_order_batch(2)
+        call_command('sync_replica')
+        assert Order.objects.using(REPLICA_DB_ALIAS).count() == 2
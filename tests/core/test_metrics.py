@@ -0,0 +1,120 @@
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+from core.constants import OrderStatus
+from core.metrics import format_sample, metrics
+from django.test import Client
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from tests.factories import MealFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics() -> None:
+    metrics.reset()
+
+
+def get_samples(client: Client) -> dict[str, float]:
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+    samples = {}
+    for line in response.content.decode().splitlines():
+        if not line.startswith('#'):
+            name, value = line.rsplit(' ', 1)
+            samples[name] = float(value)
+    return samples
+
+
+class TestMetrics:
+    def test_request_latency_and_queries(
+        self,
+        fill_order_batch: Callable,
+    ) -> None:
+        fill_order_batch(2)
+        client = Client()
+        client.get(reverse('order:order_list'))
+        client.get(reverse('order:order_list'))
+        samples = get_samples(client)
+        labels = 'method="GET",route="order:order_list",status="200"'
+        count = samples[
+            f'cafe_http_request_duration_seconds_count{{{labels}}}'
+        ]
+        assert count == 2
+        assert (
+            samples[
+                f'cafe_http_request_duration_seconds_bucket{{{labels},le="+Inf"}}'
+            ]
+            == count
+        )
+        assert (
+            samples['cafe_http_db_queries_total{route="order:order_list"}'] > 0
+        )
+        assert samples['cafe_orders_active{status="WAITING"}'] == 2
+        assert samples['cafe_orders_active{status="READY"}'] == 0
+        assert samples['cafe_db_lock_waits_total'] == 0
+
+    def test_order_rates_and_cache(
+        self,
+        django_capture_on_commit_callbacks: Callable,
+    ) -> None:
+        meal = MealFactory()
+        client = APIClient()
+        with django_capture_on_commit_callbacks(execute=True):
+            response = client.post(
+                '/api/v1/orders/',
+                {'table_number': 1, 'items': [meal.pk]},
+                format='json',
+            )
+            client.post(
+                '/api/v1/orders/transition/',
+                {'ids': [response.data['id']], 'status': OrderStatus.PAID_FOR},
+                format='json',
+            )
+        samples = get_samples(Client())
+        assert samples['cafe_orders_created_total'] == 1
+        assert samples['cafe_orders_paid_total'] == 1
+        assert samples['cafe_orders_active{status="WAITING"}'] == 0
+        assert 'cafe_cache_requests_total{cache="menu",result="miss"}' in (
+            samples
+        )
+
+    def test_processes_are_aggregated(
+        self,
+        settings: Any,
+        tmp_path: Path,
+    ) -> None:
+        settings.METRICS_DIR = str(tmp_path)
+        metrics.inc('cafe_orders_created_total', 2)
+        metrics.observe(
+            'cafe_http_request_duration_seconds',
+            0.2,
+            route='metrics',
+        )
+        other = metrics.snapshot()
+        tmp_path.joinpath('1.json').write_text(json.dumps(other))
+        samples = get_samples(Client())
+        assert samples['cafe_orders_created_total'] == 4
+        assert (
+            samples[
+                'cafe_http_request_duration_seconds_bucket{route="metrics",le="0.25"}'
+            ]
+            == 2
+        )
+        assert samples[
+            'cafe_http_request_duration_seconds_sum{route="metrics"}'
+        ] == pytest.approx(0.4)
+        assert len(list(tmp_path.glob('*.json'))) == 2
+
+
+def test_label_values_are_escaped() -> None:
+    assert (
+        format_sample('name', (('route', 'a"b\\c\n'),), 1)
+        == 'name{route="a\\"b\\\\c\\n"} 1'
+    )
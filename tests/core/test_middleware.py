@@ -0,0 +1,67 @@
+import logging
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from asgiref.sync import async_to_sync
+from core.middleware import TimingMiddleware
+from django.test import AsyncClient, Client
+from django.urls import reverse
+
+TIMING_MIDDLEWARE = 'core.middleware.ServerTimingMiddleware'
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def server_timing(settings: Any) -> None:
+    settings.MIDDLEWARE = [TIMING_MIDDLEWARE, *settings.MIDDLEWARE]
+
+
+def parse_server_timing(header: str) -> dict[str, list[str]]:
+    metrics = {}
+    for metric in header.split(', '):
+        name, *params = metric.split(';')
+        metrics[name] = params
+    return metrics
+
+
+@pytest.mark.usefixtures('server_timing')
+class TestServerTiming:
+    def test_page_timing_and_log(
+        self,
+        fill_order_batch: Callable,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        fill_order_batch(3)
+        with caplog.at_level(logging.INFO, logger='core.middleware'):
+            response = Client().get(reverse('order:order_list'))
+        metrics = parse_server_timing(response['Server-Timing'])
+        assert list(metrics) == ['db', 'view', 'render', 'total']
+        assert float(metrics['render'][0].removeprefix('dur=')) > 0
+        record = caplog.records[-1]
+        assert record.route == 'order:order_list'
+        assert record.status_code == 200
+        assert record.queries > 0
+        assert metrics['db'][1] == f'desc="{record.queries} queries"'
+        assert 'route=order:order_list' in record.getMessage()
+
+    def test_async_api_route(
+        self,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        with caplog.at_level(logging.INFO, logger='core.middleware'):
+            response = async_to_sync(AsyncClient().get)('/api/v1/orders/')
+        assert 'Server-Timing' in response
+        assert caplog.records[-1].route == 'api:order-list'
+        assert caplog.records[-1].queries > 0
+
+
+def test_disabled_by_default() -> None:
+    response = Client().get(reverse('order:order_list'))
+    assert 'Server-Timing' not in response
+
+
+def test_timing_requires_report() -> None:
+    with pytest.raises(TypeError):
+        TimingMiddleware(lambda request: None)
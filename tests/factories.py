@@ -1,3 +1,5 @@
+from collections import Counter
+
 from core.constants import MAX_TABLES_NUMBER
 from factory import Faker, post_generation
 from factory.django import DjangoModelFactory
@@ -24,6 +26,6 @@ class OrderFactory(DjangoModelFactory):
         if not create:
             return
         if extracted:
-            self.items.set(*extracted)
+            self.set_items(Counter(*extracted))
         else:
-            self.items.add(MealFactory())
+            self.set_items({MealFactory(): 1})
@@ -0,0 +1,118 @@
+import asyncio
+import json
+from collections.abc import Callable
+
+import pytest
+from asgiref.sync import async_to_sync
+from core.constants import OrderEventType
+from django.test import Client
+from django.urls import reverse
+from order.events import OrderBroadcaster, broadcaster
+
+from tests.factories import MealFactory
+
+
+def parse_message(message: str) -> dict[str, str]:
+    return dict(line.split(': ', 1) for line in message.strip().splitlines())
+
+
+class TestOrderBroadcaster:
+    def test_events_after_sequence(self) -> None:
+        events = OrderBroadcaster()
+        for order_id in range(1, 4):
+            events.publish(OrderEventType.CREATED, {'id': order_id})
+        assert events.last_sequence == 3
+        assert [event.data['id'] for event in events.get_events_after(1)] == [
+            2,
+            3,
+        ]
+        assert events.get_events_after(3) == []
+        assert events.wait_for_events(3, timeout=0) == []
+
+    def test_evicted_events(self) -> None:
+        events = OrderBroadcaster(size=2)
+        for order_id in range(1, 4):
+            events.publish(OrderEventType.CREATED, {'id': order_id})
+        assert events.get_events_after(0) is None
+        assert [event.sequence for event in events.get_events_after(1)] == [
+            2,
+            3,
+        ]
+
+    def test_parse_event_id(self) -> None:
+        events = OrderBroadcaster()
+        events.publish(OrderEventType.CREATED, {'id': 1})
+        assert events.parse_event_id(events.get_event_id(1)) == 1
+        assert events.parse_event_id(events.get_event_id(2)) is None
+        assert events.parse_event_id('other-1') is None
+        assert events.parse_event_id('') is None
+
+    def test_stream_resumes_after_last_event_id(self) -> None:
+        events = OrderBroadcaster()
+        for order_id in range(1, 4):
+            events.publish(OrderEventType.CREATED, {'id': order_id})
+        stream = events.stream(events.get_event_id(1), heartbeat=0)
+        assert next(stream).startswith('retry: ')
+        messages = [parse_message(next(stream)) for _ in range(2)]
+        assert [message['id'] for message in messages] == [
+            events.get_event_id(2),
+            events.get_event_id(3),
+        ]
+        assert messages[0]['event'] == OrderEventType.CREATED
+        assert json.loads(messages[0]['data']) == {'id': 2}
+        assert next(stream) == ': ping\n\n'
+
+    def test_stream_resets_unknown_last_event_id(self) -> None:
+        events = OrderBroadcaster(size=1)
+        for order_id in range(1, 3):
+            events.publish(OrderEventType.CREATED, {'id': order_id})
+        for last_event_id in ('other-1', events.get_event_id(0)):
+            stream = events.stream(last_event_id, heartbeat=0)
+            next(stream)
+            message = parse_message(next(stream))
+            assert message['event'] == OrderEventType.RESET
+            assert message['id'] == events.get_event_id(2)
+
+    def test_astream_waits_for_published_events(self) -> None:
+        events = OrderBroadcaster()
+
+        async def receive() -> list[str]:
+            stream = events.astream(events.get_event_id(0), heartbeat=5)
+            messages = [await anext(stream)]
+            waiting = asyncio.ensure_future(anext(stream))
+            await asyncio.sleep(0)
+            events.publish(OrderEventType.DELETED, {'id': 1})
+            messages.append(await waiting)
+            await stream.aclose()
+            return messages
+
+        retry, message = async_to_sync(receive)()
+        assert retry.startswith('retry: ')
+        assert parse_message(message)['event'] == OrderEventType.DELETED
+
+
+@pytest.mark.django_db
+class TestOrderViewEvents:
+    def test_views_publish_events(
+        self,
+        client: Client,
+        django_capture_on_commit_callbacks: Callable,
+    ) -> None:
+        meal = MealFactory()
+        sequence = broadcaster.last_sequence
+        with django_capture_on_commit_callbacks(execute=True):
+            client.post(
+                reverse('order:order'),
+                {'table_number': 3, 'items': [meal.pk]},
+            )
+        order_id = broadcaster.get_events_after(sequence)[-1].data['id']
+        with django_capture_on_commit_callbacks(execute=True):
+            client.post(
+                reverse('order:order_delete', kwargs={'pk': order_id}),
+            )
+        events = broadcaster.get_events_after(sequence)
+        assert [(event.type, event.data['id']) for event in events] == [
+            (OrderEventType.CREATED, order_id),
+            (OrderEventType.DELETED, order_id),
+        ]
+        assert events[0].data['items'] == [{'meal': meal.pk, 'quantity': 1}]
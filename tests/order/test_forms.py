@@ -1,8 +1,11 @@
 from collections.abc import Callable
+from unittest.mock import patch
 
 import pytest
 from core.constants import OrderStatus
+from django.db import OperationalError
 from order.forms import MealForm, OrderForm, OrderUpdateForm, SearchOrderForm
+from order.models import Order
 
 pytestmark = pytest.mark.django_db
 
@@ -33,6 +36,25 @@ class TestOrderForm:
         assert 'table_number' in form.errors
         assert 'items' in form.errors
 
+    def test_save_is_atomic(self, fill_meal_batch: Callable) -> None:
+        form = OrderForm(
+            data={
+                'table_number': 1,
+                'items': [meal.pk for meal in fill_meal_batch(2)],
+            },
+        )
+        assert form.is_valid()
+        with (
+            patch.object(
+                Order,
+                'set_items',
+                side_effect=OperationalError('database is locked'),
+            ),
+            pytest.raises(OperationalError),
+        ):
+            form.save()
+        assert not Order.objects.exists()
+
 
 class TestOrderUpdateForm:
     def test_valid_data(
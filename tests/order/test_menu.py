@@ -0,0 +1,77 @@
+from collections.abc import Callable
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from order.checks import check_shared_cache
+from order.forms import OrderForm
+from order.menu import get_menu
+
+from tests.factories import MealFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestMenu:
+    def test_snapshot_is_reused(self, fill_meal_batch: Callable) -> None:
+        meals = fill_meal_batch()
+        menu = get_menu()
+        with CaptureQueriesContext(connection) as context:
+            assert get_menu() is menu
+        assert len(context) == 0
+        assert [meal.pk for meal in menu] == [meal.pk for meal in meals]
+        meal = menu.get_meal(str(meals[0].pk))
+        assert (meal.name, meal.price) == (meals[0].name, meals[0].price)
+        assert menu.get_meal('x') is None
+        assert menu.get_meal(True) is None
+
+    def test_meal_changes_bump_version(self) -> None:
+        meal = MealFactory(price=Decimal('5.00'))
+        version = get_menu().version
+        meal.price = Decimal('6.00')
+        meal.save()
+        menu = get_menu()
+        assert menu.version != version
+        assert menu.get_meal(meal.pk).price == Decimal('6.00')
+        meal.delete()
+        assert len(get_menu()) == 0
+
+
+class TestOrderFormMenu:
+    def test_choices_and_validation_without_queries(
+        self,
+        fill_meal_batch: Callable,
+    ) -> None:
+        meals = fill_meal_batch(3)
+        get_menu()
+        with CaptureQueriesContext(connection) as context:
+            form = OrderForm(
+                data={'table_number': 1, 'items': [meals[0].pk, meals[2].pk]},
+            )
+            choices = list(form.fields['items'].choices)
+            assert form.is_valid()
+        assert len(context) == 0
+        assert [value for value, _ in choices] == [meal.pk for meal in meals]
+        assert form.cleaned_data['items'] == [meals[0], meals[2]]
+
+    def test_unknown_meal_is_rejected(self) -> None:
+        form = OrderForm(data={'table_number': 1, 'items': [1]})
+        assert not form.is_valid()
+        assert 'items' in form.errors
+
+
+class TestSharedCacheCheck:
+    def test_shared_cache(self) -> None:
+        assert check_shared_cache(None) == []
+
+    def test_process_local_cache(self) -> None:
+        locmem = {
+            'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            },
+        }
+        with override_settings(CACHES=locmem):
+            errors = check_shared_cache(None)
+        assert [error.id for error in errors] == ['order.E001']
@@ -0,0 +1,276 @@
+from collections import Counter
+from collections.abc import Callable
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from core.constants import OrderStatus
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import ProtectedError
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from order.forms import OrderUpdateForm
+from order.models import (
+    DailyRevenue,
+    Order,
+    OrderArchive,
+    OrderItemArchive,
+    OrderTombstone,
+)
+
+from tests.factories import MealFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestOrderTotals:
+    def test_totals_on_create(self, fill_order_batch: Callable) -> None:
+        for order in fill_order_batch():
+            stored = Order.objects.get(pk=order.pk)
+            assert stored.items_count == 1
+            assert stored.total_price == order.items.get().price
+
+    def test_totals_on_items_change(
+        self,
+        fill_order_batch: Callable,
+        fill_meal_batch: Callable,
+    ) -> None:
+        order = fill_order_batch(1)[0]
+        meals = fill_meal_batch(3)
+        order.set_items(Counter(meals))
+        stored = Order.objects.get(pk=order.pk)
+        assert stored.items_count == len(meals)
+        assert stored.total_price == sum(meal.price for meal in meals)
+        assert stored.total_price == order.total_price
+
+        order.set_items({meals[0]: 6})
+        stored = Order.objects.get(pk=order.pk)
+        assert stored.items_count == 6
+        assert stored.total_price == meals[0].price * 6
+        assert order.lines.get().quantity == 6
+
+        order.items.clear()
+        stored = Order.objects.get(pk=order.pk)
+        assert stored.items_count == 0
+        assert stored.total_price == 0
+
+    def test_totals_on_reverse_change(
+        self,
+        fill_order_batch: Callable,
+    ) -> None:
+        orders = fill_order_batch(2)
+        meal = MealFactory(price=Decimal('10.00'))
+        meal.order_meals.add(*orders, through_defaults={'unit_price': 10})
+        for order in orders:
+            stored = Order.objects.get(pk=order.pk)
+            assert stored.items_count == 2
+            assert stored.total_price == order.items.first().price + 10
+
+    def test_totals_on_form_save(
+        self,
+        fill_order_batch: Callable,
+        fill_meal_batch: Callable,
+    ) -> None:
+        order = fill_order_batch(1)[0]
+        meals = fill_meal_batch(2)
+        form = OrderUpdateForm(
+            data={
+                'items': [meal.pk for meal in meals],
+                'table_number': order.table_number,
+                'status': order.status,
+            },
+            instance=order,
+        )
+        assert form.is_valid()
+        form.save()
+        assert Order.objects.get(pk=order.pk).total_price == sum(
+            meal.price for meal in meals
+        )
+
+    def test_meal_price_change_keeps_order_price(
+        self,
+        fill_order_batch: Callable,
+    ) -> None:
+        order = fill_order_batch(1)[0]
+        meal = order.items.get()
+        meal.price += 1
+        meal.save()
+        assert Order.objects.get(pk=order.pk).total_price == order.total_price
+        assert order.lines.get().unit_price == order.total_price
+
+    def test_new_line_uses_current_price(
+        self,
+        fill_order_batch: Callable,
+    ) -> None:
+        order = fill_order_batch(1)[0]
+        meal = order.items.get()
+        old_price = meal.price
+        meal.price += 1
+        meal.save()
+        extra = MealFactory(price=Decimal('3.00'))
+        order.set_items({meal: 2, extra: 1})
+        assert Order.objects.get(pk=order.pk).total_price == (
+            old_price * 2 + Decimal('3.00')
+        )
+
+    def test_ordered_meal_delete_is_protected(
+        self,
+        fill_order_batch: Callable,
+    ) -> None:
+        order = fill_order_batch(1, is_paid=True)[0]
+        with pytest.raises(ProtectedError):
+            order.items.get().delete()
+        stored = Order.objects.get(pk=order.pk)
+        assert stored.items_count == 1
+        assert stored.total_price == order.total_price
+
+
+class TestDailyRevenue:
+    @staticmethod
+    def get_rollup() -> tuple[Decimal, int]:
+        row = DailyRevenue.objects.get(date=timezone.localdate())
+        return row.revenue, row.orders_count
+
+    def test_paid_orders_are_added(self, fill_order_batch: Callable) -> None:
+        orders = fill_order_batch(3, is_paid=True)
+        fill_order_batch(2)
+        assert self.get_rollup() == (
+            sum(order.total_price for order in orders),
+            len(orders),
+        )
+
+    def test_status_transitions(self, fill_order_batch: Callable) -> None:
+        order = fill_order_batch(1)[0]
+        assert not DailyRevenue.objects.exists()
+        order.status = OrderStatus.PAID_FOR
+        order.save()
+        assert self.get_rollup() == (order.total_price, 1)
+        order = Order.objects.get(pk=order.pk)
+        order.status = OrderStatus.READY
+        order.save()
+        assert self.get_rollup() == (0, 0)
+
+    def test_stale_instances_are_counted_once(
+        self,
+        fill_order_batch: Callable,
+    ) -> None:
+        order = fill_order_batch(1)[0]
+        first = Order.objects.get(pk=order.pk)
+        second = Order.objects.get(pk=order.pk)
+        for instance in (first, second):
+            instance.status = OrderStatus.PAID_FOR
+            instance.save()
+        assert self.get_rollup() == (order.total_price, 1)
+        call_command('revenue_rollup', verify=True)
+
+    def test_paid_order_items_change(
+        self,
+        fill_order_batch: Callable,
+    ) -> None:
+        order = fill_order_batch(1, is_paid=True)[0]
+        meal = MealFactory(price=Decimal('5.00'))
+        order.set_items({order.items.get(): 1, meal: 2})
+        assert self.get_rollup() == (order.total_price, 1)
+        meal.price = Decimal('7.00')
+        meal.save()
+        assert self.get_rollup() == (order.total_price, 1)
+        order.items.remove(meal)
+        assert self.get_rollup() == (
+            Order.objects.get(pk=order.pk).total_price,
+            1,
+        )
+
+    def test_paid_order_delete(self, fill_order_batch: Callable) -> None:
+        orders = fill_order_batch(2, is_paid=True)
+        Order.objects.filter(pk=orders[0].pk).delete()
+        assert self.get_rollup() == (orders[1].total_price, 1)
+
+    def test_revenue_for_day_is_single_query(
+        self,
+        fill_order_batch: Callable,
+    ) -> None:
+        orders = fill_order_batch(is_paid=True)
+        with CaptureQueriesContext(connection) as context:
+            revenue = Order.objects.get_revenue_for_day()
+        assert len(context) == 1
+        assert revenue['revenue_per_shift'] == sum(
+            order.total_price for order in orders
+        )
+
+    def test_command_rebuilds_and_verifies(
+        self,
+        fill_order_batch: Callable,
+    ) -> None:
+        orders = fill_order_batch(is_paid=True)
+        DailyRevenue.objects.update(revenue=0)
+        with pytest.raises(CommandError):
+            call_command('revenue_rollup', verify=True)
+        call_command('revenue_rollup')
+        call_command('revenue_rollup', verify=True)
+        assert self.get_rollup() == (
+            sum(order.total_price for order in orders),
+            len(orders),
+        )
+
+
+class TestOrderArchive:
+    @staticmethod
+    def age(orders: list[Order], days: int) -> None:
+        Order.objects.filter(pk__in=[order.pk for order in orders]).update(
+            created_at=timezone.now() - timedelta(days=days),
+        )
+        DailyRevenue.objects.rebuild()
+
+    def test_command_archives_paid_and_purges_waiting(
+        self,
+        fill_order_batch: Callable,
+    ) -> None:
+        paid = fill_order_batch(3, is_paid=True)
+        waiting = fill_order_batch(2)
+        self.age(paid + waiting, 40)
+        recent = fill_order_batch(1, is_paid=True) + fill_order_batch(1)
+        rollup = list(DailyRevenue.objects.values_list('date', 'revenue'))
+        call_command('archive_orders', batch_size=2)
+        assert set(Order.objects.values_list('pk', flat=True)) == {
+            order.pk for order in recent
+        }
+        assert set(OrderArchive.objects.values_list('pk', flat=True)) == {
+            order.pk for order in paid
+        }
+        assert OrderItemArchive.objects.count() == len(paid)
+        assert OrderTombstone.objects.count() == len(paid + waiting)
+        assert (
+            list(DailyRevenue.objects.values_list('date', 'revenue')) == rollup
+        )
+        call_command('revenue_rollup', verify=True)
+
+    def test_revenue_reads_archive(self, fill_order_batch: Callable) -> None:
+        orders = fill_order_batch(2, is_paid=True)
+        today = timezone.localdate()
+        series = Order.objects.get_revenue_series(today, today, bucket='hour')
+        Order.objects.archive_batch(timezone.now(), 1)
+        assert Order.objects.count() == 1
+        assert (
+            Order.objects.get_revenue_series(today, today, bucket='hour')
+            == series
+        )
+        DailyRevenue.objects.rebuild()
+        assert Order.objects.get_revenue_for_day(today) == {
+            'revenue_per_shift': sum(order.total_price for order in orders),
+        }
+
+    def test_meal_delete_keeps_archive(
+        self,
+        fill_order_batch: Callable,
+    ) -> None:
+        order = fill_order_batch(1, is_paid=True)[0]
+        meal = order.items.get()
+        Order.objects.archive_batch(timezone.now(), 1)
+        meal.delete()
+        line = OrderItemArchive.objects.get(order_id=order.pk)
+        assert (line.meal_name, line.quantity, line.unit_price) == (
+            meal.name,
+            1,
+            order.total_price,
+        )
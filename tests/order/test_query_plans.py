@@ -0,0 +1,165 @@
+import re
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from core.constants import (
+    ACTIVE_ORDER_STATUSES,
+    ACTIVE_ORDERS_FILTER,
+    OrderStatus,
+)
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from order.models import Order
+
+TABLE_SCAN = re.compile(r'\bSCAN order_order\b(?! USING (COVERING )?INDEX)')
+TEMP_SORT = 'USE TEMP B-TREE FOR ORDER BY'
+ORDER_TABLE = 'FROM "order_order"'
+
+pytestmark = pytest.mark.django_db
+
+
+@contextmanager
+def capture_order_queries() -> Iterator[list[tuple[str, Any]]]:
+    queries = []
+
+    def capture(
+        execute: Callable,
+        sql: str,
+        params: Any,
+        many: bool,
+        context: dict[str, Any],
+    ) -> Any:
+        if sql.startswith('SELECT') and ORDER_TABLE in sql:
+            queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(capture):
+        yield queries
+
+
+def explain(sql: str, params: Any) -> str:
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return '\n'.join(row[-1] for row in cursor.fetchall())
+
+
+def get_plans(client: Client, url: str, params: Any = None) -> list[str]:
+    with capture_order_queries() as queries:
+        response = client.get(url, params)
+    assert response.status_code < 400, response.content
+    assert queries, url
+    return [explain(sql, params) for sql, params in queries]
+
+
+def html_list(**params: Any) -> Callable[[Client], list[str]]:
+    def plans(client: Client) -> list[str]:
+        return get_plans(client, reverse('order:order_list'), params)
+
+    return plans
+
+
+def api_list(**params: Any) -> Callable[[Client], list[str]]:
+    def plans(client: Client) -> list[str]:
+        return get_plans(client, reverse('api:order-list'), params)
+
+    return plans
+
+
+def api_next_page(client: Client) -> list[str]:
+    response = client.get(reverse('api:order-list'))
+    return get_plans(client, response.json()['next'])
+
+
+def order_changes(client: Client) -> list[str]:
+    response = client.get(reverse('api:order-changes'), {'page_size': 50})
+    return get_plans(client, response.json()['next'])
+
+
+def shift_revenue(client: Client) -> list[str]:
+    today = timezone.localdate().isoformat()
+    return get_plans(
+        client,
+        reverse('api:order-revenue'),
+        {'from': today, 'to': today, 'bucket': 'hour'},
+    )
+
+
+def paid_order_check(client: Client) -> list[str]:
+    order = Order.objects.order_by('pk').first()
+    return get_plans(client, reverse('order:order_update', args=(order.pk,)))
+
+
+@pytest.fixture()
+def order_history(fill_order_bulk: Callable) -> None:
+    fill_order_bulk(1000)
+    Order.objects.filter(pk__gt=50).update(status=OrderStatus.PAID_FOR)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+@pytest.mark.usefixtures('order_history')
+class TestOrderQueryPlans:
+    @pytest.mark.parametrize(
+        'get_view_plans',
+        (
+            pytest.param(shift_revenue, id='shift-revenue'),
+            pytest.param(html_list(), id='html-default'),
+            pytest.param(
+                html_list(status=ACTIVE_ORDERS_FILTER),
+                id='html-active',
+            ),
+            pytest.param(
+                html_list(table_number=7, status=OrderStatus.READY),
+                id='html-table-status',
+            ),
+            pytest.param(html_list(table_number=7), id='html-table'),
+            pytest.param(api_list(), id='api-first-page'),
+            pytest.param(api_next_page, id='api-next-page'),
+            pytest.param(order_changes, id='api-changes'),
+            pytest.param(paid_order_check, id='paid-order-check'),
+            pytest.param(api_list(table_number=7), id='api-table'),
+            pytest.param(api_list(status=OrderStatus.READY), id='api-status'),
+            pytest.param(
+                api_list(table_number=7, status=ACTIVE_ORDER_STATUSES),
+                id='api-table-statuses',
+            ),
+            pytest.param(
+                api_list(
+                    created_after=(
+                        timezone.now() - timedelta(hours=1)
+                    ).isoformat(),
+                ),
+                id='api-created-after',
+            ),
+            pytest.param(api_list(meal=1), id='api-meal'),
+        ),
+    )
+    def test_no_table_scan(
+        self,
+        client: Client,
+        get_view_plans: Callable,
+    ) -> None:
+        for plan in get_view_plans(client):
+            assert not TABLE_SCAN.search(plan), plan
+
+    @pytest.mark.parametrize(
+        'get_view_plans',
+        (
+            pytest.param(html_list(), id='html-default'),
+            pytest.param(
+                html_list(status=ACTIVE_ORDERS_FILTER),
+                id='html-active',
+            ),
+            pytest.param(api_list(), id='api-first-page'),
+            pytest.param(api_next_page, id='api-next-page'),
+            pytest.param(order_changes, id='api-changes'),
+        ),
+    )
+    def test_no_sort(self, client: Client, get_view_plans: Callable) -> None:
+        for plan in get_view_plans(client):
+            assert TEMP_SORT not in plan, plan
@@ -0,0 +1,73 @@
+from collections.abc import Iterator
+from datetime import date, datetime, time
+from decimal import Decimal
+
+import pytest
+from core.constants import OrderStatus
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from order.models import DailyRevenue, Order
+from order.shifts import get_shift_date
+
+from tests.factories import MealFactory, OrderFactory
+
+SHIFT_DATE = date(2025, 3, 1)
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures('late_shift'),
+]
+
+
+@pytest.fixture()
+def late_shift() -> Iterator[None]:
+    with override_settings(SHIFT_START=time(10)):
+        yield
+
+
+def make_paid_order(created_at: datetime, price: str) -> Order:
+    order = OrderFactory(items=[[MealFactory(price=Decimal(price))]])
+    Order.objects.filter(pk=order.pk).update(created_at=created_at)
+    order = Order.objects.get(pk=order.pk)
+    order.status = OrderStatus.PAID_FOR
+    order.save()
+    return order
+
+
+def at(day: int, hour: int) -> datetime:
+    return timezone.make_aware(datetime(2025, 3, day, hour))
+
+
+class TestShiftBounds:
+    def test_shift_date(self) -> None:
+        assert get_shift_date(at(1, 11)) == SHIFT_DATE
+        assert get_shift_date(at(2, 1)) == SHIFT_DATE
+        assert get_shift_date(at(2, 10)) == date(2025, 3, 2)
+
+
+class TestShiftRevenue:
+    def test_late_night_order_counts_for_previous_shift(self) -> None:
+        make_paid_order(at(1, 20), '10.00')
+        make_paid_order(at(2, 1), '5.00')
+        make_paid_order(at(2, 11), '7.00')
+        assert DailyRevenue.objects.get(date=SHIFT_DATE).revenue == Decimal(
+            '15.00',
+        )
+        assert Order.objects.get_revenue_for_day(SHIFT_DATE) == {
+            'revenue_per_shift': Decimal('15.00'),
+        }
+        call_command('revenue_rollup', verify=True)
+
+    def test_series_matches_rollup(self) -> None:
+        make_paid_order(at(1, 10), '10.00')
+        make_paid_order(at(2, 5), '5.00')
+        make_paid_order(at(2, 10), '7.00')
+        series = Order.objects.get_revenue_series(
+            SHIFT_DATE,
+            SHIFT_DATE,
+            bucket='hour',
+        )
+        revenue = Order.objects.get_revenue_for_day(SHIFT_DATE)
+        assert sum(row['revenue'] for row in series) == Decimal('15.00')
+        assert revenue == {'revenue_per_shift': Decimal('15.00')}
@@ -0,0 +1,43 @@
+from io import StringIO
+
+import pytest
+from core.constants import OrderStatus
+from django.core.management import CommandError, call_command
+from order.models import Order
+
+from tests.factories import MealFactory
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSimulateShift:
+    def test_drives_orders_through_statuses(self) -> None:
+        MealFactory.create_batch(5)
+        out = StringIO()
+        call_command(
+            'simulate_shift',
+            waiters=3,
+            screens=1,
+            duration=1,
+            think_time=0.01,
+            allow_configured_db=True,
+            stdout=out,
+        )
+        report = out.getvalue()
+        assert '3 waiters, 1 screens' in report
+        assert 'create_order' in report
+        assert 'mark_ready' in report
+        assert 'Lock waits:' in report
+        assert Order.objects.exists()
+        assert Order.objects.exclude(status=OrderStatus.WAITING).exists()
+
+    def test_requires_menu(self) -> None:
+        with pytest.raises(CommandError, match='menu'):
+            call_command(
+                'simulate_shift', duration=0, allow_configured_db=True
+            )
+
+    def test_refuses_configured_db(self) -> None:
+        MealFactory.create_batch(5)
+        with pytest.raises(CommandError, match='--allow-configured-db'):
+            call_command('simulate_shift', duration=0)
+        assert not Order.objects.exists()
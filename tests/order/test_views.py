@@ -1,12 +1,18 @@
 from collections.abc import Callable
+from datetime import timedelta
 from decimal import Decimal
 from http import HTTPStatus
+from typing import Any
+from unittest.mock import patch
 
 import pytest
-from core.constants import OrderStatus
+from core.constants import ORDER_LIST_PAGE_SIZE, OrderStatus
 from django.contrib.messages.storage.fallback import FallbackStorage
-from django.test import RequestFactory
+from django.db import OperationalError, connection
+from django.test import Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from order.forms import MealForm, OrderForm, OrderUpdateForm, SearchOrderForm
 from order.models import Meal, Order
 from order.views import (
@@ -111,14 +117,28 @@ class TestOrderListView:
         rf: RequestFactory,
         fill_order_batch: Callable,
     ) -> None:
+        orders = fill_order_batch()
         url = reverse('order:order_list')
         response = self._view(rf.get(url))
-        orders = fill_order_batch()
         assert response.status_code == 200
         assert isinstance(response.context_data['form'], SearchOrderForm)
         assert list(response.context_data['object_list']) == orders
 
-    def test_post_order_list_view_with_valid_form_data(
+    def test_get_default_shows_todays_active_orders(
+        self,
+        rf: RequestFactory,
+        fill_order_batch: Callable,
+    ) -> None:
+        orders = fill_order_batch(3)
+        orders[0].status = OrderStatus.PAID_FOR
+        orders[0].save()
+        Order.objects.filter(pk=orders[1].pk).update(
+            created_at=timezone.now() - timedelta(days=1),
+        )
+        response = self._view(rf.get(reverse('order:order_list')))
+        assert list(response.context_data['object_list']) == orders[2:]
+
+    def test_get_order_list_view_with_valid_form_data(
         self,
         rf: RequestFactory,
         fill_order_batch: Callable,
@@ -129,10 +149,18 @@ class TestOrderListView:
             'table_number': order.table_number,
             'status': OrderStatus.WAITING,
         }
-        response = self._view(rf.post(url, data))
+        response = self._view(rf.get(url, data))
+        response.render()
         assert response.status_code == 200
         assert order.items.last().name in response.content.decode()
 
+    def test_post_redirects_to_get(self, rf: RequestFactory) -> None:
+        url = reverse('order:order_list')
+        response = self._view(rf.post(url, {'table_number': 3}))
+        assert response.status_code == HTTPStatus.FOUND
+        assert response.url.startswith(f'{url}?')
+        assert 'table_number=3' in response.url
+
     def test_filter_orders_by_table_number(
         self,
         rf: RequestFactory,
@@ -141,12 +169,12 @@ class TestOrderListView:
         orders = fill_order_batch()
         data = {'table_number': orders[0].table_number}
         response = self._view(
-            rf.post(
+            rf.get(
                 reverse('order:order_list'),
                 data,
             ),
         )
-        content = response.content.decode()
+        content = response.render().content.decode()
         assert response.status_code == 200
         for order in orders:
             if order.table_number == data['table_number']:
@@ -166,9 +194,9 @@ class TestOrderListView:
         data = {'status': OrderStatus.READY}
 
         url = reverse('order:order_list')
-        response = self._view(rf.post(url, data))
+        response = self._view(rf.get(url, data))
 
-        content = response.content.decode()
+        content = response.render().content.decode()
         assert response.status_code == 200
         for order in orders:
             if order.status == data['status']:
@@ -177,6 +205,57 @@ class TestOrderListView:
             else:
                 assert order.items.last().name not in content
 
+    def test_pages_follow_creation_order(
+        self,
+        client: Client,
+        fill_order_bulk: Callable,
+    ) -> None:
+        fill_order_bulk(ORDER_LIST_PAGE_SIZE * 2 + 1)
+        url = reverse('order:order_list')
+        query = 'status='
+        seen = []
+        while query:
+            response = client.get(f'{url}?{query}')
+            seen.extend(order.pk for order in response.context['orders'])
+            query = response.context['next_page_query']
+        assert seen == list(
+            Order.objects.order_by('created_at', 'pk').values_list(
+                'pk',
+                flat=True,
+            ),
+        )
+
+
+class TestOrderListViewQueries:
+    @staticmethod
+    def count_queries(client: Client, method: str, **kwargs: Any) -> int:
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(client, method)(
+                reverse('order:order_list'),
+                **kwargs,
+            )
+        assert response.status_code == HTTPStatus.OK
+        return len(context)
+
+    @pytest.mark.parametrize(
+        ('method', 'kwargs'),
+        (
+            ('get', {}),
+            ('get', {'data': {'table_number': 1, 'status': ''}}),
+        ),
+    )
+    def test_constant_queries(
+        self,
+        client: Client,
+        fill_order_bulk: Callable,
+        method: str,
+        kwargs: dict[str, Any],
+    ) -> None:
+        fill_order_bulk(10)
+        few = self.count_queries(client, method, **kwargs)
+        fill_order_bulk(9990)
+        assert self.count_queries(client, method, **kwargs) == few
+
 
 class TestOrderUpdateView:
     @property
@@ -315,3 +394,78 @@ class TestCurrentDayRevenueView:
             str(sum(order.price for order in orders).quantize(Decimal('0.01')))
             in response.content.decode()
         )
+
+
+def fail_set_items(failures: int) -> Callable:
+    set_items = Order.set_items
+    calls = []
+
+    def locked_set_items(order: Order, *args: Any) -> None:
+        calls.append(order.pk)
+        if len(calls) <= failures:
+            raise OperationalError('database is locked')
+        set_items(order, *args)
+
+    return locked_set_items
+
+
+@pytest.mark.django_db(transaction=True)
+class TestOrderFormLockRetry:
+    @pytest.fixture(autouse=True)
+    def no_retry_delay(self, settings: Any) -> None:
+        settings.DATABASE_LOCK_RETRIES = 1
+        settings.DATABASE_LOCK_RETRY_DELAY = 0
+
+    def test_create_retries_whole_order(
+        self,
+        fill_meal_batch: Callable,
+    ) -> None:
+        meal = fill_meal_batch(1)[0]
+        with patch.object(Order, 'set_items', fail_set_items(1)):
+            response = Client().post(
+                reverse('order:order'),
+                {'items': meal.pk, 'table_number': 1},
+            )
+        assert response.status_code == HTTPStatus.FOUND
+        order = Order.objects.get()
+        assert list(order.items.all()) == [meal]
+        assert order.total_price == meal.price
+
+    def test_create_leaves_no_partial_order(
+        self,
+        fill_meal_batch: Callable,
+    ) -> None:
+        meal = fill_meal_batch(1)[0]
+        with (
+            patch.object(Order, 'set_items', fail_set_items(2)),
+            pytest.raises(OperationalError),
+        ):
+            Client().post(
+                reverse('order:order'),
+                {'items': meal.pk, 'table_number': 1},
+            )
+        assert not Order.objects.exists()
+
+    def test_update_leaves_no_partial_order(
+        self,
+        fill_order_batch: Callable,
+        fill_meal_batch: Callable,
+    ) -> None:
+        order = fill_order_batch(1)[0]
+        with (
+            patch.object(Order, 'set_items', fail_set_items(2)),
+            pytest.raises(OperationalError),
+        ):
+            Client().post(
+                reverse('order:order_update', args=(order.pk,)),
+                {
+                    'items': fill_meal_batch(1)[0].pk,
+                    'table_number': order.table_number % 99 + 1,
+                    'status': OrderStatus.READY,
+                },
+            )
+        stored = Order.objects.get(pk=order.pk)
+        assert (stored.table_number, stored.status) == (
+            order.table_number,
+            order.status,
+        )